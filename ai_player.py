@@ -1,250 +1,869 @@
+import logging
 import random
+import time
+
+from bitboard import casillas_alcanzables, contar_bits, posicion
+from config import (
+    CASILLAS_FINAL_EXACTO,
+    CASTIGO_SIN_MOVIMIENTOS,
+    MEMORIA_TRANSPOSICION_MB,
+    PESO_MOVILIDAD,
+    RUTA_TRANSPOSICION,
+    TIEMPO_MINIMO_MS,
+)
+from control_busqueda import MASCARA_VERIFICACION, BusquedaInterrumpida, LimiteBusqueda
+from estadisticas import EstadisticasBusqueda
+from evaluacion_lotes import evaluar_hijos
+from estado_busqueda import BLANCO, PENALIZACION_SIN_MOVIMIENTOS, EstadoBusqueda
+from finales import SolucionadorFinales, es_final
+from ordenamiento import OrdenadorMovimientos
+from paralelo import BusquedaParalela
+from tabla_persistente import TablaPersistente
+from transposicion import COTA_INFERIOR, COTA_SUPERIOR, EXACTO, TablaTransposicion
+
+# Por debajo de esta profundidad restante consultar la tabla cuesta más que
+# volver a buscar
+PROFUNDIDAD_MINIMA_TT = 2
+
+# En profundización iterativa no se empieza otra iteración si ya se usó esta
+# fracción del tiempo asignado: la siguiente casi nunca alcanzaría a terminar
+FRACCION_NUEVA_ITERACION = 0.5
+
+# Con menos profundidad el costo de repartir la raíz entre procesos supera
+# al de buscarla
+PROFUNDIDAD_MINIMA_PARALELA = 4
+
+# Con los pesos por defecto la evaluación avanza de a 0.5 (medio movimiento
+# de movilidad) y una ventana nula de ese ancho no deja valores intermedios.
+# Con otros pesos sigue siendo correcta: un valor dentro de la ventana se
+# vuelve a buscar
+VENTANA_NULA = 0.5
+
+# Semiancho de la ventana de aspiración alrededor del valor de la iteración
+# anterior: media captura grande. Más angosta falla seguido y la re-búsqueda
+# cuesta más de lo que ahorra
+VENTANA_ASPIRACION = 5
+
+registro = logging.getLogger(__name__)
 
 class AIPlayer:
-    """Jugador de IA que usa el algoritmo Minimax con poda Alpha-Beta"""
-
-    def __init__(self, profundidad=4):
+    """
+    Jugador de IA que usa el algoritmo Minimax con poda Alpha-Beta
+
+    Con solo `profundidad` busca a profundidad fija. Con `tiempo_partida_ms`
+    (tiempo total de reflexión para la partida) o `limite_nodos` (por jugada)
+    usa profundización iterativa hasta agotar el presupuesto; `profundidad`
+    pasa a ser un tope opcional.
+
+    Con `procesos` > 1 los movimientos de la raíz se reparten entre ese
+    número de procesos (ver paralelo.BusquedaParalela); hay que llamar a
+    cerrar() al terminar para liberarlos.
+
+    Con `ruta_tt` la tabla de transposición vive en ese archivo (ver
+    tabla_persistente.TablaPersistente) y se comparte con otras partidas y
+    procesos que usen el mismo archivo.
+
+    Cuando quedan a lo sumo `casillas_final_exacto` casillas libres
+    alcanzables (o en cada región, si los caballos quedaron separados) la
+    jugada sale del solucionador exacto de finales (None lo desactiva).
+
+    Con `usar_pvs` busca con variante principal (PVS): cada nodo busca su
+    primer movimiento con la ventana completa y el resto con ventana nula,
+    repitiendo con la ventana completa solo los que la superan. En
+    profundización iterativa cada iteración empieza además con una ventana
+    de aspiración alrededor del valor de la anterior.
+
+    La evaluación es la diferencia de puntos más `peso_movilidad` por la
+    diferencia de movimientos disponibles; el bando en turno sin
+    movimientos recibe `castigo_sin_movimientos` en contra. Con pesos
+    distintos de los de config no conviene compartir una tabla persistente
+    (`ruta_tt`) con jugadores de otros pesos.
+    """
+
+    def __init__(
+        self,
+        profundidad=4,
+        tiempo_partida_ms=None,
+        limite_nodos=None,
+        usar_transposicion=True,
+        memoria_tt_mb=MEMORIA_TRANSPOSICION_MB,
+        ordenar_movimientos=True,
+        procesos=None,
+        casillas_final_exacto=CASILLAS_FINAL_EXACTO,
+        ruta_tt=RUTA_TRANSPOSICION,
+        evaluacion_lotes=True,
+        usar_pvs=False,
+        peso_movilidad=PESO_MOVILIDAD,
+        castigo_sin_movimientos=CASTIGO_SIN_MOVIMIENTOS,
+    ):
         self.profundidad = profundidad
+        self.tiempo_restante_ms = tiempo_partida_ms
+        self.limite_nodos = limite_nodos
+        # La tabla se conserva entre jugadas: las posiciones se repiten
+        self.tabla = None
+        if usar_transposicion and ruta_tt is not None:
+            self.tabla = TablaPersistente(ruta_tt, memoria_tt_mb)
+        elif usar_transposicion:
+            self.tabla = TablaTransposicion(memoria_tt_mb)
+        # La historia del ordenador también se comparte entre búsquedas
+        self.ordenar_movimientos = ordenar_movimientos
+        self.ordenador = None
+        # A profundidad 1 los hijos se evalúan juntos (ver evaluacion_lotes)
+        self.evaluacion_lotes = evaluacion_lotes
+        self.usar_pvs = usar_pvs
+        self.peso_movilidad = peso_movilidad
+        self.castigo_sin_movimientos = castigo_sin_movimientos
+        self.limite = None
+        self.progreso = None
+        self.nodos = 0
+        self.hojas = 0
+        self.cortes = 0
+        self.cortes_beta = 0
+        self.cortes_alfa = 0
+        self.cortes_primer_movimiento = 0
+        self.re_busquedas = 0
+        self.fallos_aspiracion = 0
+        self.ply_maximo = 0
+        self.profundidad_alcanzada = 0
+        self.ultimo_valor = None
+        self.ultimo_movimiento = None
+        self.ultima_variante = []
+        # Estadísticas de la última llamada a obtener_mejor_movimiento
+        self.estadisticas = None
+        self._iteraciones = []
+        self._profundidad_actual = 0
+        self._dimension = None
+        self._hoja_alcanzada = False
+        # Resultados de la última ponderación: clave Zobrist de la posición
+        # tras cada respuesta del rival -> (profundidad, movimiento, valor,
+        # árbol completo)
+        self.resultados_ponder = {}
+        self.casillas_final_exacto = casillas_final_exacto
+        self.solucionador = (
+            SolucionadorFinales() if casillas_final_exacto is not None else None
+        )
+        self.paralela = None
+        if procesos is not None and procesos > 1:
+            opciones = {
+                "usar_transposicion": usar_transposicion,
+                "memoria_tt_mb": memoria_tt_mb,
+                "ordenar_movimientos": ordenar_movimientos,
+                "ruta_tt": ruta_tt,
+                "evaluacion_lotes": evaluacion_lotes,
+                "usar_pvs": usar_pvs,
+                "peso_movilidad": peso_movilidad,
+                "castigo_sin_movimientos": castigo_sin_movimientos,
+            }
+            self.paralela = BusquedaParalela(procesos, opciones)
+
+    def cerrar(self):
+        """Libera los procesos de la búsqueda paralela y la tabla en disco"""
+        if self.paralela is not None:
+            self.paralela.cerrar()
+        if isinstance(self.tabla, TablaPersistente):
+            self.tabla.cerrar()
 
     def calcular_heuristica(self, game_logic):
         """
         Función heurística para evaluar el estado del juego.
         La IA juega con el blanco.
         """
-        # Diferencia de puntos 
+        # Diferencia de puntos
         diferencia_puntos = game_logic.puntos_blanco - game_logic.puntos_negro
 
         # Movilidad
-        mov_blanco = len(game_logic.obtener_movimientos_validos(game_logic.pos_blanco))
-        mov_negro = len(game_logic.obtener_movimientos_validos(game_logic.pos_negro))
-        movilidad = (mov_blanco - mov_negro) * 0.5
+        mov_blanco = game_logic.contar_movimientos_validos(game_logic.pos_blanco)
+        mov_negro = game_logic.contar_movimientos_validos(game_logic.pos_negro)
+        movilidad = (mov_blanco - mov_negro) * self.peso_movilidad
 
         return diferencia_puntos + movilidad
 
-    def minimax(
-        self,
-        tablero,
-        pos_blanco,
-        pos_negro,
-        puntos_blanco,
-        puntos_negro,
-        profundidad,
-        es_turno_blanco,
-        alpha,
-        beta,
-        movimientos_caballo,
-        casillas_bloqueadas,
-    ):
+    def minimax(self, estado, profundidad, alpha, beta):
         """
         Algoritmo Minimax con poda Alpha-Beta
         La IA juega con el blanco (MAXIMIZA su puntuación)
         El humano juega con el negro (MINIMIZA la puntuación de la IA)
         puntos_blanco - puntos_negro (positivo = bueno para IA)
+
+        Recorre el árbol haciendo y deshaciendo movimientos sobre `estado`,
+        que al terminar queda exactamente como estaba.
+
+        Toda evaluación es la diferencia de puntos actual más un término que
+        depende solo de la posición, así que la tabla de transposición guarda
+        el valor relativo a estado.diferencia() y sirve para cualquier orden
+        de movimientos que llegue a la misma posición.
         """
+        self.nodos += 1
+        if self.limite is not None and not self.nodos & MASCARA_VERIFICACION:
+            self.limite.verificar(self.nodos)
+            if self.progreso is not None:
+                self._informar_progreso()
 
         if profundidad == 0:
+            self._hoja_alcanzada = True
+            self.hojas += 1
+            if estado.ply > self.ply_maximo:
+                self.ply_maximo = estado.ply
             # Evaluar desde la perspectiva de la IA
-            diferencia = puntos_blanco - puntos_negro
+            diferencia = estado.diferencia()
             # Agregar factor de movilidad
-            mov_blanco = self._contar_movimientos(
-                pos_blanco,
-                tablero,
-                movimientos_caballo,
-                casillas_bloqueadas,
+            return (
+                diferencia + estado.diferencia_movilidad() * self.peso_movilidad,
                 None,
-                pos_negro,
             )
-            mov_negro = self._contar_movimientos(
-                pos_negro,
-                tablero,
-                movimientos_caballo,
-                casillas_bloqueadas,
-                pos_blanco,
-                None,
-            )
-            return diferencia + (mov_blanco - mov_negro) * 0.5, None
 
-        if es_turno_blanco:
+        movimiento_tabla = None
+        tabla = self.tabla if profundidad >= PROFUNDIDAD_MINIMA_TT else None
+        if tabla is not None:
+            entrada = tabla.consultar(estado.clave)
+            if entrada is not None:
+                movimiento_tabla = entrada[3]
+            if entrada is not None and entrada[0] >= profundidad:
+                _, valor, tipo, movimiento = entrada
+                valor += estado.diferencia()
+                if (
+                    tipo == EXACTO
+                    or (tipo == COTA_INFERIOR and valor >= beta)
+                    or (tipo == COTA_SUPERIOR and valor <= alpha)
+                ):
+                    tabla.cortes += 1
+                    # El valor guardado pudo venir de hojas heurísticas
+                    self._hoja_alcanzada = True
+                    return valor, movimiento
+
+        alpha_inicial = alpha
+        beta_inicial = beta
+        movimientos = estado.movimientos()
+        ordenador = self.ordenador
+        if ordenador is not None and len(movimientos) > 1:
+            ordenador.ordenar(movimientos, estado, movimiento_tabla)
+
+        if profundidad == 1 and movimientos and self.evaluacion_lotes:
+            return self._expandir_frontera(estado, movimientos, alpha, beta)
+
+        if estado.lado == BLANCO:
             # Turno de la IA - MAXIMIZA la evaluación
-            movimientos = self._obtener_movimientos(
-                pos_blanco,
-                tablero,
-                movimientos_caballo,
-                casillas_bloqueadas,
-                None,
-                pos_negro,
-            )
-
             if not movimientos:
+                self._contar_hoja_terminal(estado)
                 # Si el blanco no puede moverse, es malo para la IA
-                return puntos_blanco - puntos_negro - 100, None
+                return estado.diferencia() - self.castigo_sin_movimientos, None
 
-            max_eval = float("-inf")
+            mejor_eval = float("-inf")
             mejor_movimiento = None
 
-            for mov in movimientos:
-                tablero_copia = [fila[:] for fila in tablero]
-                puntos_ganados = tablero_copia[mov[0]][mov[1]]
-                tablero_copia[mov[0]][mov[1]] = 0
-                nuevos_puntos_blanco = puntos_blanco + puntos_ganados
-
-                nuevas_bloqueadas = casillas_bloqueadas.copy()
-                nuevas_bloqueadas.add(pos_blanco)
-                nuevas_bloqueadas.add(mov)
-
-                eval_score, _ = self.minimax(
-                    tablero_copia,
-                    mov,
-                    pos_negro,
-                    nuevos_puntos_blanco,
-                    puntos_negro,
-                    profundidad - 1,
-                    False,  # Siguiente turno es del negro
-                    alpha,
-                    beta,
-                    movimientos_caballo,
-                    nuevas_bloqueadas,
-                )
-
-                if eval_score > max_eval:
-                    max_eval = eval_score
+            for i, mov in enumerate(movimientos):
+                estado.hacer_movimiento(mov)
+                if i == 0 or not self.usar_pvs:
+                    eval_score, _ = self.minimax(estado, profundidad - 1, alpha, beta)
+                else:
+                    eval_score = self._buscar_ventana_nula(
+                        estado, profundidad - 1, alpha, beta, maximiza=True
+                    )
+                estado.deshacer_movimiento()
+
+                if eval_score > mejor_eval:
+                    mejor_eval = eval_score
                     mejor_movimiento = mov
 
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
+                    self._registrar_corte(mov, i, estado, profundidad)
                     break  # Poda Beta
 
-            return max_eval, mejor_movimiento
-
         else:
             # Turno del jugador negro - MINIMIZA la evaluación de la IA
-            movimientos = self._obtener_movimientos(
-                pos_negro,
-                tablero,
-                movimientos_caballo,
-                casillas_bloqueadas,
-                pos_blanco,
-                None,
-            )
-
             if not movimientos:
-                # Si el negro no puede moverse, pierde 4 puntos 
-                return puntos_blanco - (puntos_negro - 4) + 100, None
+                self._contar_hoja_terminal(estado)
+                # Si el negro no puede moverse, pierde 4 puntos
+                return (
+                    estado.diferencia()
+                    + PENALIZACION_SIN_MOVIMIENTOS
+                    + self.castigo_sin_movimientos,
+                    None,
+                )
 
-            min_eval = float("inf")
+            mejor_eval = float("inf")
             mejor_movimiento = None
 
-            for mov in movimientos:
-                tablero_copia = [fila[:] for fila in tablero]
-                puntos_ganados = tablero_copia[mov[0]][mov[1]]
-                tablero_copia[mov[0]][mov[1]] = 0
-                nuevos_puntos_negro = puntos_negro + puntos_ganados
-
-                # Copiar casillas bloqueadas y agregar las nuevas
-                nuevas_bloqueadas = casillas_bloqueadas.copy()
-                nuevas_bloqueadas.add(pos_negro)
-                nuevas_bloqueadas.add(mov)
-
-                eval_score, _ = self.minimax(
-                    tablero_copia,
-                    pos_blanco,
-                    mov,
-                    puntos_blanco,
-                    nuevos_puntos_negro,
-                    profundidad - 1,
-                    True,  # Siguiente turno es del blanco
-                    alpha,
-                    beta,
-                    movimientos_caballo,
-                    nuevas_bloqueadas,
-                )
-
-                if eval_score < min_eval:
-                    min_eval = eval_score
+            for i, mov in enumerate(movimientos):
+                estado.hacer_movimiento(mov)
+                if i == 0 or not self.usar_pvs:
+                    eval_score, _ = self.minimax(estado, profundidad - 1, alpha, beta)
+                else:
+                    eval_score = self._buscar_ventana_nula(
+                        estado, profundidad - 1, alpha, beta, maximiza=False
+                    )
+                estado.deshacer_movimiento()
+
+                if eval_score < mejor_eval:
+                    mejor_eval = eval_score
                     mejor_movimiento = mov
 
                 beta = min(beta, eval_score)
                 if beta <= alpha:
+                    self._registrar_corte(mov, i, estado, profundidad)
                     break  # Poda Alpha
 
-            return min_eval, mejor_movimiento
+        if tabla is not None:
+            if mejor_eval <= alpha_inicial:
+                tipo = COTA_SUPERIOR
+            elif mejor_eval >= beta_inicial:
+                tipo = COTA_INFERIOR
+            else:
+                tipo = EXACTO
+            tabla.guardar(
+                estado.clave,
+                profundidad,
+                mejor_eval - estado.diferencia(),
+                tipo,
+                mejor_movimiento,
+            )
 
-    def _obtener_movimientos(
-        self,
-        pos,
-        tablero,
-        movimientos_caballo,
-        casillas_bloqueadas=None,
-        pos_blanco=None,
-        pos_negro=None,
-    ):
-        """Obtiene movimientos válidos - no puede moverse a casilla ocupada por otro caballo"""
-        movimientos = []
-        fila, col = pos
-
-        if casillas_bloqueadas is None:
-            casillas_bloqueadas = set()
-
-        for df, dc in movimientos_caballo:
-            nueva_fila = fila + df
-            nueva_col = col + dc
-
-            # Verificar que esté en el tablero, que la casilla no esté bloqueada
-            # y que no esté ocupada por el otro caballo
-            
-            if (
-                0 <= nueva_fila < 8
-                and 0 <= nueva_col < 8
-                and (nueva_fila, nueva_col) not in casillas_bloqueadas
-                and (pos_blanco is None or (nueva_fila, nueva_col) != pos_blanco)
-                and (pos_negro is None or (nueva_fila, nueva_col) != pos_negro)
-            ):
-                movimientos.append((nueva_fila, nueva_col))
+        return mejor_eval, mejor_movimiento
 
-        return movimientos
+    def _buscar_ventana_nula(self, estado, profundidad, alpha, beta, maximiza):
+        """
+        PVS para un movimiento que no es el primero (ya jugado en `estado`):
+        prueba con ventana nula si mejora al mejor conocido y, solo si lo
+        mejora, lo vuelve a buscar con la ventana (alpha, beta) para tener
+        su valor. Retorna el valor del hijo.
+        """
+        if maximiza:
+            valor, _ = self.minimax(estado, profundidad, alpha, alpha + VENTANA_NULA)
+        else:
+            valor, _ = self.minimax(estado, profundidad, beta - VENTANA_NULA, beta)
+        if alpha < valor < beta:
+            self.re_busquedas += 1
+            valor, _ = self.minimax(estado, profundidad, alpha, beta)
+        return valor
 
-    def _contar_movimientos(
-        self,
-        pos,
-        tablero,
-        movimientos_caballo,
-        casillas_bloqueadas=None,
-        pos_blanco=None,
-        pos_negro=None,
-    ):
-        """Cuenta la cantidad de movimientos válidos"""
-        return len(
-            self._obtener_movimientos(
-                pos,
-                tablero,
-                movimientos_caballo,
-                casillas_bloqueadas,
-                pos_blanco,
-                pos_negro,
+    def buscar_aspiracion(self, estado, profundidad, valor_anterior):
+        """
+        Busca la raíz con una ventana de aspiración centrada en
+        `valor_anterior`; si el valor cae fuera, abre ese lado de la ventana
+        y repite. Retorna (valor, mejor_movimiento).
+        """
+        alpha = valor_anterior - VENTANA_ASPIRACION
+        beta = valor_anterior + VENTANA_ASPIRACION
+        while True:
+            valor, movimiento = self.minimax(estado, profundidad, alpha, beta)
+            if valor <= alpha:
+                alpha = float("-inf")
+            elif valor >= beta:
+                beta = float("inf")
+            else:
+                return valor, movimiento
+            self.fallos_aspiracion += 1
+
+    def buscar_raiz(self, estado, profundidad, valor_anterior=None):
+        """
+        Busca la raíz a `profundidad`, en paralelo si está configurado y vale
+        la pena. Con `usar_pvs` y `valor_anterior` (sin paralelismo) usa una
+        ventana de aspiración; si no, la ventana completa.
+        Retorna (valor, mejor_movimiento).
+        """
+        paralela = self.paralela
+        if paralela is None or profundidad < PROFUNDIDAD_MINIMA_PARALELA:
+            if self.usar_pvs and valor_anterior is not None:
+                return self.buscar_aspiracion(estado, profundidad, valor_anterior)
+            return self.minimax(estado, profundidad, float("-inf"), float("inf"))
+
+        movimientos = estado.movimientos()
+        if len(movimientos) < 2:
+            return self.minimax(estado, profundidad, float("-inf"), float("inf"))
+
+        # Las tablas de los procesos no se ven desde aquí: la propia guarda
+        # el mejor movimiento de la raíz para ordenarlo primero la próxima vez
+        movimiento_tabla = None
+        if self.tabla is not None:
+            entrada = self.tabla.consultar(estado.clave)
+            if entrada is not None:
+                movimiento_tabla = entrada[3]
+        if self.ordenador is not None:
+            self.ordenador.ordenar(movimientos, estado, movimiento_tabla)
+
+        self.nodos += 1
+        try:
+            valor, movimiento = paralela.buscar(
+                estado, movimientos, profundidad, self.limite, self.nodos
+            )
+        finally:
+            self.nodos += paralela.nodos
+        self._hoja_alcanzada = self._hoja_alcanzada or paralela.hoja_alcanzada
+        if self.tabla is not None:
+            self.tabla.guardar(
+                estado.clave,
+                profundidad,
+                valor - estado.diferencia(),
+                EXACTO,
+                movimiento,
             )
+        return valor, movimiento
+
+    def _expandir_frontera(self, estado, movimientos, alpha, beta):
+        """
+        Nodo a profundidad 1: evalúa los hijos con evaluar_hijos, sin hacer
+        ni deshacer cada movimiento, y los recorre con las mismas reglas (y
+        cortes) que minimax, así que el resultado y los contadores son los
+        mismos
+        """
+        maximiza = estado.lado == BLANCO
+        mejor_eval = float("-inf") if maximiza else float("inf")
+        mejor_movimiento = None
+        visitados = 0
+        valores = evaluar_hijos(estado, movimientos, self.peso_movilidad)
+        for i, (mov, eval_score) in enumerate(zip(movimientos, valores)):
+            visitados += 1
+            if maximiza:
+                if eval_score > mejor_eval:
+                    mejor_eval = eval_score
+                    mejor_movimiento = mov
+                alpha = max(alpha, eval_score)
+            else:
+                if eval_score < mejor_eval:
+                    mejor_eval = eval_score
+                    mejor_movimiento = mov
+                beta = min(beta, eval_score)
+            if beta <= alpha:
+                self._registrar_corte(mov, i, estado, profundidad=1)
+                break
+
+        antes = self.nodos
+        self.nodos += visitados
+        self.hojas += visitados
+        self._hoja_alcanzada = True
+        if estado.ply + 1 > self.ply_maximo:
+            self.ply_maximo = estado.ply + 1
+        # Revisar el presupuesto si se cruzó un múltiplo de 1024 nodos
+        if self.limite is not None and (
+            antes | MASCARA_VERIFICACION != self.nodos | MASCARA_VERIFICACION
+        ):
+            self.limite.verificar(self.nodos)
+            if self.progreso is not None:
+                self._informar_progreso()
+        return mejor_eval, mejor_movimiento
+
+    def _contar_hoja_terminal(self, estado):
+        """Cuenta una posición sin movimientos para el bando en turno"""
+        self.hojas += 1
+        if estado.ply > self.ply_maximo:
+            self.ply_maximo = estado.ply
+
+    def _registrar_corte(self, mov, i, estado, profundidad):
+        """Cuenta un corte y se lo informa al ordenador de movimientos"""
+        self.cortes += 1
+        if estado.lado == BLANCO:
+            self.cortes_beta += 1
+        else:
+            self.cortes_alfa += 1
+        if i == 0:
+            self.cortes_primer_movimiento += 1
+        if self.ordenador is not None:
+            self.ordenador.registrar_corte(mov, estado, profundidad)
+
+    def _informar_progreso(self):
+        """Envía al callback de progreso el avance de la búsqueda en curso"""
+        movimiento = self.ultimo_movimiento
+        if movimiento is not None:
+            movimiento = posicion(movimiento, self._dimension)
+        self.progreso(
+            {
+                "profundidad": self._profundidad_actual,
+                "profundidad_completada": self.profundidad_alcanzada,
+                "nodos": self.nodos,
+                "valor": self.ultimo_valor,
+                "movimiento": movimiento,
+                "variante": self.ultima_variante,
+            }
         )
 
-    def obtener_mejor_movimiento(self, game_logic):
-        """Calcula y retorna el mejor movimiento para la IA """
-        from config import MOVIMIENTOS_CABALLO
-
-        _, mejor_movimiento = self.minimax(
-            game_logic.tablero,
-            game_logic.pos_blanco,
-            game_logic.pos_negro,
-            game_logic.puntos_blanco,
-            game_logic.puntos_negro,
-            self.profundidad,
-            True,  
-            float("-inf"),
-            float("inf"),
-            MOVIMIENTOS_CABALLO,
-            game_logic.casillas_bloqueadas,
+    def preparar_busqueda(self, estado):
+        """Reinicia contadores y estructuras al empezar una búsqueda"""
+        self._dimension = estado.dimension
+        self.profundidad_alcanzada = 0
+        self.ultimo_valor = None
+        self.ultimo_movimiento = None
+        self.ultima_variante = []
+        self.nodos = 0
+        self.hojas = 0
+        self.cortes = 0
+        self.cortes_beta = 0
+        self.cortes_alfa = 0
+        self.cortes_primer_movimiento = 0
+        self.re_busquedas = 0
+        self.fallos_aspiracion = 0
+        self.ply_maximo = estado.ply
+        self._iteraciones = []
+        if self.tabla is not None:
+            self.tabla.nueva_busqueda()
+        if self.ordenar_movimientos:
+            ordenador = self.ordenador
+            if ordenador is None or ordenador.dimension != estado.dimension:
+                self.ordenador = OrdenadorMovimientos(estado.dimension)
+            self.ordenador.nueva_busqueda()
+
+    def estimar_movimientos_restantes(self, estado):
+        """
+        Estima cuántas jugadas le quedan al bando en turno: la mitad de las
+        casillas libres que su caballo todavía puede alcanzar.
+        """
+        lado = estado.lado
+        libres = ~estado.ocupadas(lado)
+        alcanzables = casillas_alcanzables(
+            estado.posiciones[lado], libres, estado.mascaras_caballo
         )
+        return max(1, (contar_bits(alcanzables) + 1) // 2)
+
+    def asignar_tiempo(self, estado):
+        """Reparte el tiempo restante de la partida entre las jugadas que quedan"""
+        movimientos_restantes = self.estimar_movimientos_restantes(estado)
+        return max(TIEMPO_MINIMO_MS, self.tiempo_restante_ms / movimientos_restantes)
+
+    def profundidad_maxima(self, estado):
+        """Tope de la profundización iterativa para la posición"""
+        tamano = estado.dimension * estado.dimension
+        pos_blanco, pos_negro = estado.posiciones
+        ocupadas = estado.bloqueadas | 1 << pos_blanco | 1 << pos_negro
+        # Cada jugada ocupa una casilla libre: la partida no puede durar más
+        maxima = contar_bits(~ocupadas & ((1 << tamano) - 1))
+        if self.profundidad is not None:
+            maxima = min(maxima, self.profundidad)
+        return maxima
+
+    def profundizacion_iterativa(self, estado, limite):
+        """
+        Busca a profundidad 1, 2, 3... hasta agotar `limite`.
+        Retorna el mejor movimiento de la última profundidad completada.
+        """
+        maxima = self.profundidad_maxima(estado)
+
+        mejor_movimiento = None
+        valor_anterior = None
+        for profundidad in range(1, maxima + 1):
+            # La profundidad 1 siempre termina (salvo cancelación), para tener
+            # una jugada
+            self.limite = limite if profundidad > 1 else limite.solo_cancelacion()
+            self._profundidad_actual = profundidad
+            self._hoja_alcanzada = False
+            try:
+                valor, movimiento = self.buscar_raiz(
+                    estado, profundidad, valor_anterior
+                )
+            except BusquedaInterrumpida:
+                break
+            finally:
+                self.limite = None
+
+            mejor_movimiento = movimiento
+            valor_anterior = valor
+            self.profundidad_alcanzada = profundidad
+            self._iteraciones.append(
+                (profundidad, self.nodos, limite.transcurrido_ms())
+            )
+            self.ultimo_valor = valor
+            self.ultimo_movimiento = movimiento
+            if self.progreso is not None:
+                # Entre iteraciones `estado` está en la raíz: se puede recorrer
+                self.ultima_variante = self.variante_principal(
+                    estado, movimiento, profundidad
+                )
+                self._informar_progreso()
 
-        if mejor_movimiento is None:
-            movimientos = game_logic.obtener_movimientos_validos(game_logic.pos_blanco)
-            if movimientos:
-                mejor_movimiento = random.choice(movimientos)
+            # Sin hojas heurísticas el árbol completo ya está resuelto
+            if movimiento is None or not self._hoja_alcanzada:
+                break
+            if limite.tiempo_ms is not None and (
+                limite.transcurrido_ms() > limite.tiempo_ms * FRACCION_NUEVA_ITERACION
+            ):
+                break
 
         return mejor_movimiento
+
+    def ponderar(self, game_logic, token):
+        """
+        Piensa durante el turno del rival. Para cada respuesta posible del
+        rival (las más probables primero) busca la posición resultante por
+        profundización iterativa, profundidad por profundidad, hasta que
+        `token` se cancele o, con profundidad fija, se alcance self.profundidad.
+
+        Los resultados quedan en la tabla de transposición y en
+        resultados_ponder; obtener_mejor_movimiento los aprovecha cuando el
+        rival juega una de esas respuestas.
+        """
+        estado = EstadoBusqueda.desde_game_logic(game_logic)
+        self.resultados_ponder = {}
+        respuestas = estado.movimientos()
+        if not respuestas:
+            return
+
+        self.preparar_busqueda(estado)
+        if self.ordenador is not None:
+            movimiento_tabla = None
+            if self.tabla is not None:
+                entrada = self.tabla.consultar(estado.clave)
+                if entrada is not None:
+                    movimiento_tabla = entrada[3]
+            self.ordenador.ordenar(respuestas, estado, movimiento_tabla)
+
+        pendientes = respuestas
+        profundidad = 0
+        while pendientes:
+            profundidad += 1
+            siguientes = []
+            for respuesta in pendientes:
+                estado.hacer_movimiento(respuesta)
+                if profundidad > self.profundidad_maxima(estado):
+                    estado.deshacer_movimiento()
+                    continue
+
+                self._hoja_alcanzada = False
+                self.limite = LimiteBusqueda(token=token)
+                try:
+                    valor, movimiento = self.minimax(
+                        estado, profundidad, float("-inf"), float("inf")
+                    )
+                except BusquedaInterrumpida:
+                    return
+                finally:
+                    self.limite = None
+
+                completo = movimiento is None or not self._hoja_alcanzada
+                self.resultados_ponder[estado.clave] = (
+                    profundidad,
+                    movimiento,
+                    valor,
+                    completo,
+                )
+                estado.deshacer_movimiento()
+                if not completo:
+                    siguientes.append(respuesta)
+            pendientes = siguientes
+
+    def _resultado_ponder(self, estado):
+        """
+        Retorna (movimiento, valor, profundidad) si la ponderación ya resolvió
+        la posición con la profundidad pedida, o None.
+        """
+        resultado = self.resultados_ponder.get(estado.clave)
+        if resultado is None:
+            return None
+        profundidad, movimiento, valor, completo = resultado
+        if movimiento is None:
+            return None
+        if completo:
+            return movimiento, valor, profundidad
+        if self.profundidad is not None and profundidad >= self.profundidad:
+            return movimiento, valor, profundidad
+        return None
+
+    def resolver_final(self, estado, limite=None):
+        """
+        Si la posición es un final al alcance del solucionador exacto,
+        retorna (movimiento, valor) con juego perfecto; valor es la
+        diferencia final de marcador. Retorna None si no aplica, si se
+        agotó `limite` (LimiteBusqueda) antes de resolverlo o si el
+        solucionador no dio una jugada (entonces se busca como siempre).
+        """
+        if self.solucionador is None or not estado.movimientos():
+            return None
+        if not es_final(estado, self.casillas_final_exacto):
+            return None
+        try:
+            valor, movimiento = self.solucionador.resolver(estado, limite)
+        except BusquedaInterrumpida:
+            return None
+        finally:
+            self.nodos += self.solucionador.nodos
+        if movimiento is None:
+            return None
+        return movimiento, valor
+
+    def _contadores_tabla(self):
+        tabla = self.tabla
+        if tabla is None:
+            return (0, 0, 0)
+        return (tabla.consultas, tabla.aciertos, tabla.cortes)
+
+    def variante_principal(self, estado, movimiento, profundidad):
+        """
+        Jugadas esperadas desde la raíz: `movimiento` y luego los mejores
+        movimientos guardados en la tabla de transposición. Puede quedar
+        más corta que `profundidad` (la tabla no guarda los últimos plies).
+        """
+        variante = []
+        hechos = 0
+        while movimiento is not None and len(variante) < profundidad:
+            if movimiento not in estado.movimientos():
+                break
+            variante.append(posicion(movimiento, estado.dimension))
+            estado.hacer_movimiento(movimiento)
+            hechos += 1
+            movimiento = None
+            if self.tabla is not None:
+                entrada = self.tabla.consultar(estado.clave)
+                if entrada is not None:
+                    movimiento = entrada[3]
+        for _ in range(hechos):
+            estado.deshacer_movimiento()
+        return variante
+
+    def _recopilar_estadisticas(
+        self, estado, origen, movimiento, tabla_inicial, inicio
+    ):
+        """Arma las EstadisticasBusqueda de la búsqueda recién terminada"""
+        estadisticas = EstadisticasBusqueda(origen)
+        estadisticas.nodos = self.nodos
+        estadisticas.hojas = self.hojas
+        estadisticas.cortes_beta = self.cortes_beta
+        estadisticas.cortes_alfa = self.cortes_alfa
+        estadisticas.cortes_primer_movimiento = self.cortes_primer_movimiento
+        estadisticas.re_busquedas = self.re_busquedas
+        estadisticas.fallos_aspiracion = self.fallos_aspiracion
+        consultas, aciertos, cortes = self._contadores_tabla()
+        estadisticas.consultas_tt = consultas - tabla_inicial[0]
+        estadisticas.aciertos_tt = aciertos - tabla_inicial[1]
+        estadisticas.cortes_tt = cortes - tabla_inicial[2]
+        estadisticas.profundidad = self.profundidad_alcanzada
+        estadisticas.profundidad_maxima = self.ply_maximo - estado.ply
+        estadisticas.valor = self.ultimo_valor
+        for profundidad, nodos, tiempo_ms in self._iteraciones:
+            estadisticas.registrar_iteracion(profundidad, nodos, tiempo_ms)
+        if movimiento is not None:
+            estadisticas.movimiento = posicion(movimiento, estado.dimension)
+            estadisticas.variante_principal = self.variante_principal(
+                estado, movimiento, max(1, self.profundidad_alcanzada)
+            )
+        estadisticas.tiempo_ms = (time.perf_counter() - inicio) * 1000
+        return estadisticas
+
+    def obtener_mejor_movimiento(
+        self, game_logic, tiempo_ms=None, token=None, progreso=None
+    ):
+        """
+        Calcula y retorna el mejor movimiento para el bando en turno.
+        `tiempo_ms` fija el tiempo de esta jugada; si no se da y el jugador
+        tiene tiempo de partida, se asigna una parte de lo que queda.
+        `token` (TokenCancelacion) permite detener la búsqueda desde otro hilo
+        y `progreso` recibe periódicamente un dict con profundidad, nodos,
+        valor y mejor movimiento. Si se cancela antes de tener una jugada
+        retorna None.
+        """
+        inicio = time.perf_counter()
+        estado = EstadoBusqueda.desde_game_logic(game_logic)
+        self.preparar_busqueda(estado)
+        self.progreso = progreso
+        tabla_inicial = self._contadores_tabla()
+
+        if tiempo_ms is None and self.tiempo_restante_ms is not None:
+            tiempo_ms = self.asignar_tiempo(estado)
+
+        # Un solo presupuesto por jugada: si el solucionador de finales no
+        # termina, la búsqueda sigue con lo que quede
+        limite = LimiteBusqueda(tiempo_ms, self.limite_nodos, token)
+        final = self.resolver_final(estado, limite)
+        ponderado = None if final is not None else self._resultado_ponder(estado)
+        if final is not None:
+            # Final exacto; si no alcanzó el tiempo se busca como siempre
+            mejor_movimiento, self.ultimo_valor = final
+            origen = "finales"
+        elif ponderado is not None:
+            # Respuesta prevista: la jugada ya se calculó en el turno del rival
+            mejor_movimiento, self.ultimo_valor, self.profundidad_alcanzada = ponderado
+            origen = "ponder"
+        elif tiempo_ms is None and self.limite_nodos is None:
+            origen = "busqueda"
+            self._profundidad_actual = self.profundidad
+            self.limite = None if token is None else LimiteBusqueda(token=token)
+            try:
+                self.ultimo_valor, mejor_movimiento = self.buscar_raiz(
+                    estado, self.profundidad
+                )
+                self.profundidad_alcanzada = self.profundidad
+                transcurrido_ms = (time.perf_counter() - inicio) * 1000
+                self._iteraciones.append(
+                    (self.profundidad, self.nodos, transcurrido_ms)
+                )
+            except BusquedaInterrumpida:
+                mejor_movimiento = None
+            finally:
+                self.limite = None
+        else:
+            origen = "profundizacion"
+            mejor_movimiento = self.profundizacion_iterativa(estado, limite)
+        if self.tiempo_restante_ms is not None:
+            transcurrido_ms = (time.perf_counter() - inicio) * 1000
+            self.tiempo_restante_ms = max(0, self.tiempo_restante_ms - transcurrido_ms)
+        self.progreso = None
+        self.estadisticas = self._recopilar_estadisticas(
+            estado, origen, mejor_movimiento, tabla_inicial, inicio
+        )
+        registro.info("%s", self.estadisticas.resumen())
+
+        if token is not None and token.cancelado() and mejor_movimiento is None:
+            return None
+
+        if mejor_movimiento is not None:
+            return posicion(mejor_movimiento, estado.dimension)
+
+        if game_logic.turno_blanco:
+            movimientos = game_logic.obtener_movimientos_validos(game_logic.pos_blanco)
+        else:
+            movimientos = game_logic.obtener_movimientos_validos(game_logic.pos_negro)
+        if movimientos:
+            return random.choice(movimientos)
+
+        return None
+
+
+def comparar_ordenamiento(game_logic, profundidad):
+    """
+    Busca la misma posición con y sin ordenamiento de movimientos (sin tabla
+    de transposición, para aislar el efecto) y retorna nodos y cortes de cada
+    búsqueda junto con el ahorro relativo de nodos.
+    """
+    resultado = {}
+    for nombre, ordenar in (("fijo", False), ("ordenado", True)):
+        jugador = AIPlayer(
+            profundidad,
+            usar_transposicion=False,
+            ordenar_movimientos=ordenar,
+            casillas_final_exacto=None,
+        )
+        movimiento = jugador.obtener_mejor_movimiento(game_logic)
+        resultado[nombre] = {
+            "movimiento": movimiento,
+            "nodos": jugador.nodos,
+            "cortes": jugador.cortes,
+            "cortes_primer_movimiento": jugador.cortes_primer_movimiento,
+        }
+    nodos_fijo = resultado["fijo"]["nodos"]
+    resultado["ahorro_nodos"] = 1 - resultado["ordenado"]["nodos"] / nodos_fijo
+    return resultado
+
+
+def comparar_pvs(game_logic, profundidad):
+    """
+    Busca la misma posición con Alpha-Beta y con PVS, ambas por
+    profundización iterativa hasta `profundidad` (así PVS usa ventanas de
+    aspiración), y retorna jugada, nodos y re-búsquedas de cada una junto
+    con el ahorro relativo de nodos.
+    """
+    resultado = {}
+    for nombre, usar_pvs in (("alfabeta", False), ("pvs", True)):
+        jugador = AIPlayer(
+            profundidad,
+            limite_nodos=float("inf"),
+            casillas_final_exacto=None,
+            usar_pvs=usar_pvs,
+        )
+        movimiento = jugador.obtener_mejor_movimiento(game_logic)
+        resultado[nombre] = {
+            "movimiento": movimiento,
+            "valor": jugador.ultimo_valor,
+            "nodos": jugador.nodos,
+            "re_busquedas": jugador.re_busquedas,
+            "fallos_aspiracion": jugador.fallos_aspiracion,
+        }
+    nodos_alfabeta = resultado["alfabeta"]["nodos"]
+    resultado["ahorro_nodos"] = 1 - resultado["pvs"]["nodos"] / nodos_alfabeta
+    return resultado
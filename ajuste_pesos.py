@@ -0,0 +1,306 @@
+"""
+Ajuste de los pesos de la evaluación con partidas registradas (Texel)
+
+Uso:
+    python ajuste_pesos.py partidas.shr --generar 400 --verificar 200 \\
+        --salida pesos.json
+
+Cada posición de las partidas (registro_partidas) se resume en los términos
+de la evaluación de AIPlayer: diferencia de puntos, diferencia de movilidad
+y si el bando en turno no puede mover. La evaluación es lineal en los pesos
+(TERMINOS), así que se ajustan para que sigmoide(K × evaluación) prediga el
+resultado de la partida (1, 0.5 o 0 para el blanco) con el menor error
+cuadrático; K se fija antes con los pesos actuales.
+
+1. Con --generar se juegan primero esas partidas de autojuego (torneo.py)
+   y se agregan al registro.
+2. La extracción de posiciones se reparte entre procesos.
+3. El ajuste recorre cada peso por sección áurea dentro de su rango.
+4. Remuestreando partidas (bootstrap) se estiman el error estándar y el
+   intervalo del 95 % de cada peso.
+5. Con --verificar se juega un torneo entre los pesos ajustados y el rival
+   (por defecto los pesos actuales) y se informa la diferencia de Elo.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from config import CASTIGO_SIN_MOVIMIENTOS, PESO_MOVILIDAD
+from estado_busqueda import BLANCO, PENALIZACION_SIN_MOVIMIENTOS, EstadoBusqueda
+from registro_partidas import leer_partidas, reproducir
+from torneo import ejecutar_torneo, formatear_resumen, leer_configuracion, resumir
+
+# Pesos ajustables: argumento de AIPlayer -> (valor actual, mínimo, máximo)
+TERMINOS = {
+    "peso_movilidad": (PESO_MOVILIDAD, 0.0, 5.0),
+    "castigo_sin_movimientos": (CASTIGO_SIN_MOVIMIENTOS, 0.0, 200.0),
+}
+
+# Partidas por tarea de extracción y tareas en vuelo por proceso
+PARTIDAS_POR_LOTE = 64
+LOTES_POR_PROCESO = 2
+
+RONDAS_AJUSTE = 4
+ITERACIONES_SECCION_AUREA = 40
+REMUESTREOS = 50
+
+_PHI = (math.sqrt(5) - 1) / 2
+
+
+def caracteristicas_partida(registro):
+    """
+    Dict {(base, movilidad, sin_movimientos): (n, suma_y, suma_y2)} de
+    las posiciones de la partida. La evaluación de cada una es base +
+    peso_movilidad × movilidad + castigo_sin_movimientos × sin_movimientos
+    (sin_movimientos es -1 si el blanco no puede mover, +1 si el negro no
+    puede, 0 si no; entonces no cuenta la movilidad, como en minimax). Se
+    omiten las posiciones finales.
+    """
+    posiciones = Counter()
+    for partida in reproducir(registro):
+        estado = EstadoBusqueda.desde_game_logic(partida)
+        if estado.juego_terminado():
+            continue
+        base = estado.diferencia()
+        if estado.movimientos():
+            clave = (base, estado.diferencia_movilidad(), 0)
+        elif estado.lado == BLANCO:
+            clave = (base, 0, -1)
+        else:
+            clave = (base + PENALIZACION_SIN_MOVIMIENTOS, 0, 1)
+        posiciones[clave] += 1
+
+    diferencia = partida.puntos_blanco - partida.puntos_negro
+    resultado = 1.0 if diferencia > 0 else 0.0 if diferencia < 0 else 0.5
+    return {
+        clave: (n, n * resultado, n * resultado * resultado)
+        for clave, n in posiciones.items()
+    }
+
+
+def _caracteristicas_lote(registros):
+    return [caracteristicas_partida(registro) for registro in registros]
+
+
+def extraer(ruta, procesos=None):
+    """
+    Características de cada partida de `ruta` (lista en el orden del
+    archivo), extraídas en paralelo. El archivo se lee en streaming y solo
+    hay unos pocos lotes en vuelo por proceso.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    resultados = {}
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        en_vuelo = {}
+        maximo = LOTES_POR_PROCESO * procesos
+        lote = []
+        numero = 0
+
+        def enviar(lote, numero):
+            en_vuelo[pool.submit(_caracteristicas_lote, lote)] = numero
+
+        def recoger(cuando):
+            hechos, _ = wait(list(en_vuelo), return_when=cuando)
+            for futuro in hechos:
+                resultados[en_vuelo.pop(futuro)] = futuro.result()
+
+        for registro in leer_partidas(ruta):
+            lote.append(registro)
+            if len(lote) == PARTIDAS_POR_LOTE:
+                if len(en_vuelo) >= maximo:
+                    recoger(FIRST_COMPLETED)
+                enviar(lote, numero)
+                lote = []
+                numero += 1
+        if lote:
+            enviar(lote, numero)
+        while en_vuelo:
+            recoger(FIRST_COMPLETED)
+    return [partida for numero in sorted(resultados) for partida in resultados[numero]]
+
+
+def combinar(partidas):
+    """Suma las características de varias partidas en una lista de filas"""
+    total = {}
+    for posiciones in partidas:
+        for clave, (n, suma_y, suma_y2) in posiciones.items():
+            actual = total.get(clave)
+            if actual is None:
+                total[clave] = [n, suma_y, suma_y2]
+            else:
+                actual[0] += n
+                actual[1] += suma_y
+                actual[2] += suma_y2
+    return [(*clave, *valores) for clave, valores in total.items()]
+
+
+def error_medio(filas, k, pesos):
+    """Error cuadrático medio de sigmoide(k × evaluación) contra el resultado"""
+    peso_movilidad = pesos["peso_movilidad"]
+    castigo = pesos["castigo_sin_movimientos"]
+    suma = 0.0
+    posiciones = 0
+    for base, movilidad, sin_movimientos, n, suma_y, suma_y2 in filas:
+        evaluacion = base + peso_movilidad * movilidad + castigo * sin_movimientos
+        exponente = max(-60.0, min(60.0, -k * evaluacion))
+        p = 1.0 / (1.0 + math.exp(exponente))
+        suma += suma_y2 - 2 * p * suma_y + n * p * p
+        posiciones += n
+    return suma / posiciones if posiciones else 0.0
+
+
+def seccion_aurea(funcion, minimo, maximo, iteraciones=ITERACIONES_SECCION_AUREA):
+    """Mínimo de una función unimodal en [minimo, maximo]"""
+    a, b = minimo, maximo
+    c = b - _PHI * (b - a)
+    d = a + _PHI * (b - a)
+    fc, fd = funcion(c), funcion(d)
+    for _ in range(iteraciones):
+        if fc <= fd:
+            b, d, fd = d, c, fc
+            c = b - _PHI * (b - a)
+            fc = funcion(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + _PHI * (b - a)
+            fd = funcion(d)
+    return (a + b) / 2
+
+
+def ajustar_k(filas, pesos):
+    """Escala K de la sigmoide que mejor explica los resultados con `pesos`"""
+    return seccion_aurea(lambda k: error_medio(filas, k, pesos), 1e-3, 2.0)
+
+
+def ajustar_pesos(filas, k, pesos_iniciales):
+    """Minimiza el error recorriendo cada peso de TERMINOS por sección áurea"""
+    pesos = dict(pesos_iniciales)
+    for _ in range(RONDAS_AJUSTE):
+        for nombre, (_, minimo, maximo) in TERMINOS.items():
+
+            def error(valor):
+                return error_medio(filas, k, dict(pesos, **{nombre: valor}))
+
+            pesos[nombre] = seccion_aurea(error, minimo, maximo)
+    return pesos
+
+
+def bootstrap(partidas, k, pesos, remuestreos=REMUESTREOS, semilla=0):
+    """
+    Ajusta de nuevo sobre `remuestreos` muestras con reemplazo de las
+    partidas. Retorna por peso (error estándar, percentil 2.5, percentil 97.5).
+    """
+    generador = random.Random(semilla)
+    muestras = {nombre: [] for nombre in TERMINOS}
+    for _ in range(remuestreos):
+        muestra = generador.choices(partidas, k=len(partidas))
+        ajustados = ajustar_pesos(combinar(muestra), k, pesos)
+        for nombre, valor in ajustados.items():
+            muestras[nombre].append(valor)
+
+    resultado = {}
+    for nombre, valores in muestras.items():
+        valores.sort()
+        media = sum(valores) / len(valores)
+        varianza = sum((v - media) ** 2 for v in valores) / max(1, len(valores) - 1)
+        resultado[nombre] = (
+            math.sqrt(varianza),
+            valores[int(0.025 * (len(valores) - 1))],
+            valores[int(0.975 * (len(valores) - 1))],
+        )
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ajuste de los pesos de la evaluación (Texel)"
+    )
+    parser.add_argument("registro", help="archivo de registro_partidas")
+    parser.add_argument("--generar", type=int, default=0, help="partidas nuevas")
+    parser.add_argument("--profundidad", type=int, default=4)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--remuestreos", type=int, default=REMUESTREOS)
+    parser.add_argument("--verificar", type=int, default=0, help="partidas")
+    parser.add_argument(
+        "--rival", default=None, help="kwargs del rival (por defecto, mismos)"
+    )
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default=None, help="JSON con los pesos")
+    argumentos = parser.parse_args()
+
+    pesos_actuales = {nombre: valor for nombre, (valor, _, _) in TERMINOS.items()}
+    configuracion = {"profundidad": argumentos.profundidad}
+
+    if argumentos.generar:
+        ejecutar_torneo(
+            configuracion,
+            configuracion,
+            argumentos.generar,
+            argumentos.semilla,
+            argumentos.procesos,
+            ruta_partidas=argumentos.registro,
+        )
+
+    partidas = extraer(argumentos.registro, argumentos.procesos)
+    filas = combinar(partidas)
+    posiciones = sum(fila[3] for fila in filas)
+    print(f"{len(partidas)} partidas, {posiciones} posiciones")
+
+    k = ajustar_k(filas, pesos_actuales)
+    error_inicial = error_medio(filas, k, pesos_actuales)
+    pesos = ajustar_pesos(filas, k, pesos_actuales)
+    error_final = error_medio(filas, k, pesos)
+    intervalos = bootstrap(partidas, k, pesos, argumentos.remuestreos)
+    print(f"K = {k:.4f}, error {error_inicial:.5f} -> {error_final:.5f}")
+    for nombre, valor in pesos.items():
+        error_estandar, bajo, alto = intervalos[nombre]
+        print(
+            f"  {nombre}: {pesos_actuales[nombre]} -> {valor:.3f} "
+            f"(± {error_estandar:.3f}, 95 %: {bajo:.3f} .. {alto:.3f})"
+        )
+
+    resultado = {
+        "pesos": pesos,
+        "pesos_iniciales": pesos_actuales,
+        "k": k,
+        "error_inicial": error_inicial,
+        "error_final": error_final,
+        "partidas": len(partidas),
+        "posiciones": posiciones,
+        "intervalos": {
+            nombre: {"error_estandar": e, "min_95": bajo, "max_95": alto}
+            for nombre, (e, bajo, alto) in intervalos.items()
+        },
+    }
+
+    if argumentos.verificar:
+        rival = (
+            leer_configuracion(argumentos.rival)
+            if argumentos.rival is not None
+            else configuracion
+        )
+        registros = ejecutar_torneo(
+            dict(configuracion, **pesos),
+            rival,
+            argumentos.verificar,
+            argumentos.semilla + argumentos.generar,
+            argumentos.procesos,
+        )
+        resumen = resumir(registros)
+        print(formatear_resumen(resumen))
+        resultado["verificacion"] = resumen
+
+    if argumentos.salida is not None:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2)
+            archivo.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
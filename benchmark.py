@@ -0,0 +1,381 @@
+"""
+Banco de pruebas reproducible de la búsqueda
+
+Uso:
+    python benchmark.py correr --salida base.json
+    python benchmark.py comparar base.json            (corre y compara)
+    python benchmark.py comparar base.json nuevo.json
+    python benchmark.py pvs                           (Alpha-Beta contra PVS)
+    python benchmark.py escalado --dimensiones 6,8,12,16
+
+Las posiciones salen de semillas fijas: tableros iniciales y posiciones de
+medio juego y final obtenidas con jugadas aleatorias (también sembradas).
+Para cada posición y cada nivel de NIVELES se mide la búsqueda a esa
+profundidad: nodos, tiempo hasta completarla, nodos por segundo y jugada
+elegida. `comparar` marca las búsquedas más lentas que la base y las que
+cambiaron de jugada, y termina con código 1 si encontró alguna. `pvs`
+busca cada posición con Alpha-Beta y con PVS (ver ai_player.comparar_pvs),
+informa el ahorro de nodos y termina con código 1 si alguna jugada o valor
+difiere. `escalado` mide el mismo banco en tableros de otras dimensiones
+(con casillas con puntos en proporción al área) y compara nodos por
+segundo y tiempo por búsqueda entre ellas.
+
+El solucionador de finales va desactivado en `correr` y `escalado`: si no,
+las posiciones de final se resolverían exactamente en vez de buscarse a la
+profundidad del nivel, y las mediciones mezclarían los dos trabajos.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from ai_player import AIPlayer, comparar_pvs
+from config import (
+    NIVELES,
+    TAMANO_TABLERO,
+    VALORES_CASILLAS,
+    generar_tablero_aleatorio,
+    valores_casillas,
+)
+from estadisticas import configurar_registro
+from game_logic import GameLogic
+
+# Fase -> jugadas aleatorias desde el tablero inicial
+FASES = {"inicio": 0, "medio": 12, "final": 24}
+POSICIONES_POR_FASE = 8
+
+# Cada medición repite la búsqueda hasta sumar al menos este tiempo, como
+# timeit, para que las búsquedas cortas no queden dominadas por el ruido
+TIEMPO_MINIMO_MEDICION_MS = 20.0
+
+# Por debajo de este tiempo por búsqueda las diferencias son ruido
+TIEMPO_MINIMO_COMPARABLE_MS = 1.0
+
+# Dimensiones por defecto de `escalado`
+DIMENSIONES_ESCALADO = (6, 8, 10, 12, 16)
+
+
+def generar_posiciones(
+    semilla=0, por_fase=POSICIONES_POR_FASE, dimension=None, valores=None
+):
+    """
+    Retorna [(nombre, GameLogic)] con las posiciones del banco, en tableros
+    de `dimension` con casillas de `valores` (por defecto los clásicos)
+    """
+    posiciones = []
+    for fase, jugadas in FASES.items():
+        for i in range(por_fase):
+            semilla_posicion = semilla + i
+            partida = GameLogic(
+                *generar_tablero_aleatorio(semilla_posicion, dimension, valores)
+            )
+            generador = random.Random(semilla_posicion)
+            hechas = 0
+            while hechas < jugadas and not partida.verificar_fin_juego():
+                if partida.pasar_turno():
+                    continue
+                pos = partida.pos_blanco if partida.turno_blanco else partida.pos_negro
+                partida.mover_caballo(
+                    generador.choice(partida.obtener_movimientos_validos(pos))
+                )
+                hechas += 1
+            if partida.verificar_fin_juego():
+                continue
+            partida.pasar_turno()
+            posiciones.append((f"{fase}-{semilla_posicion}", partida))
+    return posiciones
+
+
+def medir(partida, profundidad, repeticiones=1, **opciones):
+    """
+    Busca `partida` a `profundidad`, siempre con un AIPlayer nuevo (los nodos
+    no cambian). Cada una de las `repeticiones` rondas repite la búsqueda
+    hasta sumar TIEMPO_MINIMO_MEDICION_MS; se reporta la ronda más rápida.
+    """
+    mejor_ms = None
+    for _ in range(repeticiones):
+        busquedas = 0
+        total_ms = 0.0
+        while total_ms < TIEMPO_MINIMO_MEDICION_MS:
+            jugador = AIPlayer(profundidad, **opciones)
+            inicio = time.perf_counter()
+            movimiento = jugador.obtener_mejor_movimiento(partida)
+            total_ms += (time.perf_counter() - inicio) * 1000
+            jugador.cerrar()
+            busquedas += 1
+        if mejor_ms is None or total_ms / busquedas < mejor_ms:
+            mejor_ms = total_ms / busquedas
+    estadisticas = jugador.estadisticas
+    return {
+        "movimiento": list(movimiento) if movimiento is not None else None,
+        "valor": jugador.ultimo_valor,
+        "hojas": estadisticas.hojas,
+        "cortes": estadisticas.cortes(),
+        "factor_ramificacion": estadisticas.factor_ramificacion(),
+        "variante_principal": [list(j) for j in estadisticas.variante_principal],
+        "origen": estadisticas.origen,
+        "nodos": jugador.nodos,
+        "tiempo_ms": mejor_ms,
+        "nodos_por_segundo": jugador.nodos / (mejor_ms / 1000) if mejor_ms else 0.0,
+    }
+
+
+def correr(semilla=0, niveles=None, repeticiones=1, **opciones):
+    """Corre el banco completo y retorna el dict que se guarda como JSON"""
+    niveles = niveles or list(NIVELES)
+    opciones.setdefault("casillas_final_exacto", None)
+    resultados = []
+    for nombre, partida in generar_posiciones(semilla):
+        for nivel in niveles:
+            profundidad = NIVELES[nivel]
+            medicion = medir(partida, profundidad, repeticiones, **opciones)
+            medicion.update(posicion=nombre, nivel=nivel, profundidad=profundidad)
+            resultados.append(medicion)
+            print(
+                f"{nombre:>10} {nivel:<12} {medicion['nodos']:>9} nodos "
+                f"{medicion['tiempo_ms']:>9.1f} ms",
+                file=sys.stderr,
+            )
+    return {
+        "semilla": semilla,
+        "opciones": opciones,
+        "python": platform.python_version(),
+        "resultados": resultados,
+        "totales": totalizar(resultados),
+    }
+
+
+def totalizar(resultados):
+    nodos = sum(r["nodos"] for r in resultados)
+    tiempo_ms = sum(r["tiempo_ms"] for r in resultados)
+    return {
+        "nodos": nodos,
+        "tiempo_ms": tiempo_ms,
+        "nodos_por_segundo": nodos / (tiempo_ms / 1000) if tiempo_ms else 0.0,
+    }
+
+
+def comparar(base, nuevo, tolerancia=0.10):
+    """
+    Compara dos resultados de correr(). Retorna (regresiones, avisos): las
+    búsquedas (y el total) más lentas que la base en más de `tolerancia` y
+    las que eligieron otra jugada, y los cambios de nodos (informativos).
+    """
+    anteriores = {(r["posicion"], r["nivel"]): r for r in base["resultados"]}
+    regresiones = []
+    avisos = []
+    for actual in nuevo["resultados"]:
+        clave = (actual["posicion"], actual["nivel"])
+        anterior = anteriores.get(clave)
+        if anterior is None:
+            continue
+        nombre = f"{clave[0]} {clave[1]}"
+        if actual["movimiento"] != anterior["movimiento"]:
+            regresiones.append(
+                f"{nombre}: jugada {anterior['movimiento']} -> {actual['movimiento']}"
+            )
+        if (
+            anterior["tiempo_ms"] >= TIEMPO_MINIMO_COMPARABLE_MS
+            and actual["tiempo_ms"] > anterior["tiempo_ms"] * (1 + tolerancia)
+        ):
+            regresiones.append(
+                f"{nombre}: {anterior['tiempo_ms']:.1f} ms -> "
+                f"{actual['tiempo_ms']:.1f} ms"
+            )
+        if actual["nodos"] != anterior["nodos"]:
+            avisos.append(f"{nombre}: {anterior['nodos']} -> {actual['nodos']} nodos")
+
+    tiempo_base = base["totales"]["tiempo_ms"]
+    tiempo_nuevo = nuevo["totales"]["tiempo_ms"]
+    if tiempo_nuevo > tiempo_base * (1 + tolerancia):
+        regresiones.append(f"total: {tiempo_base:.1f} ms -> {tiempo_nuevo:.1f} ms")
+    return regresiones, avisos
+
+
+def correr_pvs(semilla=0, niveles=None):
+    """
+    Compara Alpha-Beta y PVS en todo el banco. Retorna (nodos de
+    Alpha-Beta, nodos de PVS, diferencias), donde diferencias lista las
+    búsquedas que eligieron otra jugada u obtuvieron otro valor.
+    """
+    niveles = niveles or list(NIVELES)
+    nodos_alfabeta = 0
+    nodos_pvs = 0
+    diferencias = []
+    for nombre, partida in generar_posiciones(semilla):
+        for nivel in niveles:
+            resultado = comparar_pvs(partida, NIVELES[nivel])
+            alfabeta, pvs = resultado["alfabeta"], resultado["pvs"]
+            nodos_alfabeta += alfabeta["nodos"]
+            nodos_pvs += pvs["nodos"]
+            print(
+                f"{nombre:>10} {nivel:<12} {alfabeta['nodos']:>9} -> "
+                f"{pvs['nodos']:>9} nodos ({resultado['ahorro_nodos']:+.1%}) "
+                f"{pvs['re_busquedas']} re-búsquedas, "
+                f"{pvs['fallos_aspiracion']} fallos de aspiración",
+                file=sys.stderr,
+            )
+            if (alfabeta["movimiento"], alfabeta["valor"]) != (
+                pvs["movimiento"],
+                pvs["valor"],
+            ):
+                diferencias.append(
+                    f"{nombre} {nivel}: {alfabeta['movimiento']} "
+                    f"({alfabeta['valor']}) -> {pvs['movimiento']} ({pvs['valor']})"
+                )
+    return nodos_alfabeta, nodos_pvs, diferencias
+
+
+def casillas_para(dimension):
+    """Casillas con puntos de un tablero de `dimension`: las clásicas por área"""
+    area_clasica = TAMANO_TABLERO * TAMANO_TABLERO
+    return max(2, round(len(VALORES_CASILLAS) * dimension * dimension / area_clasica))
+
+
+def correr_escalado(semilla=0, dimensiones=DIMENSIONES_ESCALADO, niveles=None):
+    """
+    Corre el banco en cada dimensión de `dimensiones` y retorna por
+    dimensión los totales de cada nivel (nodos, tiempo, nodos por segundo
+    y tiempo medio por búsqueda)
+    """
+    niveles = niveles or list(NIVELES)
+    resultado = []
+    for dimension in dimensiones:
+        cantidad = casillas_para(dimension)
+        posiciones = generar_posiciones(
+            semilla, dimension=dimension, valores=valores_casillas(cantidad)
+        )
+        for nivel in niveles:
+            mediciones = [
+                medir(partida, NIVELES[nivel], casillas_final_exacto=None)
+                for _, partida in posiciones
+            ]
+            totales = totalizar(mediciones)
+            totales.update(
+                dimension=dimension,
+                casillas=cantidad,
+                nivel=nivel,
+                busquedas=len(mediciones),
+                ms_por_busqueda=totales["tiempo_ms"] / max(1, len(mediciones)),
+            )
+            resultado.append(totales)
+            print(
+                f"{dimension:>2}x{dimension:<2} {cantidad:>3} casillas "
+                f"{nivel:<12} {totales['nodos']:>9} nodos "
+                f"{totales['ms_por_busqueda']:>8.1f} ms/búsqueda "
+                f"{totales['nodos_por_segundo']:>9.0f} nodos/s",
+                file=sys.stderr,
+            )
+    return resultado
+
+
+def _leer(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banco de pruebas de la IA")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    parser_correr = comandos.add_parser("correr", help="mide y guarda en JSON")
+    parser_correr.add_argument("--salida", default=None, help="por defecto stdout")
+
+    parser_comparar = comandos.add_parser("comparar", help="compara con una base")
+    parser_comparar.add_argument("base")
+    parser_comparar.add_argument("nuevo", nargs="?", default=None)
+    parser_comparar.add_argument("--tolerancia", type=float, default=0.10)
+
+    parser_pvs = comandos.add_parser("pvs", help="compara Alpha-Beta con PVS")
+
+    parser_escalado = comandos.add_parser(
+        "escalado", help="mide el banco en tableros de otras dimensiones"
+    )
+    parser_escalado.add_argument(
+        "--dimensiones",
+        default=",".join(map(str, DIMENSIONES_ESCALADO)),
+        help="p. ej. 6,8,12,16",
+    )
+    parser_escalado.add_argument("--salida", default=None, help="JSON")
+
+    for sub in (parser_correr, parser_comparar, parser_pvs, parser_escalado):
+        sub.add_argument("--semilla", type=int, default=0)
+        sub.add_argument("--niveles", default=None, help="p. ej. Amateur,Experto")
+        sub.add_argument("--log", default=None, help="estadísticas de cada búsqueda")
+    for sub in (parser_correr, parser_comparar):
+        sub.add_argument("--repeticiones", type=int, default=3)
+    argumentos = parser.parse_args()
+    configurar_registro(argumentos.log)
+
+    niveles = argumentos.niveles.split(",") if argumentos.niveles else None
+
+    if argumentos.comando == "pvs":
+        nodos_alfabeta, nodos_pvs, diferencias = correr_pvs(
+            argumentos.semilla, niveles
+        )
+        print(
+            f"Nodos: {nodos_alfabeta} -> {nodos_pvs} "
+            f"({1 - nodos_pvs / nodos_alfabeta:+.1%} de ahorro)"
+        )
+        for diferencia in diferencias:
+            print(f"DIFERENCIA {diferencia}")
+        if not diferencias:
+            print("Mismas jugadas y valores")
+        return 1 if diferencias else 0
+
+    if argumentos.comando == "escalado":
+        dimensiones = [int(d) for d in argumentos.dimensiones.split(",")]
+        resultado = correr_escalado(argumentos.semilla, dimensiones, niveles)
+        base = {r["nivel"]: r for r in resultado if r["dimension"] == dimensiones[0]}
+        print(f"Relativo a {dimensiones[0]}x{dimensiones[0]}:")
+        for fila in resultado:
+            referencia = base[fila["nivel"]]
+            print(
+                f"  {fila['dimension']:>2}x{fila['dimension']:<2} "
+                f"{fila['nivel']:<12} nodos/s "
+                f"{fila['nodos_por_segundo'] / referencia['nodos_por_segundo']:.2f}x, "
+                f"ms/búsqueda "
+                f"{fila['ms_por_busqueda'] / referencia['ms_por_busqueda']:.2f}x"
+            )
+        if argumentos.salida is not None:
+            with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+                json.dump(resultado, archivo, indent=2)
+                archivo.write("\n")
+        return 0
+
+    if argumentos.comando == "correr":
+        resultado = correr(argumentos.semilla, niveles, argumentos.repeticiones)
+        texto = json.dumps(resultado, indent=2)
+        if argumentos.salida is None:
+            print(texto)
+        else:
+            with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+                archivo.write(texto + "\n")
+        return 0
+
+    base = _leer(argumentos.base)
+    if argumentos.nuevo is not None:
+        nuevo = _leer(argumentos.nuevo)
+    else:
+        nuevo = correr(base["semilla"], niveles, argumentos.repeticiones)
+
+    regresiones, avisos = comparar(base, nuevo, argumentos.tolerancia)
+    totales_base, totales_nuevo = base["totales"], nuevo["totales"]
+    print(
+        f"Nodos: {totales_base['nodos']} -> {totales_nuevo['nodos']}, "
+        f"nodos/s: {totales_base['nodos_por_segundo']:.0f} -> "
+        f"{totales_nuevo['nodos_por_segundo']:.0f}"
+    )
+    for aviso in avisos:
+        print(f"  {aviso}")
+    for regresion in regresiones:
+        print(f"REGRESIÓN {regresion}")
+    if not regresiones:
+        print("Sin regresiones")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Representación del tablero con bitboards
+Cada casilla (fila, col) es el bit fila * dimension + col de un entero
+"""
+from functools import lru_cache
+
+from config import MOVIMIENTOS_CABALLO, TAMANO_TABLERO
+
+try:
+    contar_bits = int.bit_count
+except AttributeError:  # Python < 3.10
+
+    def contar_bits(mascara):
+        """Cuenta los bits encendidos de una máscara"""
+        return bin(mascara).count("1")
+
+
+def indice(pos, dimension=TAMANO_TABLERO):
+    """Convierte una posición (fila, col) en el índice de su bit"""
+    return pos[0] * dimension + pos[1]
+
+
+def posicion(indice_casilla, dimension=TAMANO_TABLERO):
+    """Convierte el índice de un bit en la posición (fila, col)"""
+    return divmod(indice_casilla, dimension)
+
+
+@lru_cache(maxsize=None)
+def tablas_caballo(dimension=TAMANO_TABLERO):
+    """
+    Precalcula los saltos del caballo para cada casilla del tablero.
+    Retorna dos tuplas indexadas por casilla:
+    - destinos: índices alcanzables, en el mismo orden que MOVIMIENTOS_CABALLO
+    - mascaras: bitboard con esos mismos destinos
+    """
+    destinos = []
+    mascaras = []
+
+    for fila in range(dimension):
+        for col in range(dimension):
+            saltos = []
+            mascara = 0
+            for df, dc in MOVIMIENTOS_CABALLO:
+                nueva_fila = fila + df
+                nueva_col = col + dc
+                if 0 <= nueva_fila < dimension and 0 <= nueva_col < dimension:
+                    destino = nueva_fila * dimension + nueva_col
+                    saltos.append(destino)
+                    mascara |= 1 << destino
+            destinos.append(tuple(saltos))
+            mascaras.append(mascara)
+
+    return tuple(destinos), tuple(mascaras)
+
+
+def mascara_de_casillas(casillas, dimension=TAMANO_TABLERO):
+    """Construye el bitboard de un conjunto de posiciones (fila, col)"""
+    mascara = 0
+    for pos in casillas:
+        mascara |= 1 << indice(pos, dimension)
+    return mascara
+
+
+def indices_de_mascara(mascara):
+    """Genera los índices de los bits encendidos, de menor a mayor"""
+    while mascara:
+        bit = mascara & -mascara
+        yield bit.bit_length() - 1
+        mascara ^= bit
+
+
+def valores_de_tablero(tablero):
+    """Aplana el tablero en una tupla de valores indexada por casilla"""
+    return tuple(valor for fila in tablero for valor in fila)
+
+
+def mascara_de_puntos(tablero):
+    """Bitboard de las casillas que todavía tienen puntos"""
+    mascara = 0
+    for i, valor in enumerate(valores_de_tablero(tablero)):
+        if valor != 0:
+            mascara |= 1 << i
+    return mascara
+
+
+def casillas_alcanzables(origen, libres, mascaras):
+    """
+    Relleno por inundación sobre el grafo del caballo.
+    Retorna el bitboard de casillas de `libres` a las que se puede llegar
+    desde `origen` saltando solo por casillas libres.
+    """
+    visitadas = 0
+    frontera = 1 << origen
+    while frontera:
+        nuevas = 0
+        for casilla in indices_de_mascara(frontera):
+            nuevas |= mascaras[casilla]
+        frontera = nuevas & libres & ~visitadas
+        visitadas |= frontera
+    return visitadas
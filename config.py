@@ -6,30 +6,68 @@ import random
 # Valores fijos de las casillas con puntos 
 VALORES_CASILLAS = [-10, -5, -4, -3, -1, 1, 3, 4, 5, 10]
 
-def generar_tablero_aleatorio():
+# Variantes: dimensiones de tablero admitidas (la clásica es TAMANO_TABLERO)
+DIMENSION_MINIMA = 6
+DIMENSION_MAXIMA = 16
+
+
+def valores_casillas(cantidad):
+    """
+    Valores de `cantidad` casillas con puntos: los de VALORES_CASILLAS de a
+    pares opuestos, del mayor al menor (se repiten si hacen falta más).
+    Con 10 son los mismos valores de la variante clásica.
+    """
+    ordenados = sorted(VALORES_CASILLAS)
+    pares = [
+        valor
+        for i in range(len(ordenados) // 2)
+        for valor in (ordenados[i], ordenados[-1 - i])
+    ]
+    pares.extend(ordenados[len(pares) :])
+    return [pares[i % len(pares)] for i in range(cantidad)]
+
+
+def generar_tablero_aleatorio(semilla=None, dimension=None, valores=None):
     """
     Genera un tablero aleatorio con:
-    - 10 casillas con puntos 
+    - una casilla con puntos por cada elemento de `valores` (por defecto
+      las 10 de VALORES_CASILLAS)
     - 2 posiciones iniciales para los caballos
     - Ninguna posición puede coincidir
+    `dimension` va de DIMENSION_MINIMA a DIMENSION_MAXIMA (por defecto
+    TAMANO_TABLERO). Con `semilla` el tablero es reproducible y no altera el
+    estado global de random.
     """
+    if dimension is None:
+        dimension = TAMANO_TABLERO
+    if valores is None:
+        valores = VALORES_CASILLAS
+    if not DIMENSION_MINIMA <= dimension <= DIMENSION_MAXIMA:
+        raise ValueError(
+            f"dimensión {dimension} fuera de {DIMENSION_MINIMA}..{DIMENSION_MAXIMA}"
+        )
+    if len(valores) + 2 > dimension * dimension:
+        raise ValueError(f"{len(valores)} casillas con puntos no caben en el tablero")
+    generador = random if semilla is None else random.Random(semilla)
+
     # Crear tablero vacío
-    tablero = [[0 for _ in range(8)] for _ in range(8)]
+    tablero = [[0 for _ in range(dimension)] for _ in range(dimension)]
 
     # Generar todas las posiciones posibles
-    todas_posiciones = [(i, j) for i in range(8) for j in range(8)]
+    todas_posiciones = [(i, j) for i in range(dimension) for j in range(dimension)]
 
-    # Seleccionar 12 posiciones aleatorias sin repetir (10 casillas + 2 caballos)
-    posiciones_seleccionadas = random.sample(todas_posiciones, 12)
+    # Seleccionar posiciones aleatorias sin repetir (casillas + 2 caballos)
+    cantidad = len(valores)
+    posiciones_seleccionadas = generador.sample(todas_posiciones, cantidad + 2)
 
-    # Asignar las primeras 10 posiciones a las casillas con puntos
-    for i, pos in enumerate(posiciones_seleccionadas[:10]):
+    # Asignar las primeras posiciones a las casillas con puntos
+    for i, pos in enumerate(posiciones_seleccionadas[:cantidad]):
         fila, col = pos
-        tablero[fila][col] = VALORES_CASILLAS[i]
+        tablero[fila][col] = valores[i]
 
     # Las últimas 2 posiciones son para los caballos
-    pos_blanco = posiciones_seleccionadas[10]
-    pos_negro = posiciones_seleccionadas[11]
+    pos_blanco = posiciones_seleccionadas[cantidad]
+    pos_negro = posiciones_seleccionadas[cantidad + 1]
 
     return tablero, pos_blanco, pos_negro
 
@@ -53,6 +91,29 @@ MOVIMIENTOS_CABALLO = [
 # Configuración de niveles
 NIVELES = {"Principiante": 2, "Amateur": 4, "Experto": 6}
 
+# Niveles por tiempo: milisegundos de reflexión de la IA para toda la partida
+NIVELES_TIEMPO = {"Principiante": 2000, "Amateur": 8000, "Experto": 20000}
+
+# Configuración del motor
+MEMORIA_TRANSPOSICION_MB = 16  # Memoria máxima de la tabla de transposición
+# Archivo de la tabla de transposición persistente (None: solo en memoria)
+RUTA_TRANSPOSICION = None
+# Pesos de la evaluación heurística (ver ajuste_pesos para ajustarlos)
+PESO_MOVILIDAD = 0.5  # Por cada movimiento de diferencia entre los caballos
+CASTIGO_SIN_MOVIMIENTOS = 100  # Al bando en turno que no puede mover
+TIEMPO_MINIMO_MS = 20  # Tiempo mínimo asignado a una jugada en modo por tiempo
+# Con a lo sumo estas casillas libres alcanzables el final se resuelve exacto
+CASILLAS_FINAL_EXACTO = 28
+# Motor MCTS (mcts.JugadorMCTS)
+PLAYOUTS_MCTS = 2000  # Simulaciones por jugada sin presupuesto de tiempo
+EXPLORACION_MCTS = 1.4  # Constante de exploración de UCT
+GUIA_SIMULACION_MCTS = 0.5  # Probabilidad de capturar la casilla de más valor
+MAXIMO_NODOS_MCTS = 200_000  # Tope de nodos del árbol (limita la memoria)
+# Simulaciones por jugada de cada nivel con el motor MCTS
+NIVELES_MCTS = {"Principiante": 200, "Amateur": 1000, "Experto": 4000}
+PONDERAR = True  # La IA sigue pensando mientras juega el humano
+MOSTRAR_ESTADISTICAS = True  # Resumen de la última búsqueda en el panel lateral
+
 # Configuración visual
 TAMANO_CELDA = 70
 TAMANO_TABLERO = 8
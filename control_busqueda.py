@@ -0,0 +1,62 @@
+"""
+Control del presupuesto de la búsqueda (tiempo y nodos)
+"""
+import threading
+import time
+
+# La búsqueda revisa su presupuesto cada 1024 nodos
+MASCARA_VERIFICACION = 1023
+
+
+class BusquedaInterrumpida(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota el presupuesto"""
+
+
+class TokenCancelacion:
+    """Señal compartida entre hilos para detener una búsqueda en curso"""
+
+    def __init__(self):
+        self._evento = threading.Event()
+
+    def cancelar(self):
+        """Pide que la búsqueda se detenga lo antes posible"""
+        self._evento.set()
+
+    def cancelado(self):
+        """Indica si se pidió cancelar"""
+        return self._evento.is_set()
+
+
+class LimiteBusqueda:
+    """
+    Presupuesto de una búsqueda: tiempo máximo, cantidad máxima de nodos
+    y/o un token de cancelación
+    """
+
+    def __init__(self, tiempo_ms=None, nodos=None, token=None):
+        self.inicio = time.perf_counter()
+        self.tiempo_ms = tiempo_ms
+        self.nodos = nodos
+        self.token = token
+        self.fin = None if tiempo_ms is None else self.inicio + tiempo_ms / 1000
+
+    def transcurrido_ms(self):
+        """Milisegundos desde que se creó el límite"""
+        return (time.perf_counter() - self.inicio) * 1000
+
+    def agotado(self, nodos):
+        """Indica si ya se gastó el presupuesto o se canceló la búsqueda"""
+        if self.token is not None and self.token.cancelado():
+            return True
+        if self.nodos is not None and nodos >= self.nodos:
+            return True
+        return self.fin is not None and time.perf_counter() >= self.fin
+
+    def solo_cancelacion(self):
+        """Límite que comparte el token pero no tiene presupuesto"""
+        return LimiteBusqueda(token=self.token)
+
+    def verificar(self, nodos):
+        """Interrumpe la búsqueda si el presupuesto se agotó"""
+        if self.agotado(nodos):
+            raise BusquedaInterrumpida()
@@ -0,0 +1,133 @@
+"""
+Estadísticas de una búsqueda de la IA
+"""
+import logging
+
+FORMATO_REGISTRO = "%(asctime)s %(processName)s %(name)s: %(message)s"
+
+
+class EstadisticasBusqueda:
+    """
+    Resumen de una llamada a AIPlayer.obtener_mejor_movimiento.
+    - nodos, hojas (evaluaciones heurísticas y posiciones sin movimientos)
+    - cortes_beta (en nodos del blanco) y cortes_alfa (en nodos del negro)
+    - re_busquedas de PVS y fallos_aspiracion (ventanas de aspiración que
+      hubo que abrir)
+    - consultas_tt, aciertos_tt y cortes_tt de la tabla de transposición
+    - profundidad completada y profundidad_maxima (ply más lejano visitado)
+    - iteraciones: por profundidad completada, nodos y milisegundos
+      acumulados desde el inicio de la búsqueda
+    - variante_principal: jugadas (fila, col) esperadas desde la raíz
+    - simulaciones y simulaciones_reutilizadas (árbol heredado de la
+      jugada anterior) del motor MCTS
+    """
+
+    def __init__(self, origen="busqueda"):
+        self.origen = origen
+        self.nodos = 0
+        self.hojas = 0
+        self.cortes_beta = 0
+        self.cortes_alfa = 0
+        self.cortes_primer_movimiento = 0
+        self.re_busquedas = 0
+        self.fallos_aspiracion = 0
+        self.consultas_tt = 0
+        self.aciertos_tt = 0
+        self.cortes_tt = 0
+        self.profundidad = 0
+        self.profundidad_maxima = 0
+        self.tiempo_ms = 0.0
+        self.valor = None
+        self.movimiento = None
+        self.iteraciones = []
+        self.variante_principal = []
+        self.simulaciones = 0
+        self.simulaciones_reutilizadas = 0
+
+    def registrar_iteracion(self, profundidad, nodos, tiempo_ms):
+        """Anota una profundidad completada"""
+        self.iteraciones.append(
+            {"profundidad": profundidad, "nodos": nodos, "tiempo_ms": tiempo_ms}
+        )
+
+    def cortes(self):
+        return self.cortes_beta + self.cortes_alfa
+
+    def factor_ramificacion(self):
+        """
+        Factor de ramificación efectivo: con dos o más iteraciones, nodos de
+        la última sobre nodos de la anterior; si no, nodos^(1/profundidad)
+        """
+        if len(self.iteraciones) >= 2:
+            nodos = [0] + [iteracion["nodos"] for iteracion in self.iteraciones]
+            ultima = nodos[-1] - nodos[-2]
+            anterior = nodos[-2] - nodos[-3]
+            if anterior > 0:
+                return ultima / anterior
+        if self.profundidad > 0 and self.nodos > 0:
+            return self.nodos ** (1 / self.profundidad)
+        return 0.0
+
+    def nodos_por_segundo(self):
+        return self.nodos / (self.tiempo_ms / 1000) if self.tiempo_ms else 0.0
+
+    def tasa_aciertos_tt(self):
+        return self.aciertos_tt / self.consultas_tt if self.consultas_tt else 0.0
+
+    def como_dict(self):
+        """Todos los datos en tipos simples (para JSON)"""
+        return {
+            "origen": self.origen,
+            "nodos": self.nodos,
+            "hojas": self.hojas,
+            "cortes_beta": self.cortes_beta,
+            "cortes_alfa": self.cortes_alfa,
+            "cortes_primer_movimiento": self.cortes_primer_movimiento,
+            "re_busquedas": self.re_busquedas,
+            "fallos_aspiracion": self.fallos_aspiracion,
+            "consultas_tt": self.consultas_tt,
+            "aciertos_tt": self.aciertos_tt,
+            "cortes_tt": self.cortes_tt,
+            "profundidad": self.profundidad,
+            "profundidad_maxima": self.profundidad_maxima,
+            "tiempo_ms": self.tiempo_ms,
+            "nodos_por_segundo": self.nodos_por_segundo(),
+            "factor_ramificacion": self.factor_ramificacion(),
+            "valor": self.valor,
+            "movimiento": self.movimiento,
+            "iteraciones": list(self.iteraciones),
+            "variante_principal": list(self.variante_principal),
+            "simulaciones": self.simulaciones,
+            "simulaciones_reutilizadas": self.simulaciones_reutilizadas,
+        }
+
+    def resumen(self):
+        """Una línea de texto para el registro"""
+        variante = " ".join(f"{fila},{col}" for fila, col in self.variante_principal)
+        return (
+            f"{self.origen}: prof {self.profundidad} (máx {self.profundidad_maxima}) "
+            f"valor {self.valor} | {self.nodos} nodos, {self.hojas} hojas, "
+            f"{self.tiempo_ms:.1f} ms, {self.nodos_por_segundo():.0f} nodos/s, "
+            f"EBF {self.factor_ramificacion():.2f} | cortes {self.cortes_beta}b/"
+            f"{self.cortes_alfa}a | TT {self.aciertos_tt}/{self.consultas_tt} "
+            f"({self.cortes_tt} cortes) | VP {variante}"
+        )
+
+    def texto_panel(self):
+        """Texto corto para el panel lateral de la interfaz"""
+        return (
+            f"Prof. {self.profundidad} · {self.nodos:,} nodos\n"
+            f"{self.tiempo_ms:.0f} ms · {self.nodos_por_segundo():,.0f} nodos/s\n"
+            f"EBF {self.factor_ramificacion():.2f} · "
+            f"TT {self.tasa_aciertos_tt():.0%}"
+        )
+
+
+def configurar_registro(ruta):
+    """
+    Envía a `ruta` el resumen de cada búsqueda (nivel INFO). Se usa en las
+    ejecuciones sin interfaz; también sirve como initializer de un pool.
+    """
+    if ruta is None:
+        return
+    logging.basicConfig(filename=ruta, level=logging.INFO, format=FORMATO_REGISTRO)
@@ -0,0 +1,252 @@
+"""
+Estado de búsqueda con hacer/deshacer movimientos sobre bitboards
+"""
+from bitboard import (
+    contar_bits,
+    indice,
+    indices_de_mascara,
+    tablas_caballo,
+    valores_de_tablero,
+)
+from zobrist import claves_puntos, tablas_zobrist
+
+BLANCO = 0
+NEGRO = 1
+
+# Marca de la pila de deshacer para un turno pasado sin mover
+PASE = -1
+
+# Penalización que sufre el bando bloqueado por cada movimiento del rival
+PENALIZACION_SIN_MOVIMIENTOS = 4
+
+
+class EstadoBusqueda:
+    """
+    Estado mutable que la búsqueda recorre en el sitio.
+    Cada movimiento guarda en una pila preasignada lo necesario para
+    deshacerlo (casilla de origen, bloqueadas previas, valor capturado,
+    penalización aplicada, banderas de sin movimientos y clave Zobrist),
+    de modo que recorrer el árbol no copia tableros ni conjuntos.
+
+    `clave` es el hash Zobrist de la posición (bloqueadas, caballos,
+    casillas con puntos restantes y turno), actualizado en cada movimiento.
+
+    Los puntos de `puntos` son los capturados; las penalizaciones de -4
+    por turno bloqueado se acumulan aparte en `penalizaciones` para que el
+    minimax pueda seguir evaluando como siempre.
+    """
+
+    def __init__(
+        self,
+        valores,
+        bloqueadas,
+        pos_blanco,
+        pos_negro,
+        puntos_blanco=0,
+        puntos_negro=0,
+        turno_blanco=True,
+        blanco_sin_movimientos=False,
+        negro_sin_movimientos=False,
+        dimension=None,
+    ):
+        if dimension is None:
+            dimension = int(len(valores) ** 0.5)
+
+        self.dimension = dimension
+        self.destinos_caballo, self.mascaras_caballo = tablas_caballo(dimension)
+        self.valores = tuple(valores)
+        self.bloqueadas = bloqueadas
+        self.posiciones = [pos_blanco, pos_negro]
+        self.puntos = [puntos_blanco, puntos_negro]
+        self.penalizaciones = [0, 0]
+        self.sin_movimientos = [blanco_sin_movimientos, negro_sin_movimientos]
+        self.lado = BLANCO if turno_blanco else NEGRO
+
+        self._zobrist_bloqueadas, self._zobrist_caballos, self._zobrist_turno = (
+            tablas_zobrist(dimension)
+        )
+        self._zobrist_puntos = claves_puntos(self.valores, dimension)
+        self.clave = self.calcular_clave()
+
+        # Pila de deshacer: un arreglo por campo, indexado por ply.
+        # Cada casilla se ocupa una sola vez y cada pase sigue a un movimiento
+        capacidad = 2 * dimension * dimension + 2
+        self.ply = 0
+        self._origenes = [0] * capacidad
+        self._bloqueadas = [0] * capacidad
+        self._capturados = [0] * capacidad
+        self._penalizaciones = [0] * capacidad
+        self._banderas = [0] * capacidad
+        self._claves = [0] * capacidad
+
+    @classmethod
+    def desde_game_logic(cls, game_logic):
+        """Construye el estado de búsqueda a partir de la partida en curso"""
+        dimension = game_logic.dimension
+        return cls(
+            valores_de_tablero(game_logic.tablero),
+            game_logic.mascara_bloqueadas,
+            indice(game_logic.pos_blanco, dimension),
+            indice(game_logic.pos_negro, dimension),
+            game_logic.puntos_blanco,
+            game_logic.puntos_negro,
+            game_logic.turno_blanco,
+            game_logic.blanco_sin_movimientos,
+            game_logic.negro_sin_movimientos,
+            dimension,
+        )
+
+    def calcular_clave(self):
+        """Calcula desde cero la clave Zobrist de la posición"""
+        clave = (
+            self._zobrist_caballos[BLANCO][self.posiciones[BLANCO]]
+            ^ self._zobrist_caballos[NEGRO][self.posiciones[NEGRO]]
+        )
+        for casilla in indices_de_mascara(self.bloqueadas):
+            clave ^= self._zobrist_bloqueadas[casilla]
+        for casilla, clave_punto in enumerate(self._zobrist_puntos):
+            if not self.bloqueadas >> casilla & 1:
+                clave ^= clave_punto
+        if self.lado == NEGRO:
+            clave ^= self._zobrist_turno
+        return clave
+
+    def ocupadas(self, lado):
+        """Casillas a las que `lado` no puede saltar"""
+        return self.bloqueadas | 1 << self.posiciones[1 - lado]
+
+    def movimientos(self, lado=None):
+        """Destinos válidos de `lado` (por defecto el que mueve), en orden fijo"""
+        if lado is None:
+            lado = self.lado
+        ocupadas = self.bloqueadas | 1 << self.posiciones[1 - lado]
+        return [
+            destino
+            for destino in self.destinos_caballo[self.posiciones[lado]]
+            if not ocupadas >> destino & 1
+        ]
+
+    def movilidad(self, lado):
+        """Cantidad de movimientos válidos de `lado`"""
+        ocupadas = self.bloqueadas | 1 << self.posiciones[1 - lado]
+        mascara = self.mascaras_caballo[self.posiciones[lado]]
+        return contar_bits(mascara & ~ocupadas)
+
+    def diferencia_movilidad(self):
+        """
+        Movimientos válidos del blanco menos los del negro.
+        Con int.bit_count cuesta menos que mantener contadores de vecinos
+        libres: actualizarlos en hacer/deshacer toca hasta 16 casillas por
+        movimiento en cada nodo, y aquí solo se paga en las hojas.
+        """
+        bloqueadas = self.bloqueadas
+        pos_blanco, pos_negro = self.posiciones
+        mascaras = self.mascaras_caballo
+        libres_blanco = mascaras[pos_blanco] & ~(bloqueadas | 1 << pos_negro)
+        libres_negro = mascaras[pos_negro] & ~(bloqueadas | 1 << pos_blanco)
+        return contar_bits(libres_blanco) - contar_bits(libres_negro)
+
+    def diferencia(self):
+        """Puntos capturados del blanco menos los del negro"""
+        return self.puntos[BLANCO] - self.puntos[NEGRO]
+
+    def diferencia_real(self):
+        """Diferencia de marcador incluyendo las penalizaciones por bloqueo"""
+        return (
+            self.puntos[BLANCO]
+            - self.penalizaciones[BLANCO]
+            - self.puntos[NEGRO]
+            + self.penalizaciones[NEGRO]
+        )
+
+    def hacer_movimiento(self, destino):
+        """Mueve el caballo del bando en turno a `destino` (debe ser válido)"""
+        lado = self.lado
+        otro = 1 - lado
+        ply = self.ply
+        origen = self.posiciones[lado]
+        capturado = self.valores[destino]
+        sin_movimientos = self.sin_movimientos
+
+        self._origenes[ply] = origen
+        self._bloqueadas[ply] = self.bloqueadas
+        self._capturados[ply] = capturado
+        self._banderas[ply] = sin_movimientos[BLANCO] | sin_movimientos[NEGRO] << 1
+        self._claves[ply] = self.clave
+
+        # Igual que en GameLogic.mover_caballo: el rival bloqueado pierde 4 puntos
+        if sin_movimientos[otro]:
+            self.penalizaciones[otro] += PENALIZACION_SIN_MOVIMIENTOS
+            self._penalizaciones[ply] = PENALIZACION_SIN_MOVIMIENTOS
+        else:
+            self._penalizaciones[ply] = 0
+
+        # Actualizar la clave: caballo, casillas bloqueadas, punto capturado y turno
+        caballos = self._zobrist_caballos[lado]
+        clave = (
+            self.clave
+            ^ caballos[origen]
+            ^ caballos[destino]
+            ^ self._zobrist_bloqueadas[destino]
+            ^ self._zobrist_puntos[destino]
+            ^ self._zobrist_turno
+        )
+        if not self.bloqueadas >> origen & 1:
+            clave ^= self._zobrist_bloqueadas[origen]
+        self.clave = clave
+
+        # Se bloquean la casilla de origen y la de destino
+        self.bloqueadas |= 1 << origen | 1 << destino
+        self.posiciones[lado] = destino
+        self.puntos[lado] += capturado
+        self.lado = otro
+        self.ply = ply + 1
+
+        # Quedarse sin movimientos es permanente: solo se revisa si aún puede mover
+        bloqueadas = self.bloqueadas
+        posiciones = self.posiciones
+        if not sin_movimientos[BLANCO]:
+            libres = self.mascaras_caballo[posiciones[BLANCO]] & ~bloqueadas
+            sin_movimientos[BLANCO] = not libres & ~(1 << posiciones[NEGRO])
+        if not sin_movimientos[NEGRO]:
+            libres = self.mascaras_caballo[posiciones[NEGRO]] & ~bloqueadas
+            sin_movimientos[NEGRO] = not libres & ~(1 << posiciones[BLANCO])
+
+    def pasar(self):
+        """El bando en turno, sin movimientos, cede el turno al rival"""
+        ply = self.ply
+        sin_movimientos = self.sin_movimientos
+        self._origenes[ply] = PASE
+        self._bloqueadas[ply] = self.bloqueadas
+        self._capturados[ply] = 0
+        self._penalizaciones[ply] = 0
+        self._banderas[ply] = sin_movimientos[BLANCO] | sin_movimientos[NEGRO] << 1
+        self._claves[ply] = self.clave
+        self.clave ^= self._zobrist_turno
+        self.lado = 1 - self.lado
+        self.ply = ply + 1
+
+    def deshacer_movimiento(self):
+        """Deshace el último movimiento o pase registrado en la pila"""
+        ply = self.ply - 1
+        self.ply = ply
+        lado = 1 - self.lado
+        self.lado = lado
+
+        banderas = self._banderas[ply]
+        self.sin_movimientos[BLANCO] = bool(banderas & 1)
+        self.sin_movimientos[NEGRO] = bool(banderas & 2)
+        self.clave = self._claves[ply]
+
+        origen = self._origenes[ply]
+        if origen == PASE:
+            return
+
+        self.bloqueadas = self._bloqueadas[ply]
+        self.puntos[lado] -= self._capturados[ply]
+        self.penalizaciones[1 - lado] -= self._penalizaciones[ply]
+        self.posiciones[lado] = origen
+
+    def juego_terminado(self):
+        """El juego termina cuando ninguno de los dos puede moverse"""
+        return self.movilidad(BLANCO) == 0 and self.movilidad(NEGRO) == 0
@@ -0,0 +1,382 @@
+"""
+Estado de juego inmutable y compacto
+
+EstadoJuego es una foto de la partida que se puede usar como clave de un
+dict o set, guardar en un registro o enviar a otro proceso. EstadoBusqueda
+es distinto: es mutable, se recorre con hacer/deshacer y no se comparte.
+"""
+from bitboard import (
+    contar_bits,
+    indice,
+    indices_de_mascara,
+    mascara_de_puntos,
+    posicion,
+    tablas_caballo,
+    valores_de_tablero,
+)
+from estado_busqueda import BLANCO, NEGRO, PENALIZACION_SIN_MOVIMIENTOS, EstadoBusqueda
+from zobrist import clave_punto, tablas_zobrist
+
+_asignar = object.__setattr__
+
+
+class EstadoJuego:
+    """
+    Posición completa de la partida en enteros: casillas bloqueadas
+    (bitboard), casillas de los caballos, marcador (con las penalizaciones
+    por turno bloqueado, como GameLogic), turno y banderas de sin
+    movimientos. `valores` es la tupla de puntos por casilla y la comparten
+    todos los estados que salen de uno con hijo() y pasar(): las casillas
+    con puntos que quedan son las de `valores` que no están bloqueadas.
+
+    `clave` es el hash Zobrist de la posición, el mismo de EstadoBusqueda.
+    hijo() y pasar() la actualizan en O(1), así que hash e igualdad
+    también son O(1). Los atributos no se pueden modificar.
+    """
+
+    __slots__ = (
+        "valores",
+        "dimension",
+        "bloqueadas",
+        "blanco",
+        "negro",
+        "puntos_blanco",
+        "puntos_negro",
+        "turno_blanco",
+        "blanco_sin_movimientos",
+        "negro_sin_movimientos",
+        "clave",
+    )
+
+    def __init__(
+        self,
+        valores,
+        bloqueadas,
+        blanco,
+        negro,
+        puntos_blanco=0,
+        puntos_negro=0,
+        turno_blanco=True,
+        blanco_sin_movimientos=False,
+        negro_sin_movimientos=False,
+        dimension=None,
+    ):
+        if dimension is None:
+            dimension = int(len(valores) ** 0.5)
+        valores = tuple(valores)
+        zobrist_bloqueadas, zobrist_caballos, zobrist_turno = tablas_zobrist(
+            dimension
+        )
+        clave = zobrist_caballos[BLANCO][blanco] ^ zobrist_caballos[NEGRO][negro]
+        for casilla in indices_de_mascara(bloqueadas):
+            clave ^= zobrist_bloqueadas[casilla]
+        for casilla, valor in enumerate(valores):
+            if valor and not bloqueadas >> casilla & 1:
+                clave ^= clave_punto(casilla, valor, dimension)
+        if not turno_blanco:
+            clave ^= zobrist_turno
+        self._iniciar(
+            valores,
+            dimension,
+            bloqueadas,
+            blanco,
+            negro,
+            puntos_blanco,
+            puntos_negro,
+            turno_blanco,
+            blanco_sin_movimientos,
+            negro_sin_movimientos,
+            clave,
+        )
+
+    def _iniciar(
+        self,
+        valores,
+        dimension,
+        bloqueadas,
+        blanco,
+        negro,
+        puntos_blanco,
+        puntos_negro,
+        turno_blanco,
+        blanco_sin_movimientos,
+        negro_sin_movimientos,
+        clave,
+    ):
+        _asignar(self, "valores", valores)
+        _asignar(self, "dimension", dimension)
+        _asignar(self, "bloqueadas", bloqueadas)
+        _asignar(self, "blanco", blanco)
+        _asignar(self, "negro", negro)
+        _asignar(self, "puntos_blanco", puntos_blanco)
+        _asignar(self, "puntos_negro", puntos_negro)
+        _asignar(self, "turno_blanco", turno_blanco)
+        _asignar(self, "blanco_sin_movimientos", blanco_sin_movimientos)
+        _asignar(self, "negro_sin_movimientos", negro_sin_movimientos)
+        _asignar(self, "clave", clave)
+
+    @classmethod
+    def _nuevo(cls, *campos):
+        """Crea un estado con todos sus campos ya calculados (clave incluida)"""
+        estado = object.__new__(cls)
+        estado._iniciar(*campos)
+        return estado
+
+    @classmethod
+    def desde_game_logic(cls, game_logic):
+        """Foto de la partida en curso"""
+        dimension = game_logic.dimension
+        return cls(
+            valores_de_tablero(game_logic.tablero),
+            game_logic.mascara_bloqueadas,
+            indice(game_logic.pos_blanco, dimension),
+            indice(game_logic.pos_negro, dimension),
+            game_logic.puntos_blanco,
+            game_logic.puntos_negro,
+            game_logic.turno_blanco,
+            game_logic.blanco_sin_movimientos,
+            game_logic.negro_sin_movimientos,
+            dimension,
+        )
+
+    @classmethod
+    def desde_busqueda(cls, estado):
+        """
+        Foto de un EstadoBusqueda. El marcador descuenta las penalizaciones
+        que la búsqueda lleva aparte.
+        """
+        return cls._nuevo(
+            estado.valores,
+            estado.dimension,
+            estado.bloqueadas,
+            estado.posiciones[BLANCO],
+            estado.posiciones[NEGRO],
+            estado.puntos[BLANCO] - estado.penalizaciones[BLANCO],
+            estado.puntos[NEGRO] - estado.penalizaciones[NEGRO],
+            estado.lado == BLANCO,
+            estado.sin_movimientos[BLANCO],
+            estado.sin_movimientos[NEGRO],
+            estado.clave,
+        )
+
+    def a_busqueda(self):
+        """EstadoBusqueda que parte de esta posición"""
+        return EstadoBusqueda(*self._argumentos())
+
+    def a_game_logic(self):
+        """GameLogic en esta posición (sin el historial de jugadas)"""
+        from game_logic import GameLogic
+
+        dimension = self.dimension
+        bloqueadas = self.bloqueadas
+        tablero = [
+            [
+                0 if bloqueadas >> casilla & 1 else self.valores[casilla]
+                for casilla in range(fila * dimension, (fila + 1) * dimension)
+            ]
+            for fila in range(dimension)
+        ]
+        game_logic = GameLogic(
+            tablero, posicion(self.blanco, dimension), posicion(self.negro, dimension)
+        )
+        for casilla in indices_de_mascara(bloqueadas):
+            game_logic._bloquear(posicion(casilla, dimension))
+        game_logic.puntos_blanco = self.puntos_blanco
+        game_logic.puntos_negro = self.puntos_negro
+        game_logic.turno_blanco = self.turno_blanco
+        game_logic.blanco_sin_movimientos = self.blanco_sin_movimientos
+        game_logic.negro_sin_movimientos = self.negro_sin_movimientos
+        game_logic.juego_terminado = self.terminado()
+        return game_logic
+
+    def _argumentos(self):
+        return (
+            self.valores,
+            self.bloqueadas,
+            self.blanco,
+            self.negro,
+            self.puntos_blanco,
+            self.puntos_negro,
+            self.turno_blanco,
+            self.blanco_sin_movimientos,
+            self.negro_sin_movimientos,
+            self.dimension,
+        )
+
+    @property
+    def lado(self):
+        return BLANCO if self.turno_blanco else NEGRO
+
+    @property
+    def mascara_puntos(self):
+        """Casillas que todavía tienen puntos"""
+        return mascara_de_puntos((self.valores,)) & ~self.bloqueadas
+
+    def movimientos(self):
+        """Destinos válidos del bando en turno, en el orden de EstadoBusqueda"""
+        if self.turno_blanco:
+            origen, rival = self.blanco, self.negro
+        else:
+            origen, rival = self.negro, self.blanco
+        ocupadas = self.bloqueadas | 1 << rival
+        destinos, _ = tablas_caballo(self.dimension)
+        return [d for d in destinos[origen] if not ocupadas >> d & 1]
+
+    def hijo(self, destino):
+        """
+        Estado tras mover el caballo en turno a `destino` (debe ser válido),
+        con las reglas de GameLogic.mover_caballo
+        """
+        dimension = self.dimension
+        zobrist_bloqueadas, zobrist_caballos, zobrist_turno = tablas_zobrist(
+            dimension
+        )
+        blanco, negro = self.blanco, self.negro
+        puntos_blanco, puntos_negro = self.puntos_blanco, self.puntos_negro
+        bloqueadas = self.bloqueadas
+        valor = self.valores[destino]
+
+        if self.turno_blanco:
+            origen = blanco
+            blanco = destino
+            puntos_blanco += valor
+            if self.negro_sin_movimientos:
+                puntos_negro -= PENALIZACION_SIN_MOVIMIENTOS
+        else:
+            origen = negro
+            negro = destino
+            puntos_negro += valor
+            if self.blanco_sin_movimientos:
+                puntos_blanco -= PENALIZACION_SIN_MOVIMIENTOS
+
+        lado = self.lado
+        clave = (
+            self.clave
+            ^ zobrist_caballos[lado][origen]
+            ^ zobrist_caballos[lado][destino]
+            ^ zobrist_bloqueadas[destino]
+            ^ zobrist_turno
+        )
+        if valor:
+            clave ^= clave_punto(destino, valor, dimension)
+        if not bloqueadas >> origen & 1:
+            clave ^= zobrist_bloqueadas[origen]
+        bloqueadas |= 1 << origen | 1 << destino
+
+        # Quedarse sin movimientos es permanente, como en EstadoBusqueda
+        _, mascaras = tablas_caballo(dimension)
+        blanco_sin_movimientos = self.blanco_sin_movimientos or not (
+            mascaras[blanco] & ~(bloqueadas | 1 << negro)
+        )
+        negro_sin_movimientos = self.negro_sin_movimientos or not (
+            mascaras[negro] & ~(bloqueadas | 1 << blanco)
+        )
+        return EstadoJuego._nuevo(
+            self.valores,
+            dimension,
+            bloqueadas,
+            blanco,
+            negro,
+            puntos_blanco,
+            puntos_negro,
+            not self.turno_blanco,
+            blanco_sin_movimientos,
+            negro_sin_movimientos,
+            clave,
+        )
+
+    def pasar(self):
+        """Estado con el turno cedido (el bando en turno no puede mover)"""
+        _, _, zobrist_turno = tablas_zobrist(self.dimension)
+        return EstadoJuego._nuevo(
+            self.valores,
+            self.dimension,
+            self.bloqueadas,
+            self.blanco,
+            self.negro,
+            self.puntos_blanco,
+            self.puntos_negro,
+            not self.turno_blanco,
+            self.blanco_sin_movimientos,
+            self.negro_sin_movimientos,
+            self.clave ^ zobrist_turno,
+        )
+
+    def sucesores(self):
+        """
+        Lista de (destino, estado) de las jugadas del bando en turno. Si no
+        puede mover pero el rival sí, un solo sucesor (None, pase); si el
+        juego terminó, ninguno.
+        """
+        movimientos = self.movimientos()
+        if movimientos:
+            return [(destino, self.hijo(destino)) for destino in movimientos]
+        if self.terminado():
+            return []
+        return [(None, self.pasar())]
+
+    def terminado(self):
+        """Ninguno de los dos caballos puede moverse"""
+        _, mascaras = tablas_caballo(self.dimension)
+        bloqueadas = self.bloqueadas
+        libres_blanco = mascaras[self.blanco] & ~(bloqueadas | 1 << self.negro)
+        libres_negro = mascaras[self.negro] & ~(bloqueadas | 1 << self.blanco)
+        return not libres_blanco and not libres_negro
+
+    def movilidad(self, lado):
+        """Cantidad de movimientos válidos de `lado`"""
+        _, mascaras = tablas_caballo(self.dimension)
+        if lado == BLANCO:
+            origen, rival = self.blanco, self.negro
+        else:
+            origen, rival = self.negro, self.blanco
+        return contar_bits(mascaras[origen] & ~(self.bloqueadas | 1 << rival))
+
+    def __hash__(self):
+        return self.clave
+
+    def __eq__(self, otro):
+        if not isinstance(otro, EstadoJuego):
+            return NotImplemented
+        return (
+            self.clave == otro.clave
+            and self.bloqueadas == otro.bloqueadas
+            and self.blanco == otro.blanco
+            and self.negro == otro.negro
+            and self.puntos_blanco == otro.puntos_blanco
+            and self.puntos_negro == otro.puntos_negro
+            and self.turno_blanco == otro.turno_blanco
+            and self.blanco_sin_movimientos == otro.blanco_sin_movimientos
+            and self.negro_sin_movimientos == otro.negro_sin_movimientos
+            and (
+                self.valores is otro.valores
+                or self._mismos_puntos_restantes(otro.valores)
+            )
+        )
+
+    def _mismos_puntos_restantes(self, valores):
+        # Las casillas bloqueadas (capturadas) no cuentan: GameLogic las deja
+        # en 0 y los estados creados con hijo() conservan el valor inicial
+        bloqueadas = self.bloqueadas
+        return len(valores) == len(self.valores) and all(
+            a == b or bloqueadas >> casilla & 1
+            for casilla, (a, b) in enumerate(zip(self.valores, valores))
+        )
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("EstadoJuego es inmutable")
+
+    def __delattr__(self, nombre):
+        raise AttributeError("EstadoJuego es inmutable")
+
+    def __reduce__(self):
+        # La clave se vuelve a calcular al reconstruir
+        return EstadoJuego, self._argumentos()
+
+    def __repr__(self):
+        return (
+            f"EstadoJuego(blanco={posicion(self.blanco, self.dimension)}, "
+            f"negro={posicion(self.negro, self.dimension)}, "
+            f"puntos={self.puntos_blanco}:{self.puntos_negro}, "
+            f"turno={'blanco' if self.turno_blanco else 'negro'})"
+        )
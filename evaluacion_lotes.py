@@ -0,0 +1,76 @@
+"""
+Evaluación heurística por lotes
+
+La hoja del minimax vale diferencia de puntos + PESO_MOVILIDAD × (movilidad
+del blanco - movilidad del negro). evaluar_hijos evalúa de una vez los hijos
+de un nodo a profundidad 1, directamente sobre bitboards, sin hacer/deshacer
+cada movimiento.
+
+No se vectoriza con NumPy: un caballo tiene a lo sumo 8 movimientos, y con
+lotes de ese tamaño armar los arreglos cuesta varias veces más que contar
+los bits en Python (NumPy recién empata hacia las 100 hojas por lote).
+"""
+import time
+
+from bitboard import contar_bits
+from config import PESO_MOVILIDAD
+from estado_busqueda import BLANCO
+
+
+def evaluar_hijos(estado, movimientos, peso_movilidad=PESO_MOVILIDAD):
+    """
+    Genera el valor de hoja de cada hijo de `estado` (uno por movimiento, en
+    orden), igual al que daría minimax a profundidad 0 tras hacer el
+    movimiento. Es perezoso: si un corte detiene el recorrido, los hijos
+    restantes no se evalúan.
+    """
+    lado = estado.lado
+    origen = estado.posiciones[lado]
+    rival = estado.posiciones[1 - lado]
+    mascaras = estado.mascaras_caballo
+    valores = estado.valores
+    diferencia = estado.diferencia()
+    signo = 1 if lado == BLANCO else -1
+    bloqueadas = estado.bloqueadas | 1 << origen
+    mascara_rival = mascaras[rival]
+    bit_rival = 1 << rival
+
+    for destino in movimientos:
+        nuevas = bloqueadas | 1 << destino
+        propia = contar_bits(mascaras[destino] & ~(nuevas | bit_rival))
+        ajena = contar_bits(mascara_rival & ~nuevas)
+        yield diferencia + signo * (
+            valores[destino] + (propia - ajena) * peso_movilidad
+        )
+
+
+def medir_evaluacion(estados, repeticiones=5):
+    """
+    Compara, sobre `estados` (EstadoBusqueda), el costo de evaluar todos los
+    hijos moviendo y evaluando uno por uno contra evaluar_hijos. Retorna
+    microsegundos por hoja de cada camino.
+    """
+    trabajos = [(estado, estado.movimientos()) for estado in estados]
+    hojas = sum(len(movimientos) for _, movimientos in trabajos)
+
+    def por_nodo():
+        for estado, movimientos in trabajos:
+            for mov in movimientos:
+                estado.hacer_movimiento(mov)
+                estado.diferencia() + estado.diferencia_movilidad() * PESO_MOVILIDAD
+                estado.deshacer_movimiento()
+
+    def por_hijos():
+        for estado, movimientos in trabajos:
+            list(evaluar_hijos(estado, movimientos))
+
+    resultado = {"hojas": hojas}
+    for nombre, funcion in (("por_nodo", por_nodo), ("evaluar_hijos", por_hijos)):
+        mejor = None
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion()
+            transcurrido = time.perf_counter() - inicio
+            mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+        resultado[nombre] = mejor / hojas * 1e6 if hojas else 0.0
+    return resultado
@@ -0,0 +1,352 @@
+"""
+Solucionador exacto de finales
+"""
+from bitboard import casillas_alcanzables, contar_bits, indices_de_mascara
+from control_busqueda import MASCARA_VERIFICACION
+from estado_busqueda import BLANCO, NEGRO, PENALIZACION_SIN_MOVIMIENTOS
+from transposicion import COTA_INFERIOR, COTA_SUPERIOR, EXACTO
+
+# Al superar esta cantidad de posiciones memorizadas se vacía la memoria
+LIMITE_MEMORIA = 1_000_000
+
+
+def regiones(estado):
+    """
+    Casillas libres a las que todavía puede llegar cada caballo, como
+    (bitboard del blanco, bitboard del negro)
+    """
+    pos_blanco, pos_negro = estado.posiciones
+    tamano = estado.dimension * estado.dimension
+    libres = ~(estado.bloqueadas | 1 << pos_blanco | 1 << pos_negro) & (
+        (1 << tamano) - 1
+    )
+    mascaras = estado.mascaras_caballo
+    return (
+        casillas_alcanzables(pos_blanco, libres, mascaras),
+        casillas_alcanzables(pos_negro, libres, mascaras),
+    )
+
+
+def casillas_libres_alcanzables(estado):
+    """
+    Casillas libres a las que todavía puede llegar alguno de los caballos:
+    el resto del tablero ya no influye en la partida
+    """
+    region_blanco, region_negro = regiones(estado)
+    return region_blanco | region_negro
+
+
+def separados(estado):
+    """
+    Indica si los caballos ya no comparten ninguna casilla alcanzable: desde
+    ahí cada uno juega en su región sin afectar al otro
+    """
+    region_blanco, region_negro = regiones(estado)
+    return not region_blanco & region_negro
+
+
+def penalizacion_separados(largo_mano, largo_otro):
+    """
+    Penalizaciones netas a favor del bando en turno cuando los caballos
+    están separados y cada uno hace `largo_*` jugadas más. Un caballo queda
+    sin movimientos justo después de su última jugada: desde ahí cada jugada
+    del rival le cuesta PENALIZACION_SIN_MOVIMIENTOS. El bando en turno
+    termina antes que el rival si juega igual cantidad de veces.
+    """
+    return PENALIZACION_SIN_MOVIMIENTOS * (
+        max(0, largo_mano - largo_otro) - max(0, largo_otro - largo_mano + 1)
+    )
+
+
+class SolucionadorFinales:
+    """
+    Juega el final a la perfección con las reglas de GameLogic.mover_caballo:
+    el bando sin movimientos pasa y pierde 4 puntos por cada movimiento del
+    rival, y la partida termina cuando ninguno puede moverse. El valor es
+    la diferencia final de marcador (blanco - negro, con penalizaciones).
+
+    Alpha-Beta con memoria: cada posición (casillas bloqueadas, caballos,
+    turno y banderas de sin movimientos; las casillas con puntos restantes
+    se deducen de las bloqueadas) guarda su valor relativo al marcador
+    actual y si es exacto o una cota. La memoria se conserva entre llamadas,
+    así que las jugadas siguientes del final suelen salir casi gratis.
+
+    Cuando un bando ya quedó bloqueado el rival juega solo: cada jugada le
+    suma la casilla más la penalización del bloqueado, así que el resto de
+    la partida es el recorrido de mayor valor de un caballo, que se
+    resuelve aparte sobre bitboards (la mayoría de los nodos de un final
+    están en esa fase).
+
+    Lo mismo pasa antes si las casillas bloqueadas separan a los caballos
+    en regiones distintas: cada bando recorre la suya sin afectar al otro
+    y solo importa cuántas jugadas hace cada uno (por las penalizaciones).
+    Se calcula por separado, para cada caballo, la mejor suma con cada
+    largo de recorrido (_perfil) y se combinan los dos perfiles. Si el
+    máximo-mínimo y el mínimo-máximo de la combinación coinciden el valor
+    es exacto; si no, son cotas que sirven para cortar y se sigue buscando.
+    """
+
+    def __init__(self):
+        self.memoria = {}
+        self.recorridos = {}
+        self.perfiles = {}
+        self.nodos = 0
+        self.limite = None
+        self._valores = None
+        self._mascaras = None
+
+    def _clave(self, estado):
+        sin_movimientos = estado.sin_movimientos
+        return (
+            estado.bloqueadas,
+            estado.posiciones[BLANCO],
+            estado.posiciones[NEGRO],
+            estado.lado,
+            sin_movimientos[BLANCO] | sin_movimientos[NEGRO] << 1,
+        )
+
+    def _misma_partida(self, estado):
+        """
+        Indica si la memoria sirve para `estado`: las casillas no bloqueadas
+        valen lo mismo (las capturadas quedan bloqueadas y valen 0)
+        """
+        if self._valores is None or len(self._valores) != len(estado.valores):
+            return False
+        bloqueadas = estado.bloqueadas
+        return all(
+            bloqueadas >> casilla & 1 or valor == self._valores[casilla]
+            for casilla, valor in enumerate(estado.valores)
+        )
+
+    def _vaciar(self):
+        self.memoria.clear()
+        self.recorridos.clear()
+        self.perfiles.clear()
+
+    def resolver(self, estado, limite=None):
+        """
+        Retorna (valor, mejor_movimiento) con juego perfecto de ambos bandos.
+        `limite` (LimiteBusqueda) puede interrumpir con BusquedaInterrumpida.
+        El movimiento es None si el bando en turno no puede mover.
+        """
+        memorizadas = len(self.memoria) + len(self.recorridos) + len(self.perfiles)
+        if memorizadas > LIMITE_MEMORIA:
+            self._vaciar()
+        if not self._misma_partida(estado):
+            # La memoria guarda valores de otro tablero
+            self._vaciar()
+            self._valores = estado.valores
+            self._mascaras = estado.mascaras_caballo
+        self.nodos = 0
+        self.limite = limite
+        try:
+            return self._alfabeta(estado, float("-inf"), float("inf"))
+        finally:
+            self.limite = None
+
+    def _alfabeta(self, estado, alpha, beta):
+        self.nodos += 1
+        if self.limite is not None and not self.nodos & MASCARA_VERIFICACION:
+            self.limite.verificar(self.nodos)
+
+        clave = self._clave(estado)
+        base = estado.diferencia_real()
+        entrada = self.memoria.get(clave)
+        movimiento_memoria = None
+        if entrada is not None:
+            valor, tipo, movimiento_memoria = entrada
+            valor += base
+            if (
+                tipo == EXACTO
+                or (tipo == COTA_INFERIOR and valor >= beta)
+                or (tipo == COTA_SUPERIOR and valor <= alpha)
+            ):
+                return valor, movimiento_memoria
+
+        lado = estado.lado
+        if estado.sin_movimientos[1 - lado]:
+            # El rival ya está bloqueado: el bando en turno juega solo
+            tamano = estado.dimension * estado.dimension
+            # Su propia casilla tampoco: se bloquea al salir de ella
+            ocupadas = estado.ocupadas(lado) | 1 << estado.posiciones[lado]
+            libres = ~ocupadas & ((1 << tamano) - 1)
+            ganancia, primero = self._mejor_recorrido(estado.posiciones[lado], libres)
+            return (base + ganancia if lado == BLANCO else base - ganancia), primero
+
+        if not estado.sin_movimientos[lado]:
+            cotas = self._cotas_separados(estado, base)
+            if cotas is not None:
+                minimo, maximo, movimiento = cotas
+                if minimo == maximo:
+                    return minimo, movimiento
+                if minimo >= beta:
+                    return minimo, movimiento
+                if maximo <= alpha:
+                    return maximo, movimiento
+
+        movimientos = estado.movimientos()
+        if not movimientos:
+            if not estado.movilidad(1 - lado):
+                # Ninguno puede moverse: fin de la partida
+                return base, None
+            # Pasa el turno; el rival juega y el bloqueado pierde 4 por jugada
+            estado.pasar()
+            valor, _ = self._alfabeta(estado, alpha, beta)
+            estado.deshacer_movimiento()
+            return valor, None
+
+        # Primero el mejor movimiento conocido y luego las capturas de más
+        # valor (para los dos bandos capturar suma a favor propio)
+        valores = estado.valores
+        movimientos.sort(key=lambda mov: valores[mov], reverse=True)
+        if movimiento_memoria in movimientos:
+            movimientos.remove(movimiento_memoria)
+            movimientos.insert(0, movimiento_memoria)
+
+        alpha_inicial = alpha
+        beta_inicial = beta
+        maximiza = lado == BLANCO
+        mejor_valor = float("-inf") if maximiza else float("inf")
+        mejor_movimiento = None
+        for mov in movimientos:
+            estado.hacer_movimiento(mov)
+            valor, _ = self._alfabeta(estado, alpha, beta)
+            estado.deshacer_movimiento()
+            if maximiza:
+                if valor > mejor_valor:
+                    mejor_valor = valor
+                    mejor_movimiento = mov
+                alpha = max(alpha, valor)
+            else:
+                if valor < mejor_valor:
+                    mejor_valor = valor
+                    mejor_movimiento = mov
+                beta = min(beta, valor)
+            if beta <= alpha:
+                break
+
+        if mejor_valor <= alpha_inicial:
+            tipo = COTA_SUPERIOR
+        elif mejor_valor >= beta_inicial:
+            tipo = COTA_INFERIOR
+        else:
+            tipo = EXACTO
+        self.memoria[clave] = (mejor_valor - base, tipo, mejor_movimiento)
+        return mejor_valor, mejor_movimiento
+
+    def _cotas_separados(self, estado, base):
+        """
+        Si los caballos están separados, retorna (mínimo, máximo, movimiento):
+        cotas del valor (desde el blanco) combinando los perfiles de ambos
+        y la jugada del bando en turno que asegura la cota de su lado. Si no
+        están separados retorna None.
+        """
+        region_blanco, region_negro = regiones(estado)
+        if region_blanco & region_negro:
+            return None
+        lado = estado.lado
+        posiciones = estado.posiciones
+        propias = region_blanco if lado == BLANCO else region_negro
+        ajenas = region_negro if lado == BLANCO else region_blanco
+        perfil_mano = self._perfil(posiciones[lado], propias)
+        perfil_otro = self._perfil(posiciones[1 - lado], ajenas)
+        if 0 in perfil_mano or 0 in perfil_otro:
+            # Alguno ya no puede mover: lo resuelve la búsqueda normal
+            return None
+
+        # El bando en turno maximiza su diferencia y el rival la minimiza
+        asegurado = None
+        movimiento = None
+        for largo_mano, (suma_mano, primero) in perfil_mano.items():
+            peor = min(
+                suma_mano - suma_otro + penalizacion_separados(largo_mano, largo_otro)
+                for largo_otro, (suma_otro, _) in perfil_otro.items()
+            )
+            if asegurado is None or peor > asegurado:
+                asegurado = peor
+                movimiento = primero
+        concedido = min(
+            max(
+                suma_mano - suma_otro + penalizacion_separados(largo_mano, largo_otro)
+                for largo_mano, (suma_mano, _) in perfil_mano.items()
+            )
+            for largo_otro, (suma_otro, _) in perfil_otro.items()
+        )
+        if lado == BLANCO:
+            return base + asegurado, base + concedido, movimiento
+        return base - concedido, base - asegurado, movimiento
+
+    def _perfil(self, origen, libres):
+        """
+        Recorridos de un caballo que juega desde `origen` por las casillas
+        `libres` hasta quedarse sin movimientos: {cantidad de jugadas:
+        (mayor suma de casillas, primer destino de ese recorrido)}
+        """
+        clave = (libres, origen)
+        perfil = self.perfiles.get(clave)
+        if perfil is not None:
+            return perfil
+
+        self.nodos += 1
+        if self.limite is not None and not self.nodos & MASCARA_VERIFICACION:
+            self.limite.verificar(self.nodos)
+
+        valores = self._valores
+        perfil = {}
+        for destino in indices_de_mascara(self._mascaras[origen] & libres):
+            valor = valores[destino]
+            resto = self._perfil(destino, libres & ~(1 << destino))
+            for largo, (suma, _) in resto.items():
+                suma += valor
+                actual = perfil.get(largo + 1)
+                if actual is None or suma > actual[0]:
+                    perfil[largo + 1] = (suma, destino)
+        if not perfil:
+            perfil = {0: (0, None)}
+        self.perfiles[clave] = perfil
+        return perfil
+
+    def _mejor_recorrido(self, origen, libres):
+        """
+        Mayor ganancia de un caballo que juega solo desde `origen` por las
+        casillas `libres` (suma de las casillas visitadas más
+        PENALIZACION_SIN_MOVIMIENTOS por jugada) y el primer destino de ese
+        recorrido, como (ganancia, destino); el destino es None si no puede
+        mover
+        """
+        clave = (libres, origen)
+        recorrido = self.recorridos.get(clave)
+        if recorrido is not None:
+            return recorrido
+
+        self.nodos += 1
+        if self.limite is not None and not self.nodos & MASCARA_VERIFICACION:
+            self.limite.verificar(self.nodos)
+
+        # Mover es obligatorio: sin destinos la ganancia es 0, si no el mejor
+        # destino aunque reste
+        valores = self._valores
+        recorrido = (0, None)
+        for destino in indices_de_mascara(self._mascaras[origen] & libres):
+            resto, _ = self._mejor_recorrido(destino, libres & ~(1 << destino))
+            ganancia = valores[destino] + PENALIZACION_SIN_MOVIMIENTOS + resto
+            if recorrido[1] is None or ganancia > recorrido[0]:
+                recorrido = (ganancia, destino)
+        self.recorridos[clave] = recorrido
+        return recorrido
+
+
+def es_final(estado, maximo_casillas):
+    """
+    Indica si quedan a lo sumo `maximo_casillas` casillas libres alcanzables,
+    o si los caballos están separados y cada región tiene a lo sumo esa
+    cantidad (cada una se resuelve por su lado)
+    """
+    region_blanco, region_negro = regiones(estado)
+    if contar_bits(region_blanco | region_negro) <= maximo_casillas:
+        return True
+    return (
+        not region_blanco & region_negro
+        and contar_bits(region_blanco) <= maximo_casillas
+        and contar_bits(region_negro) <= maximo_casillas
+    )
@@ -1,7 +1,13 @@
 """
 Lógica del juego Smart Horses
 """
-from config import MOVIMIENTOS_CABALLO
+from bitboard import (
+    contar_bits,
+    indice,
+    mascara_de_puntos,
+    posicion,
+    tablas_caballo,
+)
 
 class GameLogic:
     """Clase que maneja toda la lógica del juego"""
@@ -20,28 +26,55 @@ class GameLogic:
         self.blanco_sin_movimientos = False  # Si el blanco no puede moverse
         self.negro_sin_movimientos = False  # Si el negro no puede moverse
 
+        # Representación en bitboards (fuente de verdad para generar movimientos)
+        self.dimension = len(self.tablero)
+        self.destinos_caballo, self.mascaras_caballo = tablas_caballo(self.dimension)
+        self.mascara_bloqueadas = 0
+        self.mascara_puntos = mascara_de_puntos(self.tablero)
+        # Vecinos de caballo no bloqueados de cada casilla, al día con _bloquear
+        self.vecinos_libres = [contar_bits(m) for m in self.mascaras_caballo]
+
+    def _mascara_ocupadas(self):
+        """Casillas a las que no se puede saltar: bloqueadas o con un caballo"""
+        return (
+            self.mascara_bloqueadas
+            | 1 << indice(self.pos_blanco, self.dimension)
+            | 1 << indice(self.pos_negro, self.dimension)
+        )
 
     def obtener_movimientos_validos(self, pos):
         """Retorna lista de movimientos válidos desde una posición"""
-        movimientos = []
-        fila, col = pos
-
-        for df, dc in MOVIMIENTOS_CABALLO:
-            nueva_fila = fila + df
-            nueva_col = col + dc
-
-            # Verificar que esté en el tablero, que la casilla no esté bloqueada
-            # y que no esté ocupada por el otro caballo
-            if (
-                0 <= nueva_fila < 8
-                and 0 <= nueva_col < 8
-                and (nueva_fila, nueva_col) not in self.casillas_bloqueadas
-                and (nueva_fila, nueva_col) != self.pos_blanco
-                and (nueva_fila, nueva_col) != self.pos_negro
-            ):
-                movimientos.append((nueva_fila, nueva_col))
-
-        return movimientos
+        ocupadas = self._mascara_ocupadas()
+        return [
+            posicion(destino, self.dimension)
+            for destino in self.destinos_caballo[indice(pos, self.dimension)]
+            if not ocupadas >> destino & 1
+        ]
+
+    def contar_movimientos_validos(self, pos):
+        """
+        Cuenta los movimientos válidos desde una posición: sus vecinos libres
+        menos los caballos que estén en una casilla todavía no bloqueada
+        """
+        casilla = indice(pos, self.dimension)
+        cantidad = self.vecinos_libres[casilla]
+        mascara = self.mascaras_caballo[casilla] & ~self.mascara_bloqueadas
+        for caballo in (self.pos_blanco, self.pos_negro):
+            if mascara >> indice(caballo, self.dimension) & 1:
+                cantidad -= 1
+        return cantidad
+
+    def _bloquear(self, pos):
+        """Marca una casilla como bloqueada"""
+        casilla = indice(pos, self.dimension)
+        bit = 1 << casilla
+        if self.mascara_bloqueadas & bit:
+            return
+        self.casillas_bloqueadas.add(pos)
+        self.mascara_bloqueadas |= bit
+        self.mascara_puntos &= ~bit
+        for vecino in self.destinos_caballo[casilla]:
+            self.vecinos_libres[vecino] -= 1
 
     def mover_caballo(self, nueva_pos):
         """Mueve el caballo actual a la nueva posición"""
@@ -50,8 +83,7 @@ class GameLogic:
 
         if self.turno_blanco:
             # Turno de la IA (blanco)
-            movimientos_validos = self.obtener_movimientos_validos(self.pos_blanco)
-            if nueva_pos not in movimientos_validos:
+            if nueva_pos not in self.obtener_movimientos_validos(self.pos_blanco):
                 return False
 
             # Si el negro (jugador) no puede moverse, restar 4 puntos por cada movimiento del blanco
@@ -59,7 +91,7 @@ class GameLogic:
                 self.puntos_negro -= 4
 
             # Bloquear la casilla anterior
-            self.casillas_bloqueadas.add(self.pos_blanco)
+            self._bloquear(self.pos_blanco)
 
             self.pos_blanco = nueva_pos
             puntos_ganados = self.tablero[nueva_pos[0]][nueva_pos[1]]
@@ -67,11 +99,10 @@ class GameLogic:
             self.puntos_blanco += puntos_ganados
 
             # Bloquear la nueva casilla
-            self.casillas_bloqueadas.add(nueva_pos)
+            self._bloquear(nueva_pos)
         else:
             # Turno del jugador humano (negro)
-            movimientos_validos = self.obtener_movimientos_validos(self.pos_negro)
-            if nueva_pos not in movimientos_validos:
+            if nueva_pos not in self.obtener_movimientos_validos(self.pos_negro):
                 return False
 
             # Si la ia no puede moverse, restar 4 puntos por cada movimiento del negro
@@ -79,7 +110,7 @@ class GameLogic:
                 self.puntos_blanco -= 4
 
             # Bloquear la casilla anterior
-            self.casillas_bloqueadas.add(self.pos_negro)
+            self._bloquear(self.pos_negro)
 
             self.pos_negro = nueva_pos
             puntos_ganados = self.tablero[nueva_pos[0]][nueva_pos[1]]
@@ -87,7 +118,7 @@ class GameLogic:
             self.puntos_negro += puntos_ganados
 
             # Bloquear la nueva casilla
-            self.casillas_bloqueadas.add(nueva_pos)
+            self._bloquear(nueva_pos)
 
         # Cambiar turno
         self.turno_blanco = not self.turno_blanco
@@ -97,13 +128,31 @@ class GameLogic:
 
         return True
 
+    def pasar_turno(self):
+        """
+        Cede el turno si el bando en turno no tiene movimientos y el rival sí.
+        Retorna True si el turno cambió.
+        """
+        if self.juego_terminado:
+            return False
+        if self.turno_blanco:
+            propio, rival = self.pos_blanco, self.pos_negro
+        else:
+            propio, rival = self.pos_negro, self.pos_blanco
+        if self.contar_movimientos_validos(propio):
+            return False
+        if not self.contar_movimientos_validos(rival):
+            return False
+        self.turno_blanco = not self.turno_blanco
+        return True
+
     def verificar_sin_movimientos(self):
         """Verifica si algún jugador no tiene movimientos disponibles"""
-        movimientos_blanco = self.obtener_movimientos_validos(self.pos_blanco)
-        movimientos_negro = self.obtener_movimientos_validos(self.pos_negro)
+        mov_blanco = self.contar_movimientos_validos(self.pos_blanco)
+        mov_negro = self.contar_movimientos_validos(self.pos_negro)
 
-        self.blanco_sin_movimientos = len(movimientos_blanco) == 0
-        self.negro_sin_movimientos = len(movimientos_negro) == 0
+        self.blanco_sin_movimientos = mov_blanco == 0
+        self.negro_sin_movimientos = mov_negro == 0
 
         # El juego termina solo cuando ambos no pueden moverse
         if self.blanco_sin_movimientos and self.negro_sin_movimientos:
@@ -111,8 +160,8 @@ class GameLogic:
 
     def verificar_fin_juego(self):
         """Verifica si el juego ha terminado"""
-        mov_blanco = self.obtener_movimientos_validos(self.pos_blanco)
-        mov_negro = self.obtener_movimientos_validos(self.pos_negro)
+        mov_blanco = self.contar_movimientos_validos(self.pos_blanco)
+        mov_negro = self.contar_movimientos_validos(self.pos_negro)
 
         if not mov_blanco and not mov_negro:
             self.juego_terminado = True
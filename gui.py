@@ -7,6 +7,11 @@ from tkinter import messagebox, ttk
 from config import *
 from game_logic import GameLogic
 from ai_player import AIPlayer
+from mcts import JugadorMCTS
+from trabajador_ia import TrabajadorIA
+
+# Cada cuánto la interfaz revisa si la búsqueda de la IA terminó
+INTERVALO_SONDEO_MS = 50
 
 
 class SmartHorsesGUI:
@@ -20,13 +25,44 @@ class SmartHorsesGUI:
         self.game_logic = None
         self.ai_player = None
         self.casillas_canvas = {}
+        self.tamano_celda = TAMANO_CELDA
+        self.redibujo_pendiente = None
         self.movimientos_resaltados = []
         self.esperando_ia = False
+        self.trabajador = None
 
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
         self.mostrar_menu_inicio()
 
+    def cancelar_busqueda(self):
+        """Detiene la búsqueda o ponderación de la IA en curso, si la hay"""
+        if self.trabajador is not None:
+            self.trabajador.cancelar()
+            # El AIPlayer no admite dos búsquedas a la vez; la cancelación
+            # tarda unos milisegundos
+            self.trabajador.esperar()
+            self.trabajador = None
+        self.esperando_ia = False
+
+    def iniciar_ponder(self):
+        """Pone a la IA a pensar mientras el humano decide su jugada"""
+        self.cancelar_busqueda()
+        if not PONDERAR or self.game_logic.juego_terminado:
+            return
+        trabajador = TrabajadorIA(self.ai_player)
+        self.trabajador = trabajador
+        trabajador.iniciar_ponder(self.game_logic)
+
+    def cerrar(self):
+        """Cancela la búsqueda y cierra la ventana"""
+        self.cancelar_busqueda()
+        self.cancelar_redibujo()
+        self.root.destroy()
+
     def mostrar_menu_inicio(self):
         """Muestra el menú de inicio para seleccionar dificultad"""
+        self.cancelar_busqueda()
+        self.cancelar_redibujo()
         # Limpiar ventana
         for widget in self.root.winfo_children():
             widget.destroy()
@@ -72,6 +108,7 @@ class SmartHorsesGUI:
             "• Haz clic en tu caballo negro para ver movimientos\n"
             "• Haz clic en una casilla verde para mover\n"
             "• Valores: -10, -5, -4, -3, -1, +1, +3, +4, +5, +10\n"
+            "  (con otra cantidad de casillas se repiten o se omiten)\n"
             "• Si no tienes movimientos, pierdes 4 puntos\n"
             "• ¡Gana quien tenga más puntos al final!",
             font=("Arial", 10),
@@ -110,6 +147,66 @@ class SmartHorsesGUI:
             )
             btn.pack(pady=5)
 
+        # Modo por tiempo: la IA reparte un presupuesto fijo entre sus jugadas
+        self.por_tiempo_var = tk.BooleanVar(value=False)
+        tiempos = ", ".join(
+            f"{nivel}: {ms // 1000} s" for nivel, ms in NIVELES_TIEMPO.items()
+        )
+        tk.Checkbutton(
+            frame,
+            text=f"Jugar por tiempo ({tiempos})",
+            variable=self.por_tiempo_var,
+            font=("Arial", 10),
+            bg=COLOR_FONDO,
+            fg=COLOR_TEXTO,
+            selectcolor=COLOR_PANEL,
+            activebackground=COLOR_FONDO,
+            activeforeground=COLOR_TEXTO,
+        ).pack(pady=5)
+
+        # Motor de la IA: Minimax (Alpha-Beta) o Monte Carlo Tree Search
+        self.motor_var = tk.StringVar(value="minimax")
+        motor_frame = tk.Frame(frame, bg=COLOR_FONDO)
+        motor_frame.pack(pady=5)
+        for motor, texto in (("minimax", "Minimax"), ("mcts", "MCTS")):
+            tk.Radiobutton(
+                motor_frame,
+                text=texto,
+                variable=self.motor_var,
+                value=motor,
+                font=("Arial", 10),
+                bg=COLOR_FONDO,
+                fg=COLOR_TEXTO,
+                selectcolor=COLOR_PANEL,
+                activebackground=COLOR_FONDO,
+                activeforeground=COLOR_TEXTO,
+            ).pack(side="left", padx=10)
+
+        # Variante: dimensión del tablero y cantidad de casillas con puntos
+        variante_frame = tk.Frame(frame, bg=COLOR_FONDO)
+        variante_frame.pack(pady=5)
+        self.dimension_var = tk.IntVar(value=TAMANO_TABLERO)
+        self.casillas_var = tk.IntVar(value=len(VALORES_CASILLAS))
+        for texto, variable, desde, hasta in (
+            ("Tablero", self.dimension_var, DIMENSION_MINIMA, DIMENSION_MAXIMA),
+            ("Casillas con puntos", self.casillas_var, 1, 60),
+        ):
+            tk.Label(
+                variante_frame,
+                text=texto,
+                font=("Arial", 10),
+                bg=COLOR_FONDO,
+                fg=COLOR_TEXTO,
+            ).pack(side="left", padx=(10, 4))
+            tk.Spinbox(
+                variante_frame,
+                from_=desde,
+                to=hasta,
+                textvariable=variable,
+                width=4,
+                font=("Arial", 10),
+            ).pack(side="left")
+
         # Botón iniciar
         btn_iniciar = tk.Button(
             frame,
@@ -138,16 +235,33 @@ class SmartHorsesGUI:
 
     def iniciar_juego(self):
         """Inicia el juego con la dificultad seleccionada"""
-        from config import generar_tablero_aleatorio
-
         nivel = self.nivel_var.get()
         profundidad = NIVELES[nivel]
 
-    
-        tablero, pos_blanco, pos_negro = generar_tablero_aleatorio()
+        try:
+            dimension = self.dimension_var.get()
+            valores = valores_casillas(self.casillas_var.get())
+            tablero, pos_blanco, pos_negro = generar_tablero_aleatorio(
+                dimension=dimension, valores=valores
+            )
+        except (tk.TclError, ValueError) as error:
+            messagebox.showerror("Variante inválida", str(error))
+            return
+        # El tablero ocupa lo mismo en pantalla con cualquier dimensión
+        self.tamano_celda = TAMANO_CELDA * TAMANO_TABLERO // dimension
 
         self.game_logic = GameLogic(tablero, pos_blanco, pos_negro)
-        self.ai_player = AIPlayer(profundidad)
+        if self.motor_var.get() == "mcts":
+            if self.por_tiempo_var.get():
+                self.ai_player = JugadorMCTS(
+                    None, tiempo_partida_ms=NIVELES_TIEMPO[nivel]
+                )
+            else:
+                self.ai_player = JugadorMCTS(NIVELES_MCTS[nivel])
+        elif self.por_tiempo_var.get():
+            self.ai_player = AIPlayer(None, tiempo_partida_ms=NIVELES_TIEMPO[nivel])
+        else:
+            self.ai_player = AIPlayer(profundidad)
 
         self.crear_interfaz_juego()
 
@@ -159,6 +273,7 @@ class SmartHorsesGUI:
             self.turno_ia()
 
     def crear_interfaz_juego(self):
+        self.cancelar_redibujo()
         # Limpiar ventana
         for widget in self.root.winfo_children():
             widget.destroy()
@@ -184,8 +299,8 @@ class SmartHorsesGUI:
         # Canvas del tablero
         self.canvas = tk.Canvas(
             tablero_frame,
-            width=TAMANO_CELDA * TAMANO_TABLERO,
-            height=TAMANO_CELDA * TAMANO_TABLERO,
+            width=self.tamano_celda * self.game_logic.dimension,
+            height=self.tamano_celda * self.game_logic.dimension,
             bg=COLOR_FONDO,
             highlightthickness=2,
             highlightbackground=COLOR_TEXTO,
@@ -273,6 +388,19 @@ class SmartHorsesGUI:
         # Separador
         tk.Frame(info_frame, height=2, bg=COLOR_TEXTO).pack(fill="x", padx=20, pady=15)
 
+        # Estadísticas de la última búsqueda de la IA
+        self.label_estadisticas = None
+        if MOSTRAR_ESTADISTICAS:
+            self.label_estadisticas = tk.Label(
+                info_frame,
+                text="",
+                font=("Arial", 8),
+                bg=COLOR_PANEL,
+                fg=COLOR_TEXTO,
+                justify="left",
+            )
+            self.label_estadisticas.pack(pady=(0, 5), padx=15)
+
         # Instrucciones
         tk.Label(
             info_frame,
@@ -323,6 +451,7 @@ class SmartHorsesGUI:
         ).pack(pady=5)
 
         # Dibujar tablero inicial
+        self.crear_items_tablero()
         self.dibujar_tablero()
 
         # Centrar ventana
@@ -333,79 +462,164 @@ class SmartHorsesGUI:
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f"{width}x{height}+{x}+{y}")
 
-    def dibujar_tablero(self):
-        """Dibuja el tablero con las casillas y caballos"""
+    def crear_items_tablero(self):
+        """
+        Crea una sola vez los elementos del canvas de la partida: por casilla
+        su rectángulo, el texto de sus puntos y la X de bloqueo (oculta), y
+        los dos caballos. Después dibujar_tablero solo los actualiza.
+        """
         self.canvas.delete("all")
         self.casillas_canvas = {}
-
-        for fila in range(TAMANO_TABLERO):
-            for col in range(TAMANO_TABLERO):
-                x1 = col * TAMANO_CELDA
-                y1 = fila * TAMANO_CELDA
-                x2 = x1 + TAMANO_CELDA
-                y2 = y1 + TAMANO_CELDA
-
-                # Color de la casilla
-                if (fila, col) in self.game_logic.casillas_bloqueadas:
-                    # Casillas bloqueadas en rojo oscuro
-                    color = COLOR_BLOQUEADO
-                elif (fila, col) in self.movimientos_resaltados:
-                    color = COLOR_MOVIMIENTO_VALIDO
-                elif (fila + col) % 2 == 0:
-                    color = COLOR_CELDA_CLARA
-                else:
-                    color = COLOR_CELDA_OSCURA
-
-                # Dibujar casilla
+        self.textos_canvas = {}
+        self.cruces_canvas = {}
+        self.colores_casillas = {}
+        self.bloqueadas_dibujadas = 0
+        self.resaltados_dibujados = set()
+        self.caballos_dibujados = {}
+        dimension = self.game_logic.dimension
+        celda = self.tamano_celda
+        # Márgenes y fuentes a escala de la celda (70 px en el tablero de 8)
+        margen = celda // 7
+
+        for fila in range(dimension):
+            for col in range(dimension):
+                x1 = col * celda
+                y1 = fila * celda
+                x2 = x1 + celda
+                y2 = y1 + celda
+
+                color = self.color_casilla(fila, col, False, False)
                 rect = self.canvas.create_rectangle(
                     x1, y1, x2, y2, fill=color, outline="#8B4513", width=1
                 )
                 self.casillas_canvas[(fila, col)] = rect
+                self.colores_casillas[(fila, col)] = color
 
-                # Dibujar puntos de la casilla (solo si no está bloqueada)
+                # Puntos de la casilla: solo las que empiezan con puntos
                 puntos = self.game_logic.tablero[fila][col]
-                if (
-                    puntos != 0
-                    and (fila, col) not in self.game_logic.casillas_bloqueadas
-                ):
+                if puntos != 0:
                     color_texto = "#C0392B" if puntos < 0 else "#27AE60"
-                    self.canvas.create_text(
-                        x1 + TAMANO_CELDA // 2,
-                        y1 + 15,
+                    self.textos_canvas[(fila, col)] = self.canvas.create_text(
+                        x1 + celda // 2,
+                        y1 + celda * 3 // 14,
                         text=f"{puntos:+d}",
-                        font=("Arial", 10, "bold"),
+                        font=("Arial", max(7, celda // 7), "bold"),
                         fill=color_texto,
                     )
 
-                # Marcar casillas bloqueadas con una X
-                if (fila, col) in self.game_logic.casillas_bloqueadas:
-                    # Dibujar X grande
+                # X de casilla bloqueada, visible al bloquearse
+                self.cruces_canvas[(fila, col)] = (
                     self.canvas.create_line(
-                        x1 + 10, y1 + 10, x2 - 10, y2 - 10, fill="#FFFFFF", width=3
-                    )
+                        x1 + margen,
+                        y1 + margen,
+                        x2 - margen,
+                        y2 - margen,
+                        fill="#FFFFFF",
+                        width=3,
+                        state="hidden",
+                    ),
                     self.canvas.create_line(
-                        x1 + 10, y2 - 10, x2 - 10, y1 + 10, fill="#FFFFFF", width=3
-                    )
+                        x1 + margen,
+                        y2 - margen,
+                        x2 - margen,
+                        y1 + margen,
+                        fill="#FFFFFF",
+                        width=3,
+                        state="hidden",
+                    ),
+                )
 
-                # Dibujar caballos
-                if (fila, col) == self.game_logic.pos_blanco:
-                    self.canvas.create_text(
-                        x1 + TAMANO_CELDA // 2,
-                        y1 + TAMANO_CELDA // 2 + 5,
-                        text="♘",
-                        font=("Arial", 40),
-                        fill="white",
-                        tags="caballo_blanco",
-                    )
-                elif (fila, col) == self.game_logic.pos_negro:
-                    self.canvas.create_text(
-                        x1 + TAMANO_CELDA // 2,
-                        y1 + TAMANO_CELDA // 2 + 5,
-                        text="♞",
-                        font=("Arial", 40),
-                        fill="black",
-                        tags="caballo_negro",
-                    )
+        # Los caballos se crean al final para quedar encima de las casillas
+        for etiqueta, texto, relleno in (
+            ("caballo_blanco", "♘", "white"),
+            ("caballo_negro", "♞", "black"),
+        ):
+            self.canvas.create_text(
+                0,
+                0,
+                text=texto,
+                font=("Arial", celda * 4 // 7),
+                fill=relleno,
+                tags=etiqueta,
+            )
+
+    def color_casilla(self, fila, col, bloqueada, resaltada):
+        """Color de fondo de una casilla"""
+        if bloqueada:
+            # Casillas bloqueadas en rojo oscuro
+            return COLOR_BLOQUEADO
+        if resaltada:
+            return COLOR_MOVIMIENTO_VALIDO
+        if (fila + col) % 2 == 0:
+            return COLOR_CELDA_CLARA
+        return COLOR_CELDA_OSCURA
+
+    def dibujar_tablero(self):
+        """
+        Pide redibujar el tablero. Las peticiones hechas en la misma vuelta
+        del event loop se agrupan en un solo redibujado (con IA contra IA
+        rápida llegan varias seguidas).
+        """
+        if self.redibujo_pendiente is None:
+            self.redibujo_pendiente = self.root.after_idle(self.redibujar_tablero)
+
+    def cancelar_redibujo(self):
+        """Descarta el redibujado pendiente (el canvas va a destruirse)"""
+        if self.redibujo_pendiente is not None:
+            self.root.after_cancel(self.redibujo_pendiente)
+            self.redibujo_pendiente = None
+
+    def redibujar_tablero(self):
+        """
+        Actualiza solo lo que cambió desde el último dibujo: las casillas
+        recién bloqueadas (una casilla bloqueada no vuelve a liberarse), las
+        que entran o salen del resaltado y la posición de los caballos
+        """
+        self.redibujo_pendiente = None
+        game_logic = self.game_logic
+        dimension = game_logic.dimension
+        bloqueadas = game_logic.mascara_bloqueadas
+        resaltados = set(self.movimientos_resaltados)
+
+        nuevas = bloqueadas & ~self.bloqueadas_dibujadas
+        cambiadas = resaltados ^ self.resaltados_dibujados
+        while nuevas:
+            bit = nuevas & -nuevas
+            nuevas ^= bit
+            pos = divmod(bit.bit_length() - 1, dimension)
+            cambiadas.add(pos)
+            # Sin puntos y con la X
+            texto = self.textos_canvas.get(pos)
+            if texto is not None:
+                self.canvas.itemconfig(texto, state="hidden")
+            for linea in self.cruces_canvas[pos]:
+                self.canvas.itemconfig(linea, state="normal")
+
+        for fila, col in cambiadas:
+            bloqueada = bloqueadas >> (fila * dimension + col) & 1
+            color = self.color_casilla(
+                fila, col, bloqueada, (fila, col) in resaltados
+            )
+            if self.colores_casillas[(fila, col)] != color:
+                self.canvas.itemconfig(self.casillas_canvas[(fila, col)], fill=color)
+                self.colores_casillas[(fila, col)] = color
+
+        self.bloqueadas_dibujadas = bloqueadas
+        self.resaltados_dibujados = resaltados
+
+        celda = self.tamano_celda
+        for etiqueta, pos in (
+            ("caballo_blanco", game_logic.pos_blanco),
+            ("caballo_negro", game_logic.pos_negro),
+        ):
+            if self.caballos_dibujados.get(etiqueta) != pos:
+                fila, col = pos
+                self.canvas.coords(
+                    etiqueta,
+                    col * celda + celda // 2,
+                    fila * celda + celda // 2 + celda // 14,
+                )
+                self.caballos_dibujados[etiqueta] = pos
 
         # Actualizar información
         self.actualizar_info()
@@ -447,10 +661,11 @@ class SmartHorsesGUI:
         if self.esperando_ia or self.game_logic.juego_terminado:
             return
 
-        col = event.x // TAMANO_CELDA
-        fila = event.y // TAMANO_CELDA
+        col = event.x // self.tamano_celda
+        fila = event.y // self.tamano_celda
+        dimension = self.game_logic.dimension
 
-        if not (0 <= fila < 8 and 0 <= col < 8):
+        if not (0 <= fila < dimension and 0 <= col < dimension):
             return
 
         # Si es turno del negro (jugador humano)
@@ -492,7 +707,6 @@ class SmartHorsesGUI:
 
         self.esperando_ia = True
         self.label_turno.config(text="⚪ IA pensando...")
-        self.root.update()
 
         # Si la IA (blanco) no tiene movimientos, cambiar turno
         if self.game_logic.blanco_sin_movimientos:
@@ -505,8 +719,40 @@ class SmartHorsesGUI:
                 self.root.after(500, self.mostrar_fin_juego)
             return
 
-        mejor_movimiento = self.ai_player.obtener_mejor_movimiento(self.game_logic)
+        # La búsqueda corre en otro hilo; el mainloop sigue atendiendo eventos
+        self.cancelar_busqueda()
+        self.esperando_ia = True
+        trabajador = TrabajadorIA(self.ai_player)
+        self.trabajador = trabajador
+        trabajador.iniciar(self.game_logic)
+        self.root.after(INTERVALO_SONDEO_MS, self.sondear_ia, trabajador)
+
+    def sondear_ia(self, trabajador):
+        """Revisa la búsqueda en curso y muestra su progreso"""
+        # Búsqueda cancelada o de una partida anterior
+        if trabajador is not self.trabajador:
+            return
+
+        if not trabajador.terminado():
+            progreso = trabajador.progreso
+            if progreso is not None:
+                self.label_turno.config(
+                    text=f"⚪ IA pensando...\n"
+                    f"Prof. {progreso['profundidad']} · {progreso['nodos']:,} nodos"
+                )
+            self.root.after(INTERVALO_SONDEO_MS, self.sondear_ia, trabajador)
+            return
+
+        self.trabajador = None
+        if trabajador.error is not None:
+            self.esperando_ia = False
+            raise trabajador.error
+        if self.label_estadisticas is not None and trabajador.estadisticas:
+            self.label_estadisticas.config(text=trabajador.estadisticas.texto_panel())
+        self.aplicar_movimiento_ia(trabajador.movimiento)
 
+    def aplicar_movimiento_ia(self, mejor_movimiento):
+        """Juega el movimiento elegido por la IA y continúa la partida"""
         if mejor_movimiento:
             self.game_logic.mover_caballo(mejor_movimiento)
 
@@ -523,6 +769,9 @@ class SmartHorsesGUI:
         if not self.game_logic.turno_blanco and self.game_logic.negro_sin_movimientos:
             self.game_logic.turno_blanco = True
             self.root.after(1000, self.turno_ia)
+        elif not self.game_logic.turno_blanco:
+            # Turno del humano: la IA aprovecha para pensar sus respuestas
+            self.iniciar_ponder()
         # Caso 2: Si es turno del blanco pero no tiene movimientos, la IA intenta de nuevo
         elif (
             self.game_logic.turno_blanco
@@ -558,4 +807,5 @@ class SmartHorsesGUI:
         if respuesta:
             self.mostrar_menu_inicio()
         else:
+            self.cancelar_busqueda()
             self.root.quit()
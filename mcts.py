@@ -0,0 +1,357 @@
+"""
+Motor alternativo de Monte Carlo Tree Search (UCT)
+"""
+import math
+import random
+import time
+
+from bitboard import casillas_alcanzables, contar_bits, posicion
+from config import (
+    EXPLORACION_MCTS,
+    GUIA_SIMULACION_MCTS,
+    MAXIMO_NODOS_MCTS,
+    PLAYOUTS_MCTS,
+    TIEMPO_MINIMO_MS,
+)
+from control_busqueda import BusquedaInterrumpida, LimiteBusqueda
+from estadisticas import EstadisticasBusqueda
+from estado_busqueda import BLANCO, PASE, EstadoBusqueda
+
+# El presupuesto y el progreso se revisan cada tantas simulaciones
+INTERVALO_VERIFICACION = 64
+
+
+class NodoMCTS:
+    """
+    Posición del árbol. `lado` es el bando que jugó `movimiento` para
+    llegar aquí y `victorias` suma los resultados desde su punto de vista
+    (1 victoria, 0.5 empate). `pendientes` son las jugadas aún sin nodo.
+    """
+
+    __slots__ = (
+        "movimiento",
+        "lado",
+        "clave",
+        "hijos",
+        "pendientes",
+        "visitas",
+        "victorias",
+    )
+
+    def __init__(self, movimiento, lado, clave, pendientes):
+        self.movimiento = movimiento
+        self.lado = lado
+        self.clave = clave
+        self.hijos = []
+        self.pendientes = pendientes
+        self.visitas = 0
+        self.victorias = 0.0
+
+    def terminal(self):
+        return not self.hijos and not self.pendientes
+
+    def mas_visitado(self):
+        return max(self.hijos, key=lambda hijo: hijo.visitas)
+
+
+def jugadas_de(estado):
+    """
+    Jugadas del bando en turno: sus movimientos, [PASE] si no tiene pero el
+    rival sí, o [] si la partida terminó
+    """
+    movimientos = estado.movimientos()
+    if movimientos:
+        return movimientos
+    if estado.movilidad(1 - estado.lado):
+        return [PASE]
+    return []
+
+
+def jugar(estado, jugada):
+    if jugada == PASE:
+        estado.pasar()
+    else:
+        estado.hacer_movimiento(jugada)
+
+
+def resultado_blanco(diferencia):
+    """Resultado de la partida para el blanco: 1, 0.5 o 0"""
+    if diferencia > 0:
+        return 1.0
+    if diferencia < 0:
+        return 0.0
+    return 0.5
+
+
+class JugadorMCTS:
+    """
+    Jugador de IA con Monte Carlo Tree Search: cada simulación baja por el
+    árbol con UCT, agrega un nodo y termina la partida con jugadas al azar
+    (con probabilidad `guia` la captura de mayor valor) usando las reglas
+    de EstadoBusqueda, las mismas de GameLogic.mover_caballo.
+
+    Tiene la misma interfaz que AIPlayer (obtener_mejor_movimiento,
+    ponderar, cerrar, nodos y estadisticas), así que la interfaz y el torneo
+    lo usan igual. El presupuesto por jugada es de `playouts` simulaciones,
+    o de tiempo con `tiempo_partida_ms` (se reparte como en AIPlayer) o con
+    el `tiempo_ms` de cada llamada.
+
+    El subárbol de la jugada elegida se conserva: en la jugada siguiente se
+    busca ahí la posición actual (tras la respuesta del rival) y las
+    simulaciones anteriores, incluidas las de la ponderación, se
+    aprovechan.
+    """
+
+    def __init__(
+        self,
+        playouts=PLAYOUTS_MCTS,
+        tiempo_partida_ms=None,
+        exploracion=EXPLORACION_MCTS,
+        guia=GUIA_SIMULACION_MCTS,
+        maximo_nodos=MAXIMO_NODOS_MCTS,
+        semilla=None,
+    ):
+        self.playouts = playouts
+        self.tiempo_restante_ms = tiempo_partida_ms
+        self.exploracion = exploracion
+        self.guia = guia
+        self.maximo_nodos = maximo_nodos
+        self.generador = random.Random(semilla)
+        self.raiz = None
+        self.nodos_arbol = 0
+        self.nodos = 0
+        self.simulaciones = 0
+        self.profundidad_alcanzada = 0
+        self.ultimo_valor = None
+        self.estadisticas = None
+        self.progreso = None
+        self._dimension = None
+
+    def cerrar(self):
+        """No retiene recursos externos; existe por compatibilidad con AIPlayer"""
+        self.raiz = None
+
+    def _nuevo_nodo(self, movimiento, lado, estado):
+        self.nodos_arbol += 1
+        return NodoMCTS(movimiento, lado, estado.clave, jugadas_de(estado))
+
+    def preparar_raiz(self, estado):
+        """
+        Toma como raíz el nodo de `estado` si está en el árbol guardado (la
+        raíz anterior o hasta dos jugadas más abajo); si no, empieza un
+        árbol nuevo
+        """
+        clave = estado.clave
+        candidatos = [] if self.raiz is None else [self.raiz]
+        for _ in range(3):
+            for nodo in candidatos:
+                if nodo.clave == clave:
+                    self.raiz = nodo
+                    # Cada nodo del subárbol se creó en una visita a él
+                    self.nodos_arbol = nodo.visitas + 1
+                    return
+            candidatos = [hijo for nodo in candidatos for hijo in nodo.hijos]
+        self.nodos_arbol = 0
+        self.raiz = self._nuevo_nodo(None, 1 - estado.lado, estado)
+
+    def _uct(self, nodo):
+        """Hijo de `nodo` con mayor cota UCT"""
+        logaritmo = math.log(nodo.visitas)
+        exploracion = self.exploracion
+        return max(
+            nodo.hijos,
+            key=lambda hijo: hijo.victorias / hijo.visitas
+            + exploracion * math.sqrt(logaritmo / hijo.visitas),
+        )
+
+    def simular(self, estado):
+        """
+        Una iteración de MCTS desde la raíz: selección, expansión, partida
+        al azar y propagación del resultado. `estado` vuelve a quedar como
+        estaba.
+        """
+        nodo = self.raiz
+        camino = [nodo]
+        hechos = 0
+        while not nodo.pendientes and nodo.hijos:
+            nodo = self._uct(nodo)
+            jugar(estado, nodo.movimiento)
+            hechos += 1
+            camino.append(nodo)
+
+        if nodo.pendientes and self.nodos_arbol < self.maximo_nodos:
+            pendientes = nodo.pendientes
+            jugada = pendientes.pop(self.generador.randrange(len(pendientes)))
+            lado = estado.lado
+            jugar(estado, jugada)
+            hechos += 1
+            hijo = self._nuevo_nodo(jugada, lado, estado)
+            nodo.hijos.append(hijo)
+            camino.append(hijo)
+
+        if len(camino) - 1 > self.profundidad_alcanzada:
+            self.profundidad_alcanzada = len(camino) - 1
+        self.nodos += hechos
+        resultado = resultado_blanco(self.partida_aleatoria(estado))
+        for _ in range(hechos):
+            estado.deshacer_movimiento()
+
+        for nodo in camino:
+            nodo.visitas += 1
+            nodo.victorias += resultado if nodo.lado == BLANCO else 1.0 - resultado
+        self.simulaciones += 1
+
+    def partida_aleatoria(self, estado):
+        """
+        Juega al azar desde `estado` hasta el final y lo deshace. Retorna la
+        diferencia final de marcador (blanco - negro, con penalizaciones).
+        """
+        generador = self.generador
+        valores = estado.valores
+        guia = self.guia
+        hechos = 0
+        while True:
+            movimientos = estado.movimientos()
+            if movimientos:
+                if generador.random() < guia:
+                    jugada = max(movimientos, key=valores.__getitem__)
+                else:
+                    jugada = movimientos[generador.randrange(len(movimientos))]
+                estado.hacer_movimiento(jugada)
+            elif estado.movilidad(1 - estado.lado):
+                estado.pasar()
+            else:
+                break
+            hechos += 1
+        diferencia = estado.diferencia_real()
+        for _ in range(hechos):
+            estado.deshacer_movimiento()
+        self.nodos += hechos
+        return diferencia
+
+    def buscar(self, estado, limite, playouts=None):
+        """
+        Simula desde la raíz hasta `playouts` veces o hasta que `limite` se
+        agote (BusquedaInterrumpida se atrapa: el árbol queda válido)
+        """
+        hechas = 0
+        try:
+            while playouts is None or hechas < playouts:
+                if self.raiz.terminal():
+                    break
+                self.simular(estado)
+                hechas += 1
+                if not hechas % INTERVALO_VERIFICACION:
+                    limite.verificar(self.nodos)
+                    if self.progreso is not None:
+                        self._informar_progreso()
+        except BusquedaInterrumpida:
+            pass
+
+    def _informar_progreso(self):
+        """Envía al callback de progreso el avance, como AIPlayer"""
+        variante = self.variante_principal(self._dimension)
+        valor = None
+        if self.raiz.hijos:
+            mejor = self.raiz.mas_visitado()
+            valor = mejor.victorias / mejor.visitas
+        self.progreso(
+            {
+                "profundidad": self.profundidad_alcanzada,
+                "profundidad_completada": self.profundidad_alcanzada,
+                "nodos": self.nodos,
+                "valor": valor,
+                "movimiento": variante[0] if variante else None,
+                "variante": variante,
+            }
+        )
+
+    def asignar_tiempo(self, estado):
+        """
+        Reparte el tiempo restante entre las jugadas que quedan, estimadas
+        como en AIPlayer: la mitad de las casillas que el caballo del bando
+        en turno todavía puede alcanzar
+        """
+        lado = estado.lado
+        alcanzables = casillas_alcanzables(
+            estado.posiciones[lado], ~estado.ocupadas(lado), estado.mascaras_caballo
+        )
+        restantes = max(1, (contar_bits(alcanzables) + 1) // 2)
+        return max(TIEMPO_MINIMO_MS, self.tiempo_restante_ms / restantes)
+
+    def ponderar(self, game_logic, token):
+        """
+        Simula desde la posición del turno del rival hasta que `token` se
+        cancele; obtener_mejor_movimiento reutiliza el subárbol de la
+        respuesta que el rival juegue
+        """
+        estado = EstadoBusqueda.desde_game_logic(game_logic)
+        self._dimension = estado.dimension
+        self.preparar_raiz(estado)
+        self.buscar(estado, LimiteBusqueda(token=token))
+
+    def variante_principal(self, dimension):
+        """Jugadas más visitadas desde la raíz, como (fila, col)"""
+        variante = []
+        nodo = self.raiz
+        while nodo.hijos:
+            nodo = nodo.mas_visitado()
+            if nodo.movimiento != PASE:
+                variante.append(posicion(nodo.movimiento, dimension))
+        return variante
+
+    def obtener_mejor_movimiento(
+        self, game_logic, tiempo_ms=None, token=None, progreso=None
+    ):
+        """
+        Retorna la jugada más visitada desde la posición actual, o None si
+        el bando en turno no puede mover o se canceló antes de simular.
+        Mismos argumentos que AIPlayer.obtener_mejor_movimiento.
+        """
+        inicio = time.perf_counter()
+        estado = EstadoBusqueda.desde_game_logic(game_logic)
+        self._dimension = estado.dimension
+        self.nodos = 0
+        self.simulaciones = 0
+        self.profundidad_alcanzada = 0
+        self.progreso = progreso
+        self.preparar_raiz(estado)
+        reutilizadas = self.raiz.visitas
+
+        if tiempo_ms is None and self.tiempo_restante_ms is not None:
+            tiempo_ms = self.asignar_tiempo(estado)
+        playouts = self.playouts if tiempo_ms is None else None
+        self.buscar(estado, LimiteBusqueda(tiempo_ms, None, token), playouts)
+        self.progreso = None
+
+        transcurrido_ms = (time.perf_counter() - inicio) * 1000
+        if self.tiempo_restante_ms is not None:
+            self.tiempo_restante_ms = max(0, self.tiempo_restante_ms - transcurrido_ms)
+
+        mejor = None
+        hijos = [hijo for hijo in self.raiz.hijos if hijo.movimiento != PASE]
+        if hijos:
+            mejor = max(hijos, key=lambda hijo: hijo.visitas)
+            self.ultimo_valor = mejor.victorias / mejor.visitas
+
+        estadisticas = EstadisticasBusqueda("mcts")
+        estadisticas.nodos = self.nodos
+        estadisticas.hojas = self.simulaciones
+        estadisticas.simulaciones = self.simulaciones
+        estadisticas.simulaciones_reutilizadas = reutilizadas
+        estadisticas.profundidad = self.profundidad_alcanzada
+        estadisticas.profundidad_maxima = self.profundidad_alcanzada
+        estadisticas.tiempo_ms = transcurrido_ms
+        if mejor is not None:
+            estadisticas.valor = self.ultimo_valor
+            estadisticas.movimiento = posicion(mejor.movimiento, estado.dimension)
+            estadisticas.variante_principal = self.variante_principal(
+                estado.dimension
+            )
+        self.estadisticas = estadisticas
+
+        if mejor is None:
+            return None
+        # La próxima jugada parte del subárbol elegido
+        self.raiz = mejor
+        return posicion(mejor.movimiento, estado.dimension)
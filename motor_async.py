@@ -0,0 +1,252 @@
+"""
+Interfaz asyncio del motor: análisis con progreso en vivo y cancelación
+
+Uso:
+    async with MotorAsincrono({"profundidad": 6}) as motor:
+        estadisticas = await motor.analizar(partida, tiempo_ms=500)
+
+        analisis = motor.iniciar(partida, tiempo_ms=2000)
+        async for info in analisis:
+            print(info["profundidad"], info["valor"], info["variante"])
+        estadisticas = await analisis
+
+    async with MotorAsincrono({"profundidad": 6}, procesos=4) as motor:
+        ...                                       (búsquedas en procesos)
+"""
+import asyncio
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ai_player import AIPlayer
+from control_busqueda import TokenCancelacion
+from estado_juego import EstadoJuego
+
+# Marca de la cola de progreso: la búsqueda terminó
+_FIN = object()
+
+
+class _TokenCompartido:
+    """
+    TokenCancelacion sobre un evento de multiprocessing.Manager: se puede
+    enviar a un proceso del pool y cancelar desde el proceso principal
+    """
+
+    def __init__(self, evento):
+        self._evento = evento
+
+    def cancelar(self):
+        self._evento.set()
+
+    def cancelado(self):
+        return self._evento.is_set()
+
+
+def _buscar_en_proceso(crear_jugador, opciones, estado, tiempo_ms, token, cola):
+    """
+    Tarea del pool: busca `estado` (EstadoJuego) con un jugador nuevo y
+    retorna sus EstadisticasBusqueda. El progreso va a `cola` (del Manager).
+    """
+    jugador = crear_jugador(**opciones)
+    try:
+        jugador.obtener_mejor_movimiento(
+            estado.a_game_logic(), tiempo_ms=tiempo_ms, token=token, progreso=cola.put
+        )
+    finally:
+        jugador.cerrar()
+    return jugador.estadisticas
+
+
+class Analisis:
+    """
+    Búsqueda en curso de MotorAsincrono.
+
+    - `await analisis` retorna las EstadisticasBusqueda de la búsqueda
+      (movimiento, valor, profundidad, nodos, variante principal...).
+    - `async for info in analisis` recibe los dicts de progreso del jugador
+      (profundidad, valor, movimiento, variante, nodos) hasta que termina.
+    - Cancelar la tarea que espera el análisis o la que lo recorre, salir
+      del `async for` antes de que termine, o llamar a cancelar(), detiene
+      la búsqueda en el hilo (o el proceso).
+    """
+
+    def __init__(self, jugador, partida, tiempo_ms, executor, cerrar_jugador):
+        loop = asyncio.get_running_loop()
+        self.jugador = jugador
+        self._cerrar_jugador = cerrar_jugador
+        self.token = TokenCancelacion()
+        self._cola = asyncio.Queue()
+
+        def informar(info):
+            # Se llama desde el hilo de la búsqueda
+            loop.call_soon_threadsafe(self._cola.put_nowait, info)
+
+        self._futuro = loop.run_in_executor(
+            executor, self._buscar, copy.deepcopy(partida), tiempo_ms, informar
+        )
+        self._futuro.add_done_callback(lambda _: self._cola.put_nowait(_FIN))
+
+    @classmethod
+    def en_proceso(cls, crear_jugador, opciones, partida, tiempo_ms, executor, manager):
+        """
+        Análisis que corre en un proceso de `executor` con un jugador nuevo
+        (`jugador` queda en None). La cancelación y el progreso cruzan de
+        proceso por objetos de `manager`.
+        """
+        analisis = cls.__new__(cls)
+        loop = asyncio.get_running_loop()
+        analisis.jugador = None
+        analisis._cerrar_jugador = False
+        analisis.token = _TokenCompartido(manager.Event())
+        analisis._cola = asyncio.Queue()
+        cola_proceso = manager.Queue()
+
+        analisis._futuro = loop.run_in_executor(
+            executor,
+            _buscar_en_proceso,
+            crear_jugador,
+            opciones,
+            EstadoJuego.desde_game_logic(partida),
+            tiempo_ms,
+            analisis.token,
+            cola_proceso,
+        )
+        # El proceso deja todo su progreso en la cola antes de terminar:
+        # detrás va la marca de fin
+        analisis._futuro.add_done_callback(lambda _: cola_proceso.put(None))
+        reenvio = loop.run_in_executor(None, analisis._reenviar, cola_proceso, loop)
+        reenvio.add_done_callback(lambda _: analisis._cola.put_nowait(_FIN))
+        return analisis
+
+    def _reenviar(self, cola_proceso, loop):
+        # Hilo: lleva el progreso del proceso al event loop
+        while True:
+            info = cola_proceso.get()
+            if info is None:
+                return
+            loop.call_soon_threadsafe(self._cola.put_nowait, info)
+
+    def _buscar(self, partida, tiempo_ms, informar):
+        try:
+            self.jugador.obtener_mejor_movimiento(
+                partida, tiempo_ms=tiempo_ms, token=self.token, progreso=informar
+            )
+        finally:
+            if self._cerrar_jugador:
+                self.jugador.cerrar()
+        return self.jugador.estadisticas
+
+    def cancelar(self):
+        """Pide detener la búsqueda; el resultado es la mejor jugada hasta ahí"""
+        self.token.cancelar()
+
+    def terminado(self):
+        return self._futuro.done()
+
+    async def _resultado(self):
+        try:
+            return await asyncio.shield(self._futuro)
+        except asyncio.CancelledError:
+            # Detener la búsqueda y esperar a que suelte el jugador antes de
+            # propagar la cancelación
+            self.token.cancelar()
+            await asyncio.wait({self._futuro})
+            raise
+
+    def __await__(self):
+        return self._resultado().__await__()
+
+    async def __aiter__(self):
+        try:
+            while True:
+                info = await self._cola.get()
+                if info is _FIN:
+                    return
+                yield info
+        finally:
+            if not self._futuro.done():
+                # El consumidor se fue antes del final (cancelado, break o
+                # aclose): nadie más mira esta búsqueda
+                self.token.cancelar()
+                await asyncio.wait({self._futuro})
+
+
+class MotorAsincrono:
+    """
+    Sirve análisis desde un event loop sin bloquearlo: cada búsqueda corre
+    en un hilo del executor y avisa su progreso al loop. Muchas partidas
+    pueden analizarse a la vez (hasta `hilos`, el resto espera en la cola
+    del executor), pero la búsqueda es Python puro y los hilos se turnan el
+    GIL: la concurrencia con hilos da respuesta al loop, no rendimiento, y
+    el tiempo de cada búsqueda se reparte con las demás en curso.
+
+    Con `procesos` las búsquedas corren en un pool de ese número de
+    procesos, de a una por proceso y en paralelo de verdad. Cada análisis
+    reconstruye la partida en el proceso (ver estado_juego.EstadoJuego) con
+    un jugador nuevo, así que `crear_jugador` y las opciones tienen que
+    poder enviarse a otro proceso.
+
+    Cada análisis usa un jugador nuevo creado con `crear_jugador(**opciones)`
+    (AIPlayer por defecto; sirve cualquier jugador con su misma interfaz,
+    como mcts.JugadorMCTS), salvo que se pase `jugador`: así una partida
+    conserva su tabla de transposición entre jugadas. Un mismo jugador no
+    admite dos análisis a la vez. Con `procesos` no se puede pasar
+    `jugador`; para conservar la tabla entre jugadas sirve una tabla
+    persistente (opción `ruta_tt` de AIPlayer).
+    """
+
+    def __init__(
+        self, opciones=None, hilos=None, crear_jugador=AIPlayer, procesos=None
+    ):
+        self.opciones = dict(opciones or {})
+        self.crear_jugador = crear_jugador
+        if procesos is None:
+            self._manager = None
+            self._executor = ThreadPoolExecutor(
+                max_workers=hilos, thread_name_prefix="motor"
+            )
+        else:
+            contexto = multiprocessing.get_context()
+            self._manager = contexto.Manager()
+            self._executor = ProcessPoolExecutor(
+                max_workers=procesos, mp_context=contexto
+            )
+
+    def iniciar(self, partida, tiempo_ms=None, jugador=None):
+        """
+        Lanza el análisis de `partida` (GameLogic; se copia) y retorna el
+        Analisis en curso. `tiempo_ms` es el presupuesto de la jugada; sin
+        él manda la configuración del jugador (profundidad, nodos...).
+        Debe llamarse desde el event loop.
+        """
+        if self._manager is not None:
+            if jugador is not None:
+                raise ValueError("con procesos cada análisis crea su jugador")
+            return Analisis.en_proceso(
+                self.crear_jugador,
+                self.opciones,
+                partida,
+                tiempo_ms,
+                self._executor,
+                self._manager,
+            )
+        propio = jugador is None
+        if propio:
+            jugador = self.crear_jugador(**self.opciones)
+        return Analisis(jugador, partida, tiempo_ms, self._executor, propio)
+
+    async def analizar(self, partida, tiempo_ms=None, jugador=None):
+        """Analiza `partida` y retorna las EstadisticasBusqueda del resultado"""
+        return await self.iniciar(partida, tiempo_ms, jugador)
+
+    def cerrar(self):
+        """Libera los hilos o procesos; los análisis en curso terminan antes"""
+        self._executor.shutdown(wait=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await asyncio.get_running_loop().run_in_executor(None, self.cerrar)
@@ -0,0 +1,81 @@
+"""
+Ordenamiento de movimientos para mejorar la poda Alpha-Beta
+"""
+
+# Prioridades: primero el movimiento de la tabla de transposición, luego las
+# capturas de puntos positivos (mayor valor primero), las jugadas asesinas
+# del ply, las casillas sin puntos según la historia y al final las casillas
+# con puntos negativos
+PRIORIDAD_TABLA = 1 << 40
+PRIORIDAD_CAPTURA = 1 << 32
+PRIORIDAD_ASESINA = 1 << 31
+PRIORIDAD_CASTIGO = -(1 << 32)
+
+# Tope de la historia; al superarlo se reducen todos los valores a la mitad
+LIMITE_HISTORIA = 1 << 30
+
+# Jugadas asesinas guardadas por ply
+ASESINAS_POR_PLY = 2
+
+
+class OrdenadorMovimientos:
+    """
+    Ordena los movimientos de un nodo y aprende de los cortes.
+    - asesinas[ply]: últimos movimientos que produjeron un corte en ese ply
+    - historia[lado][casilla]: peso acumulado (profundidad²) de los cortes,
+      compartido entre búsquedas y envejecido al empezar cada una
+    """
+
+    def __init__(self, dimension):
+        casillas = dimension * dimension
+        self.dimension = dimension
+        self.max_ply = 2 * casillas + 2
+        self.historia = [[0] * casillas, [0] * casillas]
+        self.asesinas = [[None] * ASESINAS_POR_PLY for _ in range(self.max_ply)]
+
+    def nueva_busqueda(self):
+        """Borra las asesinas y reduce la historia a la mitad"""
+        for asesinas in self.asesinas:
+            for i in range(ASESINAS_POR_PLY):
+                asesinas[i] = None
+        for historia in self.historia:
+            for casilla, peso in enumerate(historia):
+                historia[casilla] = peso >> 1
+
+    def ordenar(self, movimientos, estado, movimiento_tabla=None):
+        """Ordena `movimientos` en el sitio, del más prometedor al menos"""
+        valores = estado.valores
+        primera, segunda = self.asesinas[estado.ply]
+        historia = self.historia[estado.lado]
+
+        def prioridad(mov):
+            if mov == movimiento_tabla:
+                return PRIORIDAD_TABLA
+            valor = valores[mov]
+            if valor > 0:
+                return PRIORIDAD_CAPTURA + valor
+            if mov == primera:
+                return PRIORIDAD_ASESINA
+            if mov == segunda:
+                return PRIORIDAD_ASESINA - 1
+            if valor < 0:
+                return PRIORIDAD_CASTIGO + valor
+            return historia[mov]
+
+        # sort es estable: los empates conservan el orden de MOVIMIENTOS_CABALLO
+        movimientos.sort(key=prioridad, reverse=True)
+        return movimientos
+
+    def registrar_corte(self, mov, estado, profundidad):
+        """Actualiza asesinas e historia con un movimiento que produjo un corte"""
+        asesinas = self.asesinas[estado.ply]
+        if asesinas[0] != mov:
+            asesinas[1] = asesinas[0]
+            asesinas[0] = mov
+
+        historia = self.historia[estado.lado]
+        historia[mov] += profundidad * profundidad
+        if historia[mov] >= LIMITE_HISTORIA:
+            for lado in self.historia:
+                for casilla, peso in enumerate(lado):
+                    lado[casilla] = peso >> 1
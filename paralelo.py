@@ -0,0 +1,249 @@
+"""
+Búsqueda paralela en la raíz con un pool de procesos
+"""
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from control_busqueda import BusquedaInterrumpida, LimiteBusqueda
+from estado_busqueda import BLANCO
+from estado_juego import EstadoJuego
+
+# Con este margen un movimiento que empata con el mejor conocido devuelve su
+# valor exacto en vez de una cota. Sirve cualquier margen positivo mayor que
+# el redondeo de sumar los pesos de la evaluación en otro orden
+EPSILON = 1e-6
+
+# Cada cuánto (segundos) el proceso principal revisa el límite de la búsqueda
+INTERVALO_ESPERA = 0.01
+
+# Estado global de cada proceso del pool
+_mejor_compartido = None
+_evento_cancelacion = None
+_nodos_compartidos = None
+_jugador = None
+
+
+class _TokenProceso:
+    """Adapta el evento compartido del pool a la interfaz de TokenCancelacion"""
+
+    def cancelado(self):
+        return _evento_cancelacion.is_set()
+
+
+class _LimiteProceso(LimiteBusqueda):
+    """
+    Límite de una tarea del pool: el evento de cancelación y el presupuesto
+    de nodos de toda la búsqueda paralela. Cada revisión suma los nodos
+    nuevos de la tarea al contador compartido por los procesos, así que el
+    presupuesto se respeta mientras las tareas corren.
+    """
+
+    def __init__(self, nodos):
+        super().__init__(nodos=nodos, token=_TokenProceso())
+        self._contados = 0
+
+    def contar(self, nodos):
+        """Suma al contador compartido lo que la tarea buscó desde la última vez"""
+        with _nodos_compartidos.get_lock():
+            _nodos_compartidos.value += nodos - self._contados
+            total = _nodos_compartidos.value
+        self._contados = nodos
+        return total
+
+    def agotado(self, nodos):
+        total = self.contar(nodos)
+        if self.token.cancelado():
+            return True
+        return self.nodos is not None and total >= self.nodos
+
+
+def _inicializar_proceso(mejor_compartido, evento_cancelacion, nodos_compartidos):
+    global _mejor_compartido, _evento_cancelacion, _nodos_compartidos
+    _mejor_compartido = mejor_compartido
+    _evento_cancelacion = evento_cancelacion
+    _nodos_compartidos = nodos_compartidos
+
+
+def _buscar_movimiento_raiz(raiz, movimiento, profundidad, opciones, nodos):
+    """
+    Tarea de un proceso: juega `movimiento` en la raíz (EstadoJuego) y busca
+    la posición resultante. La ventana parte del mejor valor de raíz
+    conocido en ese momento, así que un movimiento peor solo devuelve una
+    cota. `nodos` es el presupuesto de nodos de la búsqueda paralela entera
+    (None si no tiene).
+    Retorna (valor, hoja_alcanzada); valor es None si la búsqueda se
+    canceló o se agotó el presupuesto.
+    """
+    global _jugador
+    from ai_player import AIPlayer
+
+    # Cada proceso conserva su jugador (tabla e historia) entre tareas
+    if _jugador is None or _jugador.opciones_paralelas != opciones:
+        _jugador = AIPlayer(profundidad, **opciones)
+        _jugador.opciones_paralelas = opciones
+
+    estado = raiz.a_busqueda()
+    maximiza = estado.lado == BLANCO
+    _jugador.preparar_busqueda(estado)
+    estado.hacer_movimiento(movimiento)
+
+    with _mejor_compartido.get_lock():
+        mejor = _mejor_compartido.value
+    if maximiza:
+        alpha, beta = mejor - EPSILON, float("inf")
+    else:
+        alpha, beta = float("-inf"), mejor + EPSILON
+
+    _jugador._hoja_alcanzada = False
+    limite = _LimiteProceso(nodos)
+    # Las tareas que empiezan con el presupuesto ya gastado no buscan nada
+    if limite.agotado(0):
+        return None, False
+    _jugador.limite = limite
+    try:
+        valor, _ = _jugador.minimax(estado, profundidad - 1, alpha, beta)
+    except BusquedaInterrumpida:
+        return None, False
+    finally:
+        _jugador.limite = None
+        limite.contar(_jugador.nodos)
+
+    # Publicar el valor si mejora el de la raíz
+    with _mejor_compartido.get_lock():
+        if maximiza and valor > _mejor_compartido.value:
+            _mejor_compartido.value = valor
+        elif not maximiza and valor < _mejor_compartido.value:
+            _mejor_compartido.value = valor
+
+    return valor, _jugador._hoja_alcanzada
+
+
+class BusquedaParalela:
+    """
+    Reparte los movimientos de la raíz entre procesos.
+    El primer movimiento (el mejor según el ordenamiento) se busca solo y
+    con ventana completa; su valor se comparte como cota de la raíz y el
+    resto de movimientos se buscan en paralelo contra esa cota, que cada
+    tarea vuelve a leer al empezar. Entre los movimientos con el mejor
+    valor gana el primero en el orden de la raíz, igual que en la búsqueda
+    secuencial.
+    """
+
+    def __init__(self, procesos, opciones=None):
+        self.procesos = procesos
+        self.opciones = opciones or {}
+        contexto = multiprocessing.get_context()
+        self._mejor = contexto.Value("d", 0.0)
+        self._cancelacion = contexto.Event()
+        self._nodos = contexto.Value("q", 0)
+        self._nodos_previos = 0
+        self._pool = None
+        self.nodos = 0
+        self.hoja_alcanzada = False
+
+    def _obtener_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.procesos,
+                initializer=_inicializar_proceso,
+                initargs=(self._mejor, self._cancelacion, self._nodos),
+            )
+        return self._pool
+
+    def cerrar(self):
+        """Detiene los procesos del pool"""
+        if self._pool is not None:
+            self._cancelacion.set()
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _esperar(self, futuros, limite):
+        """Espera a que termine alguno de `futuros` vigilando el límite"""
+        while True:
+            listos, pendientes = wait(
+                futuros, timeout=INTERVALO_ESPERA, return_when=FIRST_COMPLETED
+            )
+            if listos:
+                return listos, pendientes
+            nodos = self._nodos_previos + self._nodos.value
+            if limite is not None and limite.agotado(nodos):
+                self._cancelacion.set()
+                raise BusquedaInterrumpida()
+
+    def _enviar(self, pool, raiz, movimiento, profundidad, nodos):
+        return pool.submit(
+            _buscar_movimiento_raiz,
+            raiz,
+            movimiento,
+            profundidad,
+            self.opciones,
+            nodos,
+        )
+
+    def _recoger(self, futuro):
+        """Retorna el valor de una tarea terminada"""
+        valor, hoja_alcanzada = futuro.result()
+        self.hoja_alcanzada = self.hoja_alcanzada or hoja_alcanzada
+        if valor is None:
+            raise BusquedaInterrumpida()
+        return valor
+
+    def buscar(self, estado, movimientos, profundidad, limite=None, nodos_previos=0):
+        """
+        Busca `movimientos` (ya ordenados) de la raíz de `estado` a
+        `profundidad`. Retorna (valor, mejor_movimiento); lanza
+        BusquedaInterrumpida si `limite` se agota o se cancela. Los nodos de
+        `limite` incluyen `nodos_previos`, los que ya se gastaron antes en la
+        misma jugada. Al terminar, `nodos` tiene los buscados por los procesos.
+        """
+        pool = self._obtener_pool()
+        self.nodos = 0
+        self.hoja_alcanzada = False
+        self._cancelacion.clear()
+        self._nodos_previos = nodos_previos
+        with self._nodos.get_lock():
+            self._nodos.value = 0
+        presupuesto = None
+        if limite is not None and limite.nodos is not None:
+            presupuesto = limite.nodos - nodos_previos
+        maximiza = estado.lado == BLANCO
+        raiz = EstadoJuego.desde_busqueda(estado)
+
+        # El primer movimiento fija la cota inicial de la raíz
+        with self._mejor.get_lock():
+            self._mejor.value = float("-inf") if maximiza else float("inf")
+        futuro = self._enviar(pool, raiz, movimientos[0], profundidad, presupuesto)
+        pendientes = {futuro}
+        try:
+            self._esperar(pendientes, limite)
+            resultados = {0: self._recoger(futuro)}
+
+            futuros = {
+                self._enviar(pool, raiz, mov, profundidad, presupuesto): i
+                for i, mov in enumerate(movimientos[1:], start=1)
+            }
+            pendientes = set(futuros)
+            while pendientes:
+                listos, pendientes = self._esperar(pendientes, limite)
+                for futuro in listos:
+                    resultados[futuros[futuro]] = self._recoger(futuro)
+        except BusquedaInterrumpida:
+            self._cancelacion.set()
+            for futuro in pendientes:
+                futuro.cancel()
+            # Las tareas en curso ven el evento y terminan enseguida; hay que
+            # esperarlas para que no sigan corriendo en la próxima búsqueda
+            wait(pendientes)
+            self.nodos = self._nodos.value
+            raise
+        self.nodos = self._nodos.value
+
+        # El primero (en orden de raíz) con el mejor valor
+        mejor_indice = 0
+        for i in range(1, len(movimientos)):
+            valor = resultados[i]
+            if (maximiza and valor > resultados[mejor_indice]) or (
+                not maximiza and valor < resultados[mejor_indice]
+            ):
+                mejor_indice = i
+        return resultados[mejor_indice], movimientos[mejor_indice]
@@ -0,0 +1,389 @@
+"""
+Formato binario compacto para registrar partidas
+
+Uso:
+    python registro_partidas.py resumen partidas.shr
+    python registro_partidas.py reproducir partidas.shr --partida 3
+
+Un archivo empieza con MAGICO y sigue con partidas una tras otra, sin
+índice, así que se puede agregar al final y leer en streaming. Cada partida
+(enteros little-endian):
+- banderas (1 byte): CON_SEMILLA, CON_EVALUACIONES, CON_TIEMPOS,
+  CON_CASILLAS
+- dimensión del tablero (1 byte)
+- con semilla: la semilla (8 bytes) de config.generar_tablero_aleatorio
+  con esa dimensión y, con CON_CASILLAS, la cantidad de casillas con puntos
+  (1 byte) para config.valores_casillas (sin ella, los valores clásicos);
+  sin semilla: la cantidad de casillas con puntos (1 byte), cada una como
+  índice (1 byte) y valor (1 byte con signo), y las casillas de los
+  caballos blanco y negro (1 byte cada una)
+- cantidad de jugadas (2 bytes) y una casilla de destino por jugada
+  (1 byte). Los pases no se guardan: al reproducir se pasa cuando el bando
+  en turno no puede mover, como en la partida.
+- opcionales: la evaluación (float32) y el tiempo de reflexión en ms
+  (float32) de cada jugada
+"""
+import argparse
+import struct
+import sys
+
+from bitboard import indice, posicion, valores_de_tablero
+from config import generar_tablero_aleatorio, valores_casillas
+from estado_juego import EstadoJuego
+from game_logic import GameLogic
+
+MAGICO = b"SHR1"
+
+CON_SEMILLA = 1
+CON_EVALUACIONES = 2
+CON_TIEMPOS = 4
+CON_CASILLAS = 8
+
+_CABECERA = struct.Struct("<BB")
+_SEMILLA = struct.Struct("<Q")
+SEMILLA_MAXIMA = (1 << 64) - 1
+_CASILLA_PUNTOS = struct.Struct("<Bb")
+_CABALLOS = struct.Struct("<BB")
+_JUGADAS = struct.Struct("<H")
+
+
+class FormatoInvalido(ValueError):
+    """El archivo no es un registro de partidas o está truncado"""
+
+
+class RegistroPartida:
+    """
+    Una partida registrada: tablero inicial, casillas iniciales de los
+    caballos, jugadas (fila, col) en orden y, opcionalmente, la evaluación y
+    el tiempo de reflexión de cada una.
+
+    Si el tablero salió de generar_tablero_aleatorio, con `semilla` se
+    guarda solo la semilla; `casillas` es entonces la cantidad pasada a
+    valores_casillas, o None si se usaron los valores clásicos.
+    """
+
+    def __init__(
+        self,
+        tablero,
+        pos_blanco,
+        pos_negro,
+        movimientos=None,
+        evaluaciones=None,
+        tiempos_ms=None,
+        semilla=None,
+        casillas=None,
+    ):
+        self.tablero = tablero
+        self.pos_blanco = pos_blanco
+        self.pos_negro = pos_negro
+        self.movimientos = movimientos if movimientos is not None else []
+        self.evaluaciones = evaluaciones
+        self.tiempos_ms = tiempos_ms
+        self.semilla = semilla
+        self.casillas = casillas
+
+    @classmethod
+    def desde_semilla(cls, semilla, dimension=None, casillas=None, **datos):
+        """
+        Registro de una partida sobre el tablero de generar_tablero_aleatorio
+        con `dimension` y, si se da, valores_casillas(`casillas`)
+        """
+        tablero, pos_blanco, pos_negro = tablero_de_semilla(
+            semilla, dimension, casillas
+        )
+        return cls(
+            tablero, pos_blanco, pos_negro, semilla=semilla, casillas=casillas, **datos
+        )
+
+    @property
+    def dimension(self):
+        return len(self.tablero)
+
+    def agregar(self, movimiento, evaluacion=None, tiempo_ms=None):
+        """Anota una jugada (y su evaluación y tiempo si se registran)"""
+        self.movimientos.append(movimiento)
+        if evaluacion is not None or self.evaluaciones is not None:
+            if self.evaluaciones is None:
+                self.evaluaciones = [float("nan")] * (len(self.movimientos) - 1)
+            self.evaluaciones.append(
+                float("nan") if evaluacion is None else float(evaluacion)
+            )
+        if tiempo_ms is not None or self.tiempos_ms is not None:
+            if self.tiempos_ms is None:
+                self.tiempos_ms = [float("nan")] * (len(self.movimientos) - 1)
+            self.tiempos_ms.append(
+                float("nan") if tiempo_ms is None else float(tiempo_ms)
+            )
+
+    def codificar(self):
+        """Bytes de la partida en el formato del archivo"""
+        dimension = self.dimension
+        banderas = 0
+        if self.semilla is not None:
+            banderas |= CON_SEMILLA
+        if self.evaluaciones is not None:
+            banderas |= CON_EVALUACIONES
+        if self.tiempos_ms is not None:
+            banderas |= CON_TIEMPOS
+
+        if self.casillas is not None and self.semilla is not None:
+            banderas |= CON_CASILLAS
+
+        partes = [_CABECERA.pack(banderas, dimension)]
+        if self.semilla is not None:
+            self._validar_semilla()
+            partes.append(_SEMILLA.pack(self.semilla))
+            if self.casillas is not None:
+                partes.append(bytes([self.casillas]))
+        else:
+            casillas = [
+                (fila * dimension + col, valor)
+                for fila, fila_valores in enumerate(self.tablero)
+                for col, valor in enumerate(fila_valores)
+                if valor
+            ]
+            partes.append(bytes([len(casillas)]))
+            partes.extend(_CASILLA_PUNTOS.pack(*casilla) for casilla in casillas)
+            partes.append(
+                _CABALLOS.pack(
+                    indice(self.pos_blanco, dimension),
+                    indice(self.pos_negro, dimension),
+                )
+            )
+
+        cantidad = len(self.movimientos)
+        partes.append(_JUGADAS.pack(cantidad))
+        partes.append(bytes(indice(mov, dimension) for mov in self.movimientos))
+        if self.evaluaciones is not None:
+            partes.append(struct.pack(f"<{cantidad}f", *self.evaluaciones))
+        if self.tiempos_ms is not None:
+            partes.append(struct.pack(f"<{cantidad}f", *self.tiempos_ms))
+        return b"".join(partes)
+
+    def _validar_semilla(self):
+        """La semilla tiene que caber en el archivo y generar este tablero"""
+        if not 0 <= self.semilla <= SEMILLA_MAXIMA:
+            raise ValueError(f"semilla fuera de 0..{SEMILLA_MAXIMA}: {self.semilla}")
+        if not 0 <= (self.casillas or 0) <= 255:
+            raise ValueError(f"cantidad de casillas inválida: {self.casillas}")
+        generado = tablero_de_semilla(self.semilla, self.dimension, self.casillas)
+        partida = (self.tablero, tuple(self.pos_blanco), tuple(self.pos_negro))
+        if generado != partida:
+            raise ValueError(
+                f"la semilla {self.semilla} no genera el tablero de la partida"
+            )
+
+
+def tablero_de_semilla(semilla, dimension=None, casillas=None):
+    """
+    generar_tablero_aleatorio(semilla, dimension) con valores_casillas(casillas),
+    o con los valores clásicos si `casillas` es None
+    """
+    valores = None if casillas is None else valores_casillas(casillas)
+    return generar_tablero_aleatorio(semilla, dimension, valores)
+
+
+def _leer_exacto(archivo, cantidad):
+    datos = archivo.read(cantidad)
+    if len(datos) != cantidad:
+        raise FormatoInvalido("partida truncada")
+    return datos
+
+
+def _leer_partida(archivo):
+    """Lee la partida siguiente; None al final del archivo"""
+    cabecera = archivo.read(_CABECERA.size)
+    if not cabecera:
+        return None
+    if len(cabecera) != _CABECERA.size:
+        raise FormatoInvalido("partida truncada")
+    banderas, dimension = _CABECERA.unpack(cabecera)
+
+    semilla = casillas = None
+    if banderas & CON_SEMILLA:
+        (semilla,) = _SEMILLA.unpack(_leer_exacto(archivo, _SEMILLA.size))
+        if banderas & CON_CASILLAS:
+            casillas = _leer_exacto(archivo, 1)[0]
+        try:
+            tablero, pos_blanco, pos_negro = tablero_de_semilla(
+                semilla, dimension, casillas
+            )
+        except ValueError as error:
+            raise FormatoInvalido(f"tablero inválido: {error}") from None
+    else:
+        tablero = [[0] * dimension for _ in range(dimension)]
+        cantidad = _leer_exacto(archivo, 1)[0]
+        datos = _leer_exacto(archivo, cantidad * _CASILLA_PUNTOS.size)
+        for casilla, valor in _CASILLA_PUNTOS.iter_unpack(datos):
+            fila, col = posicion(casilla, dimension)
+            tablero[fila][col] = valor
+        blanco, negro = _CABALLOS.unpack(_leer_exacto(archivo, _CABALLOS.size))
+        pos_blanco = posicion(blanco, dimension)
+        pos_negro = posicion(negro, dimension)
+
+    (cantidad,) = _JUGADAS.unpack(_leer_exacto(archivo, _JUGADAS.size))
+    movimientos = [
+        posicion(casilla, dimension) for casilla in _leer_exacto(archivo, cantidad)
+    ]
+    evaluaciones = tiempos_ms = None
+    if banderas & CON_EVALUACIONES:
+        evaluaciones = list(
+            struct.unpack(f"<{cantidad}f", _leer_exacto(archivo, 4 * cantidad))
+        )
+    if banderas & CON_TIEMPOS:
+        tiempos_ms = list(
+            struct.unpack(f"<{cantidad}f", _leer_exacto(archivo, 4 * cantidad))
+        )
+    return RegistroPartida(
+        tablero,
+        pos_blanco,
+        pos_negro,
+        movimientos,
+        evaluaciones,
+        tiempos_ms,
+        semilla,
+        casillas,
+    )
+
+
+def leer_partidas(ruta):
+    """
+    Generador de las partidas de `ruta`, de a una: la memoria no depende
+    del tamaño del archivo
+    """
+    with open(ruta, "rb") as archivo:
+        if archivo.read(len(MAGICO)) != MAGICO:
+            raise FormatoInvalido(f"{ruta} no es un registro de partidas")
+        while True:
+            registro = _leer_partida(archivo)
+            if registro is None:
+                return
+            yield registro
+
+
+class EscritorPartidas:
+    """
+    Agrega partidas a un archivo de registro (lo crea con su cabecera si
+    no existe o está vacío). Se usa como context manager.
+    """
+
+    def __init__(self, ruta):
+        self._archivo = open(ruta, "ab")
+        if self._archivo.tell() == 0:
+            self._archivo.write(MAGICO)
+
+    def escribir(self, registro):
+        self._archivo.write(registro.codificar())
+
+    def cerrar(self):
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+
+def escribir_partidas(ruta, registros):
+    """Agrega a `ruta` las partidas de un iterable (también un generador)"""
+    with EscritorPartidas(ruta) as escritor:
+        for registro in registros:
+            escritor.escribir(registro)
+
+
+def reproducir(registro):
+    """
+    Generador que rehace la partida: entrega la GameLogic inicial y luego
+    la misma GameLogic tras cada jugada (se actualiza en el sitio), con los
+    pases hechos como en la partida original
+    """
+    partida = GameLogic(registro.tablero, registro.pos_blanco, registro.pos_negro)
+    yield partida
+    for numero, movimiento in enumerate(registro.movimientos, 1):
+        partida.pasar_turno()
+        if not partida.mover_caballo(movimiento):
+            raise FormatoInvalido(f"jugada {numero} inválida: {movimiento}")
+        yield partida
+
+
+def estados(registro):
+    """
+    Generador de EstadoJuego de la partida: el inicial y uno tras cada
+    jugada, con los pases hechos como en reproducir(). Los estados son
+    inmutables, así que se pueden guardar (p. ej. como claves de un dict)
+    sin copiarlos.
+    """
+    dimension = registro.dimension
+    estado = EstadoJuego(
+        valores_de_tablero(registro.tablero),
+        0,
+        indice(registro.pos_blanco, dimension),
+        indice(registro.pos_negro, dimension),
+        dimension=dimension,
+    )
+    yield estado
+    for numero, movimiento in enumerate(registro.movimientos, 1):
+        if not estado.movimientos() and not estado.terminado():
+            estado = estado.pasar()
+        destino = indice(movimiento, dimension)
+        if destino not in estado.movimientos():
+            raise FormatoInvalido(f"jugada {numero} inválida: {movimiento}")
+        estado = estado.hijo(destino)
+        yield estado
+
+
+def resultado_final(registro):
+    """GameLogic al terminar de reproducir la partida"""
+    for partida in reproducir(registro):
+        pass
+    return partida
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Registros de partidas")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    parser_resumen = comandos.add_parser("resumen", help="resultados del archivo")
+    parser_resumen.add_argument("ruta")
+    parser_reproducir = comandos.add_parser("reproducir", help="jugada a jugada")
+    parser_reproducir.add_argument("ruta")
+    parser_reproducir.add_argument("--partida", type=int, default=0)
+    argumentos = parser.parse_args()
+
+    if argumentos.comando == "resumen":
+        ganadores = {"Blanco": 0, "Negro": 0, "Empate": 0}
+        jugadas = 0
+        for registro in leer_partidas(argumentos.ruta):
+            ganadores[resultado_final(registro).obtener_ganador()] += 1
+            jugadas += len(registro.movimientos)
+        total = sum(ganadores.values())
+        print(f"Partidas: {total}, jugadas: {jugadas}")
+        for ganador, cantidad in ganadores.items():
+            print(f"  {ganador}: {cantidad}")
+        return 0
+
+    for numero, registro in enumerate(leer_partidas(argumentos.ruta)):
+        if numero != argumentos.partida:
+            continue
+        for jugada, partida in enumerate(reproducir(registro)):
+            if jugada == 0:
+                print(f"Blanco {partida.pos_blanco}, negro {partida.pos_negro}")
+                continue
+            extra = ""
+            if registro.evaluaciones is not None:
+                extra += f" eval {registro.evaluaciones[jugada - 1]:.2f}"
+            if registro.tiempos_ms is not None:
+                extra += f" {registro.tiempos_ms[jugada - 1]:.1f} ms"
+            bando = "negro" if partida.turno_blanco else "blanco"
+            print(
+                f"{jugada:>3}. {bando:<6} {registro.movimientos[jugada - 1]} "
+                f"{partida.puntos_blanco} : {partida.puntos_negro}{extra}"
+            )
+        print(f"Ganador: {partida.obtener_ganador()}")
+        return 0
+    print(f"El archivo no tiene la partida {argumentos.partida}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
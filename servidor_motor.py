@@ -0,0 +1,678 @@
+"""
+Servidor local del motor con un protocolo de líneas al estilo UCI
+
+Uso:
+    python servidor_motor.py                      (una sesión por stdin/stdout)
+    python servidor_motor.py --puerto 7878 --procesos 4
+
+Por TCP solo escucha en localhost; cada conexión es una sesión. Órdenes del
+cliente, una por línea:
+- uci / isready: responde "uciok" / "readyok"
+- setoption name <opción> value <valor>: argumento del jugador de la sesión
+  (los de AIPlayer, o "motor" con "mcts" para mcts.JugadorMCTS); el valor
+  es un literal de Python
+- ucinewgame: descarta la tabla de transposición de la sesión
+- position seed <semilla> [dimension <d>] [casillas <n>] [moves <c1> ...]:
+  el tablero de generar_tablero_aleatorio, como en registro_partidas (con
+  casillas, los valores de valores_casillas; sin ella, los clásicos)
+- position board <fila>/<fila>/... [moves <c1> ...]: cada fila son sus
+  casillas separadas por comas: "." vacía, un entero con los puntos, "W" o
+  "B" el caballo blanco o negro
+- go [movetime <ms>] [depth <n>] [infinite]
+- stop: termina la búsqueda en curso, que responde enseguida su bestmove
+- quit
+
+Las casillas se nombran con la letra de la columna y el número de la fila
+empezando en 1 ("a1" es (0, 0), "c2" es (1, 2)). Las jugadas de `moves`
+se reproducen como en registro_partidas: el bando sin movimientos pasa.
+
+Respuestas: "info depth <p> score <valor> nodes <n> pv <c1> ..." mientras
+busca, "bestmove <casilla>" al terminar ("bestmove (none)" si el bando en
+turno no puede mover) y "error <mensaje>" ante una orden inválida.
+
+Las búsquedas corren en un pool de procesos. Cada sesión queda asignada a
+un proceso, que conserva su jugador (y su tabla de transposición) entre
+búsquedas. Cada proceso recibe a lo sumo BUSQUEDAS_POR_PROCESO búsquedas a
+la vez: un "go" de más espera turno en el event loop sin bloquear a las
+demás sesiones (y un stop lo responde enseguida), y las conexiones por
+encima de SESIONES_POR_PROCESO sesiones por proceso se rechazan con "error
+ocupado".
+"""
+import argparse
+import ast
+import asyncio
+import inspect
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ai_player import AIPlayer
+from config import DIMENSION_MAXIMA, DIMENSION_MINIMA, NIVELES
+from estado_juego import EstadoJuego
+from game_logic import GameLogic
+from registro_partidas import tablero_de_semilla
+from torneo import MOTORES, crear_jugador
+
+# Sesiones simultáneas por proceso (cada una con su tabla de transposición)
+SESIONES_POR_PROCESO = 8
+# Búsquedas enviadas a la vez a cada proceso antes de hacer esperar a un
+# "go". Con una sola, la señal de cancelación del proceso siempre es para la
+# búsqueda que corre: una que ya está en la cola del executor no se puede
+# descartar y su stop esperaría a que termine la anterior.
+BUSQUEDAS_POR_PROCESO = 1
+# Memoria de la tabla de transposición de cada sesión
+MEMORIA_TT_SESION_MB = 8
+# Profundidad de un "go" sin movetime ni depth
+PROFUNDIDAD_POR_DEFECTO = NIVELES["Amateur"]
+# "go infinite" termina con stop (o al agotar el árbol)
+TIEMPO_INFINITO_MS = 24 * 60 * 60 * 1000
+# Mínimo entre dos "info" de la misma profundidad (MCTS informa muy seguido)
+INTERVALO_INFO_MS = 100
+
+_COLUMNAS = "abcdefghijklmnopqrstuvwxyz"
+# Opciones de "position seed"
+_OPCIONES_SEMILLA = ("dimension", "casillas")
+
+# Estado global de cada proceso del pool
+_cancelada = None
+_cola_progreso = None
+_jugadores = {}
+
+
+class ErrorProtocolo(ValueError):
+    """Orden mal formada o imposible en la sesión"""
+
+
+def nombre_casilla(pos):
+    """(fila, col) -> "c2" """
+    fila, col = pos
+    return f"{_COLUMNAS[col]}{fila + 1}"
+
+
+def leer_casilla(texto, dimension):
+    """ "c2" -> (fila, col), validando que esté en el tablero"""
+    try:
+        col = _COLUMNAS.index(texto[0])
+        fila = int(texto[1:]) - 1
+    except (IndexError, ValueError):
+        raise ErrorProtocolo(f"casilla inválida: {texto}") from None
+    if not (0 <= fila < dimension and 0 <= col < dimension):
+        raise ErrorProtocolo(f"casilla fuera del tablero: {texto}")
+    return fila, col
+
+
+def leer_tablero(texto):
+    """Tablero de "position board": retorna (tablero, pos_blanco, pos_negro)"""
+    filas = texto.split("/")
+    dimension = len(filas)
+    if not DIMENSION_MINIMA <= dimension <= DIMENSION_MAXIMA:
+        raise ErrorProtocolo(f"dimensión {dimension} no admitida")
+    tablero = []
+    caballos = {}
+    for fila, celdas in enumerate(filas):
+        celdas = celdas.split(",")
+        if len(celdas) != dimension:
+            raise ErrorProtocolo(f"la fila {fila + 1} no tiene {dimension} casillas")
+        valores = []
+        for col, celda in enumerate(celdas):
+            if celda in ("W", "B"):
+                if celda in caballos:
+                    raise ErrorProtocolo(f"caballo {celda} repetido")
+                caballos[celda] = (fila, col)
+                valores.append(0)
+            elif celda == ".":
+                valores.append(0)
+            else:
+                try:
+                    valores.append(int(celda))
+                except ValueError:
+                    raise ErrorProtocolo(f"casilla inválida: {celda}") from None
+        tablero.append(valores)
+    if len(caballos) != 2:
+        raise ErrorProtocolo("faltan caballos (W y B)")
+    return tablero, caballos["W"], caballos["B"]
+
+
+def leer_posicion(palabras):
+    """
+    GameLogic de una orden "position" (sin la palabra position), con las
+    jugadas de `moves` ya hechas
+    """
+    if "moves" in palabras:
+        corte = palabras.index("moves")
+        palabras, jugadas = palabras[:corte], palabras[corte + 1 :]
+    else:
+        jugadas = []
+    if not palabras:
+        raise ErrorProtocolo("falta seed o board")
+
+    if palabras[0] == "seed":
+        tablero = _tablero_de_semilla(palabras[1:])
+    elif palabras[0] == "board" and len(palabras) == 2:
+        tablero = leer_tablero(palabras[1])
+    else:
+        raise ErrorProtocolo(f"position inválida: {' '.join(palabras)}")
+
+    partida = GameLogic(*tablero)
+    for jugada in jugadas:
+        partida.pasar_turno()
+        if not partida.mover_caballo(leer_casilla(jugada, partida.dimension)):
+            raise ErrorProtocolo(f"jugada inválida: {jugada}")
+    return partida
+
+
+def _tablero_de_semilla(palabras):
+    """Tablero de "position seed": <semilla> [<opción> <valor>] ..."""
+    if not palabras:
+        raise ErrorProtocolo("uso: position seed <semilla> [<opción> <valor>] ...")
+    if len(palabras) % 2 == 0:
+        raise ErrorProtocolo(f"falta el valor de {palabras[-1]}")
+    opciones = {}
+    for nombre, valor in zip(palabras[1::2], palabras[2::2]):
+        if nombre not in _OPCIONES_SEMILLA:
+            raise ErrorProtocolo(f"opción de seed desconocida: {nombre}")
+        if nombre in opciones:
+            raise ErrorProtocolo(f"opción de seed repetida: {nombre}")
+        opciones[nombre] = valor
+    try:
+        semilla = int(palabras[0])
+        opciones = {nombre: int(valor) for nombre, valor in opciones.items()}
+        return tablero_de_semilla(semilla, **opciones)
+    except ValueError as error:
+        raise ErrorProtocolo(f"position seed inválida: {error}") from None
+
+
+def jugada_inmediata(partida):
+    """Jugada de una búsqueda a profundidad 1 (para responder a un stop)"""
+    jugador = AIPlayer(1, usar_transposicion=False, casillas_final_exacto=None)
+    return jugador.obtener_mejor_movimiento(partida)
+
+
+class _TokenTarea:
+    """Token de cancelación de una tarea del pool (ver ServidorMotor.detener)"""
+
+    def __init__(self, tarea):
+        self.tarea = tarea
+
+    def cancelado(self):
+        return _cancelada.value == self.tarea
+
+
+def _inicializar_proceso(cancelada, cola_progreso):
+    global _cancelada, _cola_progreso
+    _cancelada = cancelada
+    _cola_progreso = cola_progreso
+
+
+def _buscar_en_proceso(sesion, tarea, opciones, estado, tiempo_ms, profundidad):
+    """
+    Tarea del pool: busca `estado` (EstadoJuego) con el jugador de la
+    sesión, que se crea la primera vez y se conserva entre búsquedas.
+    Retorna (movimiento, valor, nodos).
+    """
+    guardado = _jugadores.get(sesion)
+    if guardado is None or guardado[0] != opciones:
+        if guardado is not None:
+            guardado[1].cerrar()
+        guardado = (opciones, crear_jugador(opciones))
+        _jugadores[sesion] = guardado
+    jugador = guardado[1]
+    if isinstance(jugador, AIPlayer):
+        jugador.profundidad = profundidad
+
+    ultimo = [None, 0.0]
+
+    def informar(info):
+        # Cada profundidad nueva se informa; dentro de una, cada tanto
+        ahora = time.perf_counter()
+        profundidad_info = info.get("profundidad")
+        if (
+            profundidad_info == ultimo[0]
+            and (ahora - ultimo[1]) * 1000 < INTERVALO_INFO_MS
+        ):
+            return
+        ultimo[:] = profundidad_info, ahora
+        _cola_progreso.put((tarea, info))
+
+    partida = estado.a_game_logic()
+    movimiento = jugador.obtener_mejor_movimiento(
+        partida, tiempo_ms=tiempo_ms, token=_TokenTarea(tarea), progreso=informar
+    )
+    if movimiento is None:
+        movimiento = jugada_inmediata(partida)
+    return movimiento, jugador.ultimo_valor, jugador.nodos
+
+
+def _olvidar_sesion(sesion):
+    """Tarea del pool: libera el jugador de una sesión terminada"""
+    guardado = _jugadores.pop(sesion, None)
+    if guardado is not None:
+        guardado[1].cerrar()
+
+
+class _Proceso:
+    """Un proceso del pool con su cupo de búsquedas y su señal de cancelación"""
+
+    def __init__(self, contexto, cola_progreso):
+        self.cancelada = contexto.Value("q", 0)
+        self.executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=contexto,
+            initializer=_inicializar_proceso,
+            initargs=(self.cancelada, cola_progreso),
+        )
+        # El proceso se arranca ya: creado por fork mientras otro hilo lee
+        # stdin (servir_stdio), se bloquearía al cerrar su copia de stdin
+        self.executor.submit(int).result()
+        self.cupo = asyncio.Semaphore(BUSQUEDAS_POR_PROCESO)
+        self.sesiones = 0
+
+
+class Sesion:
+    """Estado de una conexión: opciones del jugador, posición y búsqueda"""
+
+    def __init__(self, numero, proceso, escribir):
+        self.numero = numero
+        self.proceso = proceso
+        self._escribir = escribir
+        self._bloqueo_escritura = asyncio.Lock()
+        self.opciones = {
+            "profundidad": PROFUNDIDAD_POR_DEFECTO,
+            "memoria_tt_mb": MEMORIA_TT_SESION_MB,
+        }
+        self.partida = None
+        self.busqueda = None
+        self.tarea = None
+        self.futuro = None
+        self.parada = False
+        self.cerrada = False
+
+    async def escribir(self, linea):
+        async with self._bloqueo_escritura:
+            if not self.cerrada:
+                await self._escribir(linea)
+
+    def buscando(self):
+        return self.busqueda is not None and not self.busqueda.done()
+
+
+class ServidorMotor:
+    """
+    Atiende sesiones del protocolo (ver el docstring del módulo) sobre un
+    pool de `procesos` procesos. Se usa desde un event loop: atender() corre
+    una sesión con funciones de lectura y escritura de líneas, y
+    servir_tcp() / servir_stdio() la conectan a un socket o a la consola.
+    """
+
+    def __init__(self, procesos=None):
+        contexto = multiprocessing.get_context()
+        self._cola_progreso = contexto.Queue()
+        self.procesos = [
+            _Proceso(contexto, self._cola_progreso)
+            for _ in range(procesos or os.cpu_count() or 1)
+        ]
+        self._tareas = {}
+        self._siguiente_tarea = 0
+        self._siguiente_sesion = 0
+        self._loop = None
+        self._hilo_progreso = None
+
+    def _iniciar_progreso(self):
+        if self._hilo_progreso is None:
+            self._loop = asyncio.get_running_loop()
+            self._hilo_progreso = threading.Thread(
+                target=self._repartir_progreso, daemon=True
+            )
+            self._hilo_progreso.start()
+
+    def _repartir_progreso(self):
+        # Hilo: lleva el progreso de los procesos al event loop
+        while True:
+            mensaje = self._cola_progreso.get()
+            if mensaje is None:
+                return
+            self._loop.call_soon_threadsafe(self._informar, *mensaje)
+
+    def _informar(self, tarea, info):
+        sesion = self._tareas.get(tarea)
+        if sesion is None:
+            return
+        palabras = ["info"]
+        if info.get("profundidad") is not None:
+            palabras += ["depth", str(info["profundidad"])]
+        if info.get("valor") is not None:
+            palabras += ["score", f"{info['valor']:g}"]
+        palabras += ["nodes", str(info.get("nodos", 0))]
+        if info.get("variante"):
+            palabras += ["pv"] + [nombre_casilla(pos) for pos in info["variante"]]
+        asyncio.ensure_future(sesion.escribir(" ".join(palabras)))
+
+    async def atender(self, leer_linea, escribir):
+        """
+        Corre una sesión hasta "quit" o el fin de la entrada. `leer_linea`
+        es una corrutina que retorna la línea siguiente ("" al final) y
+        `escribir` una que envía una línea.
+        """
+        self._iniciar_progreso()
+        proceso = min(self.procesos, key=lambda p: p.sesiones)
+        if proceso.sesiones >= SESIONES_POR_PROCESO:
+            await escribir("error ocupado")
+            return
+        proceso.sesiones += 1
+        self._siguiente_sesion += 1
+        sesion = Sesion(self._siguiente_sesion, proceso, escribir)
+        try:
+            while True:
+                linea = await leer_linea()
+                if not linea:
+                    break
+                palabras = linea.split()
+                if not palabras:
+                    continue
+                if palabras[0] == "quit":
+                    break
+                try:
+                    await self._ejecutar(sesion, palabras)
+                except ErrorProtocolo as error:
+                    await sesion.escribir(f"error {error}")
+        finally:
+            sesion.cerrada = True
+            if sesion.buscando():
+                # Se espera a que el proceso suelte la búsqueda para no
+                # liberar su cupo antes de tiempo
+                self.detener(sesion)
+                await asyncio.gather(sesion.busqueda, return_exceptions=True)
+            proceso.sesiones -= 1
+            proceso.executor.submit(_olvidar_sesion, sesion.numero)
+
+    async def _ejecutar(self, sesion, palabras):
+        orden = palabras[0]
+        if orden == "uci":
+            await sesion.escribir("id name Smart Horses")
+            await sesion.escribir("uciok")
+        elif orden == "isready":
+            await sesion.escribir("readyok")
+        elif orden == "stop":
+            if sesion.buscando():
+                self.detener(sesion)
+        elif sesion.buscando():
+            raise ErrorProtocolo(f"{orden} durante una búsqueda (falta stop)")
+        elif orden == "ucinewgame":
+            sesion.proceso.executor.submit(_olvidar_sesion, sesion.numero)
+        elif orden == "setoption":
+            self._opcion(sesion, palabras)
+        elif orden == "position":
+            sesion.partida = leer_posicion(palabras[1:])
+        elif orden == "go":
+            self._go(sesion, palabras[1:])
+        else:
+            raise ErrorProtocolo(f"orden desconocida: {orden}")
+
+    def _opcion(self, sesion, palabras):
+        if len(palabras) < 5 or palabras[1] != "name" or "value" not in palabras:
+            raise ErrorProtocolo("uso: setoption name <opción> value <valor>")
+        corte = palabras.index("value")
+        nombre = " ".join(palabras[2:corte])
+        try:
+            valor = ast.literal_eval(" ".join(palabras[corte + 1 :]))
+        except (ValueError, SyntaxError):
+            raise ErrorProtocolo(f"valor inválido para {nombre}") from None
+        opciones = dict(sesion.opciones, **{nombre: valor})
+        motor = opciones.pop("motor", "minimax")
+        if motor not in MOTORES:
+            raise ErrorProtocolo(f"motor desconocido: {motor}")
+        if motor != "minimax":
+            opciones.pop("profundidad", None)
+            opciones.pop("memoria_tt_mb", None)
+        try:
+            inspect.signature(MOTORES[motor]).bind(**opciones)
+        except TypeError:
+            raise ErrorProtocolo(f"opción desconocida: {nombre}") from None
+        opciones["motor"] = motor
+        sesion.opciones = opciones
+
+    def _go(self, sesion, palabras):
+        partida = sesion.partida
+        if partida is None:
+            raise ErrorProtocolo("falta position")
+        tiempo_ms = profundidad = None
+        infinita = False
+        i = 0
+        try:
+            while i < len(palabras):
+                if palabras[i] == "movetime":
+                    tiempo_ms = int(palabras[i + 1])
+                    i += 2
+                elif palabras[i] == "depth":
+                    profundidad = int(palabras[i + 1])
+                    i += 2
+                elif palabras[i] == "infinite":
+                    infinita = True
+                    i += 1
+                else:
+                    raise ErrorProtocolo(f"go inválido: {palabras[i]}")
+        except (IndexError, ValueError):
+            raise ErrorProtocolo(f"go inválido: {' '.join(palabras)}") from None
+        if infinita:
+            tiempo_ms = TIEMPO_INFINITO_MS
+        elif tiempo_ms is None and profundidad is None:
+            profundidad = sesion.opciones.get("profundidad", PROFUNDIDAD_POR_DEFECTO)
+
+        self._siguiente_tarea += 1
+        sesion.tarea = self._siguiente_tarea
+        sesion.futuro = None
+        sesion.parada = False
+        sesion.busqueda = asyncio.ensure_future(
+            self._buscar(sesion, sesion.tarea, partida, tiempo_ms, profundidad)
+        )
+
+    async def _buscar(self, sesion, tarea, partida, tiempo_ms, profundidad):
+        pos = partida.pos_blanco if partida.turno_blanco else partida.pos_negro
+        if not partida.obtener_movimientos_validos(pos):
+            await sesion.escribir("bestmove (none)")
+            return
+
+        proceso = sesion.proceso
+        resultado = None
+        try:
+            # Contrapresión: si el proceso tiene el cupo lleno, se espera
+            await proceso.cupo.acquire()
+        except asyncio.CancelledError:
+            if sesion.cerrada:
+                raise
+        else:
+            try:
+                if not sesion.parada:
+                    resultado = await self._buscar_en_pool(
+                        sesion, tarea, partida, tiempo_ms, profundidad
+                    )
+            finally:
+                proceso.cupo.release()
+                self._tareas.pop(tarea, None)
+
+        if resultado is None:
+            # En un hilo, para no frenar el event loop de las demás sesiones
+            movimiento = await asyncio.to_thread(jugada_inmediata, partida)
+        else:
+            movimiento = resultado[0]
+        await sesion.escribir(f"bestmove {nombre_casilla(movimiento)}")
+
+    async def _buscar_en_pool(self, sesion, tarea, partida, tiempo_ms, profundidad):
+        """Retorna (movimiento, valor, nodos) o None si se canceló en la cola"""
+        self._tareas[tarea] = sesion
+        futuro = sesion.proceso.executor.submit(
+            _buscar_en_proceso,
+            sesion.numero,
+            tarea,
+            sesion.opciones,
+            EstadoJuego.desde_game_logic(partida),
+            tiempo_ms,
+            profundidad,
+        )
+        sesion.futuro = futuro
+        listo = self._loop.create_future()
+
+        def terminar(_):
+            if not listo.done():
+                listo.set_result(None)
+
+        futuro.add_done_callback(
+            lambda _: self._loop.call_soon_threadsafe(terminar, None)
+        )
+        try:
+            await listo
+        except asyncio.CancelledError:
+            self.detener(sesion)
+            raise
+        if futuro.cancelled():
+            return None
+        return futuro.result()
+
+    def detener(self, sesion):
+        """
+        Pide terminar la búsqueda de la sesión: si sigue en la cola del
+        proceso se descarta, y si ya corre se le avisa por la señal del
+        proceso (que solo corre una búsqueda a la vez)
+        """
+        sesion.parada = True
+        futuro = sesion.futuro
+        if futuro is None:
+            # Todavía espera cupo
+            if sesion.busqueda is not None:
+                sesion.busqueda.cancel()
+        elif not futuro.cancel():
+            sesion.proceso.cancelada.value = sesion.tarea
+
+    async def servir_tcp(self, puerto, host="127.0.0.1"):
+        """Escucha conexiones en `host`:`puerto`; retorna el asyncio.Server"""
+
+        async def conexion(lector, escritor):
+            async def leer_linea():
+                return (await lector.readline()).decode("utf-8", "replace")
+
+            async def escribir(linea):
+                escritor.write(linea.encode("utf-8") + b"\n")
+                await escritor.drain()
+
+            try:
+                await self.atender(leer_linea, escribir)
+            except ConnectionError:
+                pass
+            finally:
+                escritor.close()
+
+        return await asyncio.start_server(conexion, host, puerto)
+
+    async def servir_stdio(self):
+        """Atiende una sesión por stdin/stdout"""
+
+        async def leer_linea():
+            return await asyncio.to_thread(sys.stdin.readline)
+
+        async def escribir(linea):
+            sys.stdout.write(linea + "\n")
+            sys.stdout.flush()
+
+        await self.atender(leer_linea, escribir)
+
+    def cerrar(self):
+        """Detiene los procesos del pool"""
+        for proceso in self.procesos:
+            proceso.executor.shutdown(wait=True, cancel_futures=True)
+        self._cola_progreso.put(None)
+        if self._hilo_progreso is not None:
+            self._hilo_progreso.join()
+
+
+class ClienteMotor:
+    """
+    Cliente TCP mínimo del servidor, para pruebas y scripts:
+
+        cliente = ClienteMotor(7878)
+        cliente.enviar("position seed 3 moves c2")
+        cliente.enviar("go movetime 200")
+        infos, linea = cliente.esperar("bestmove")
+    """
+
+    def __init__(self, puerto, host="127.0.0.1", timeout=60):
+        import socket
+
+        self._socket = socket.create_connection((host, puerto), timeout=timeout)
+        self._archivo = self._socket.makefile("rw", encoding="utf-8", newline="\n")
+
+    def enviar(self, linea):
+        self._archivo.write(linea + "\n")
+        self._archivo.flush()
+
+    def leer(self):
+        """Línea siguiente sin el salto de línea ("" si el servidor cerró)"""
+        return self._archivo.readline().rstrip("\n")
+
+    def esperar(self, prefijo):
+        """
+        Lee hasta una línea que empiece con `prefijo`. Retorna (líneas
+        anteriores, esa línea); lanza ConnectionError si el servidor cierra.
+        """
+        anteriores = []
+        while True:
+            linea = self.leer()
+            if not linea:
+                raise ConnectionError("el servidor cerró la conexión")
+            if linea.startswith(prefijo):
+                return anteriores, linea
+            anteriores.append(linea)
+
+    def cerrar(self):
+        try:
+            self.enviar("quit")
+            self._archivo.close()
+        except OSError:
+            # El servidor ya cerró (p. ej. tras "error ocupado")
+            pass
+        self._socket.close()
+
+
+async def _servir(argumentos):
+    servidor = ServidorMotor(argumentos.procesos)
+    try:
+        if argumentos.puerto is None:
+            await servidor.servir_stdio()
+            return
+        tcp = await servidor.servir_tcp(argumentos.puerto, argumentos.host)
+        direccion = tcp.sockets[0].getsockname()
+        print(f"Escuchando en {direccion[0]}:{direccion[1]}", file=sys.stderr)
+        tarea = asyncio.current_task()
+        try:
+            # Con SIGTERM también se detienen los procesos del pool
+            loop = asyncio.get_running_loop()
+            loop.add_signal_handler(signal.SIGTERM, tarea.cancel)
+        except (NotImplementedError, AttributeError):
+            pass
+        async with tcp:
+            try:
+                await tcp.serve_forever()
+            except asyncio.CancelledError:
+                pass
+    finally:
+        await asyncio.to_thread(servidor.cerrar)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local del motor")
+    parser.add_argument("--puerto", type=int, default=None, help="sin él, stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--procesos", type=int, default=None)
+    argumentos = parser.parse_args()
+    try:
+        asyncio.run(_servir(argumentos))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Tabla de transposición en disco (mmap) compartida entre partidas y procesos
+"""
+import mmap
+import os
+import struct
+import tempfile
+
+from config import MEMORIA_TRANSPOSICION_MB
+
+# Cabecera: firma, versión, cantidad de entradas y bytes por entrada, y
+# después la generación actual (compartida por los procesos que la abren)
+FIRMA = b"SHTT"
+VERSION = 2
+FORMATO_CABECERA = "<4sIQI"
+FORMATO_GENERACION = "<I"
+POSICION_GENERACION = struct.calcsize(FORMATO_CABECERA)
+TAMANO_CABECERA = 64
+
+# Entrada de 16 bytes: (clave ^ datos, datos), ambos de 64 bits.
+# Al leer se exige que (palabra0 ^ datos) sea la clave buscada, así que una
+# entrada a medio escribir por otro proceso se descarta sin usar locks.
+FORMATO_ENTRADA = "<QQ"
+BYTES_POR_ENTRADA = 16
+
+# Campos de `datos`
+BIT_OCUPADA = 1 << 63
+DESPLAZAMIENTO_PROFUNDIDAD = 32
+DESPLAZAMIENTO_TIPO = 40
+DESPLAZAMIENTO_MOVIMIENTO = 42
+DESPLAZAMIENTO_GENERACION = 52
+MASCARA_8 = 0xFF
+# Casilla + 1 (0 es sin movimiento): alcanza para tableros de hasta 32x32
+MASCARA_MOVIMIENTO = 0x3FF
+MASCARA_32 = 0xFFFFFFFF
+MASCARA_64 = (1 << 64) - 1
+
+# Los valores se guardan en punto fijo de 32 bits con esta escala (exactos
+# para múltiplos de 1/256, como los de la evaluación)
+ESCALA_VALOR = 256
+
+# Entradas que se revisan para estimar la ocupación
+MUESTRA_OCUPACION = 1000
+
+# Una entrada de las últimas búsquedas (de cualquier proceso) solo se
+# reemplaza por otra de igual o mayor profundidad. Es también cuánto puede
+# adelantarse la generación de otro proceso que escribe al mismo tiempo
+GENERACIONES_VIGENTES = 8
+
+
+def empaquetar(profundidad, valor, tipo, movimiento, generacion):
+    """Codifica una entrada en los 64 bits de `datos`"""
+    valor_fijo = round(valor * ESCALA_VALOR) & MASCARA_32
+    movimiento = 0 if movimiento is None else movimiento + 1
+    return (
+        BIT_OCUPADA
+        | (generacion & MASCARA_8) << DESPLAZAMIENTO_GENERACION
+        | (movimiento & MASCARA_MOVIMIENTO) << DESPLAZAMIENTO_MOVIMIENTO
+        | tipo << DESPLAZAMIENTO_TIPO
+        | min(profundidad, MASCARA_8) << DESPLAZAMIENTO_PROFUNDIDAD
+        | valor_fijo
+    )
+
+
+def desempaquetar(datos):
+    """Retorna (profundidad, valor, tipo, movimiento, generacion)"""
+    valor_fijo = datos & MASCARA_32
+    if valor_fijo >= 1 << 31:
+        valor_fijo -= 1 << 32
+    movimiento = datos >> DESPLAZAMIENTO_MOVIMIENTO & MASCARA_MOVIMIENTO
+    return (
+        datos >> DESPLAZAMIENTO_PROFUNDIDAD & MASCARA_8,
+        valor_fijo / ESCALA_VALOR,
+        datos >> DESPLAZAMIENTO_TIPO & 3,
+        None if movimiento == 0 else movimiento - 1,
+        datos >> DESPLAZAMIENTO_GENERACION & MASCARA_8,
+    )
+
+
+class TablaPersistente:
+    """
+    Tabla de transposición respaldada por un archivo de tamaño fijo abierto
+    con mmap. Tiene la misma interfaz que TablaTransposicion, así que
+    AIPlayer la usa igual; varios procesos pueden abrir el mismo archivo y
+    leer y escribir a la vez.
+
+    La clave es el hash Zobrist completo, que incluye los valores de las
+    casillas con puntos: posiciones de tableros distintos no se confunden y
+    el análisis de una partida sirve para las siguientes.
+
+    Si el archivo ya existe se usa con su tamaño; si no, se crea con
+    `memoria_mb`.
+
+    La generación vive en la cabecera: cada búsqueda de cualquier proceso
+    la avanza, así que la edad de una entrada significa lo mismo para todos
+    y entre ejecuciones.
+    """
+
+    def __init__(self, ruta, memoria_mb=MEMORIA_TRANSPOSICION_MB):
+        self.ruta = ruta
+        if not os.path.exists(ruta):
+            _crear_archivo(ruta, memoria_mb)
+        self._archivo = open(ruta, "r+b")
+        try:
+            tamano = self._validar()
+        except ValueError:
+            self._archivo.close()
+            raise
+
+        self.tamano = tamano
+        self.memoria_mb = tamano * BYTES_POR_ENTRADA / (1024 * 1024)
+        self._mascara = tamano - 1
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0)
+        self.generacion = self._leer_generacion()
+        self.reiniciar_estadisticas()
+
+    def _validar(self):
+        """Revisa la cabecera y el tamaño del archivo; retorna las entradas"""
+        cabecera = self._archivo.read(struct.calcsize(FORMATO_CABECERA))
+        if len(cabecera) != struct.calcsize(FORMATO_CABECERA):
+            raise ValueError(f"{self.ruta} no es una tabla de transposición válida")
+        firma, version, tamano, bytes_entrada = struct.unpack(
+            FORMATO_CABECERA, cabecera
+        )
+        if (firma, version, bytes_entrada) != (FIRMA, VERSION, BYTES_POR_ENTRADA):
+            raise ValueError(f"{self.ruta} no es una tabla de transposición válida")
+        largo = os.fstat(self._archivo.fileno()).st_size
+        esperado = TAMANO_CABECERA + tamano * BYTES_POR_ENTRADA
+        if not tamano or tamano & (tamano - 1) or largo != esperado:
+            raise ValueError(f"{self.ruta} está truncada o dañada")
+        return tamano
+
+    def cerrar(self):
+        """Escribe los cambios al disco y libera el archivo"""
+        if self._mapa is not None:
+            self._mapa.flush()
+            self._mapa.close()
+            self._archivo.close()
+            self._mapa = None
+
+    def __getstate__(self):
+        # Al enviarse a otro proceso se vuelve a abrir el mismo archivo
+        return {"ruta": self.ruta}
+
+    def __setstate__(self, estado):
+        self.__init__(estado["ruta"])
+
+    def limpiar(self):
+        """Vacía la tabla (para todos los procesos que la comparten)"""
+        bloque = bytes(BYTES_POR_ENTRADA * 4096)
+        fin = TAMANO_CABECERA + self.tamano * BYTES_POR_ENTRADA
+        for inicio in range(TAMANO_CABECERA, fin, len(bloque)):
+            cantidad = min(len(bloque), fin - inicio)
+            self._mapa[inicio : inicio + cantidad] = bloque[:cantidad]
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        """Pone en cero los contadores de consultas, aciertos y escrituras"""
+        self.consultas = 0
+        self.aciertos = 0
+        self.cortes = 0
+        self.escrituras = 0
+        self.reemplazos = 0
+        self.rechazos = 0
+
+    def _leer_generacion(self):
+        (generacion,) = struct.unpack_from(
+            FORMATO_GENERACION, self._mapa, POSICION_GENERACION
+        )
+        return generacion & MASCARA_8
+
+    def nueva_busqueda(self):
+        """
+        Inicia una búsqueda avanzando la generación de la cabecera: las
+        entradas de hace GENERACIONES_VIGENTES búsquedas pasan a ser
+        reemplazables. Dos procesos que empiezan a la vez pueden quedar con
+        la misma generación, lo que solo las hace algo más difíciles de
+        reemplazar.
+        """
+        self.generacion = (self._leer_generacion() + 1) & MASCARA_8
+        struct.pack_into(
+            FORMATO_GENERACION, self._mapa, POSICION_GENERACION, self.generacion
+        )
+
+    def _leer(self, i):
+        return struct.unpack_from(
+            FORMATO_ENTRADA, self._mapa, TAMANO_CABECERA + i * BYTES_POR_ENTRADA
+        )
+
+    def consultar(self, clave):
+        """
+        Busca la posición y retorna (profundidad, valor, tipo, movimiento),
+        o None si no está en la tabla.
+        """
+        self.consultas += 1
+        clave_mezclada, datos = self._leer(clave & self._mascara)
+        if not datos or clave_mezclada ^ datos != clave:
+            return None
+        self.aciertos += 1
+        return desempaquetar(datos)[:4]
+
+    def guardar(self, clave, profundidad, valor, tipo, movimiento=None):
+        """Guarda el resultado de buscar una posición, respetando el reemplazo"""
+        i = clave & self._mascara
+        clave_mezclada, datos = self._leer(i)
+        if datos:
+            clave_actual = clave_mezclada ^ datos
+            profundidad_actual, _, _, movimiento_actual, generacion = desempaquetar(
+                datos
+            )
+            if clave_actual != clave:
+                # Las entradas de otro proceso pueden ser de unas pocas
+                # generaciones posteriores: una diferencia "negativa" chica
+                # también es reciente. Cualquier otra edad (incluidas las que
+                # dieron la vuelta a los 8 bits) es de una búsqueda vieja
+                edad = (self.generacion - generacion) & MASCARA_8
+                vigente = (
+                    edad < GENERACIONES_VIGENTES
+                    or edad > MASCARA_8 + 1 - GENERACIONES_VIGENTES
+                )
+                if vigente and profundidad_actual > profundidad:
+                    self.rechazos += 1
+                    return
+                self.reemplazos += 1
+            elif movimiento is None:
+                movimiento = movimiento_actual
+
+        self.escrituras += 1
+        datos = empaquetar(profundidad, valor, tipo, movimiento, self.generacion)
+        struct.pack_into(
+            FORMATO_ENTRADA,
+            self._mapa,
+            TAMANO_CABECERA + i * BYTES_POR_ENTRADA,
+            (clave ^ datos) & MASCARA_64,
+            datos,
+        )
+
+    def ocupacion(self, muestra=MUESTRA_OCUPACION):
+        """Fracción estimada de entradas ocupadas (sobre las primeras `muestra`)"""
+        muestra = min(muestra, self.tamano)
+        ocupadas = sum(1 for i in range(muestra) if self._leer(i)[1])
+        return ocupadas / muestra
+
+    def tasa_aciertos(self):
+        """Fracción de consultas que encontraron la posición"""
+        return self.aciertos / self.consultas if self.consultas else 0.0
+
+    def estadisticas(self):
+        """Resumen de uso de la tabla"""
+        return {
+            "ruta": self.ruta,
+            "tamano": self.tamano,
+            "memoria_mb": self.memoria_mb,
+            "ocupacion": self.ocupacion(),
+            "consultas": self.consultas,
+            "aciertos": self.aciertos,
+            "tasa_aciertos": self.tasa_aciertos(),
+            "cortes": self.cortes,
+            "escrituras": self.escrituras,
+            "reemplazos": self.reemplazos,
+            "rechazos": self.rechazos,
+        }
+
+
+def _crear_archivo(ruta, memoria_mb):
+    """
+    Crea la tabla vacía con otro nombre y la publica en `ruta` de una vez
+    (un enlace duro no reemplaza un archivo existente): ningún proceso ve
+    una tabla a medio crear. Si otro proceso la creó antes se usa la suya.
+    """
+    entradas = max(1, int(memoria_mb * 1024 * 1024) // BYTES_POR_ENTRADA)
+    tamano = 1 << (entradas.bit_length() - 1)
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(prefix=".tt-", dir=directorio)
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            archivo.write(
+                struct.pack(FORMATO_CABECERA, FIRMA, VERSION, tamano, BYTES_POR_ENTRADA)
+            )
+            archivo.truncate(TAMANO_CABECERA + tamano * BYTES_POR_ENTRADA)
+        try:
+            os.link(temporal, ruta)
+        except FileExistsError:
+            pass
+    finally:
+        os.unlink(temporal)
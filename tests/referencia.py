@@ -0,0 +1,137 @@
+"""
+Búsquedas de referencia sobre GameLogic, sin tablas ni podas, para
+comparar con los motores
+"""
+import random
+
+from config import (
+    CASTIGO_SIN_MOVIMIENTOS,
+    PESO_MOVILIDAD,
+    generar_tablero_aleatorio,
+    valores_casillas,
+)
+from game_logic import GameLogic
+
+PENALIZACION = 4
+
+
+def copiar(partida):
+    """Copia de una GameLogic (comparte las tablas de movimientos)"""
+    copia = object.__new__(type(partida))
+    copia.__dict__.update(partida.__dict__)
+    copia.tablero = [fila[:] for fila in partida.tablero]
+    copia.casillas_bloqueadas = set(partida.casillas_bloqueadas)
+    copia.vecinos_libres = list(partida.vecinos_libres)
+    return copia
+
+
+def posiciones(semillas, jugadas=(0, 6), dimension=None, casillas=None):
+    """
+    GameLogic de prueba: el tablero de cada semilla (de `dimension` y, si se
+    da, con valores_casillas(`casillas`)) tras cada cantidad de `jugadas` al
+    azar (las que no terminan antes)
+    """
+    valores = None if casillas is None else valores_casillas(casillas)
+    resultado = []
+    for semilla in semillas:
+        for cantidad in jugadas:
+            generador = random.Random(semilla)
+            tablero = generar_tablero_aleatorio(semilla, dimension, valores)
+            partida = GameLogic(*tablero)
+            for _ in range(cantidad):
+                partida.pasar_turno()
+                opciones = movimientos(partida)
+                if not opciones:
+                    break
+                partida.mover_caballo(generador.choice(opciones))
+            else:
+                partida.pasar_turno()
+                if movimientos(partida):
+                    resultado.append(partida)
+    return resultado
+
+
+def movimientos(partida):
+    pos = partida.pos_blanco if partida.turno_blanco else partida.pos_negro
+    return partida.obtener_movimientos_validos(pos)
+
+
+def mejor_valor(partida, valores):
+    """Mejor de `valores` para el bando en turno"""
+    return max(valores) if partida.turno_blanco else min(valores)
+
+
+def jugar(partida, movimiento):
+    """Copia de `partida` tras `movimiento` y los puntos que captura"""
+    hija = copiar(partida)
+    puntos = hija.tablero[movimiento[0]][movimiento[1]]
+    hija.mover_caballo(movimiento)
+    return hija, puntos
+
+
+def minimax(
+    partida,
+    profundidad,
+    diferencia=None,
+    peso_movilidad=PESO_MOVILIDAD,
+    castigo_sin_movimientos=CASTIGO_SIN_MOVIMIENTOS,
+):
+    """
+    Minimax completo con la evaluación de AIPlayer: diferencia de puntos
+    capturados (sin las penalizaciones por bloqueo que suma GameLogic) más
+    la movilidad, y el castigo al bando en turno sin movimientos
+    """
+    if diferencia is None:
+        diferencia = partida.puntos_blanco - partida.puntos_negro
+    if profundidad == 0:
+        movilidad = partida.contar_movimientos_validos(partida.pos_blanco)
+        movilidad -= partida.contar_movimientos_validos(partida.pos_negro)
+        return diferencia + peso_movilidad * movilidad
+    hijos = movimientos(partida)
+    if not hijos:
+        if partida.turno_blanco:
+            return diferencia - castigo_sin_movimientos
+        return diferencia + PENALIZACION + castigo_sin_movimientos
+    valores = []
+    for movimiento in hijos:
+        hija, puntos = jugar(partida, movimiento)
+        signo = 1 if partida.turno_blanco else -1
+        valores.append(
+            minimax(
+                hija,
+                profundidad - 1,
+                diferencia + signo * puntos,
+                peso_movilidad,
+                castigo_sin_movimientos,
+            )
+        )
+    return mejor_valor(partida, valores)
+
+
+def valores_minimax(partida, profundidad, **pesos):
+    """Valor de minimax de cada jugada del bando en turno"""
+    diferencia = partida.puntos_blanco - partida.puntos_negro
+    signo = 1 if partida.turno_blanco else -1
+    valores = {}
+    for movimiento in movimientos(partida):
+        hija, puntos = jugar(partida, movimiento)
+        valores[movimiento] = minimax(
+            hija, profundidad - 1, diferencia + signo * puntos, **pesos
+        )
+    return valores
+
+
+def fuerza_bruta(partida):
+    """Diferencia final de marcador con juego perfecto"""
+    if partida.verificar_fin_juego():
+        return partida.puntos_blanco - partida.puntos_negro
+    partida = copiar(partida)
+    partida.pasar_turno()
+    return mejor_valor(
+        partida, [fuerza_bruta(jugar(partida, mov)[0]) for mov in movimientos(partida)]
+    )
+
+
+def valores_finales(partida):
+    """Valor con juego perfecto de cada jugada del bando en turno"""
+    return {mov: fuerza_bruta(jugar(partida, mov)[0]) for mov in movimientos(partida)}
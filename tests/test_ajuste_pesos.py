@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+import ajuste_pesos
+from registro_partidas import RegistroPartida, escribir_partidas, reproducir
+
+
+def partida_completa(semilla):
+    """Registro de una partida al azar jugada hasta el final"""
+    registro = RegistroPartida.desde_semilla(semilla)
+    generador = random.Random(semilla)
+    for partida in reproducir(registro):
+        if partida.verificar_fin_juego():
+            return registro
+        partida.pasar_turno()
+        pos = partida.pos_blanco if partida.turno_blanco else partida.pos_negro
+        registro.agregar(generador.choice(partida.obtener_movimientos_validos(pos)))
+
+
+@pytest.mark.parametrize("procesos", [None, 1, 2])
+def test_extraer_en_orden(tmp_path, monkeypatch, procesos):
+    # Lotes chicos para que haya varios en vuelo por proceso
+    monkeypatch.setattr(ajuste_pesos, "PARTIDAS_POR_LOTE", 3)
+    registros = [partida_completa(semilla) for semilla in range(20)]
+    ruta = tmp_path / "partidas.shr"
+    escribir_partidas(ruta, registros)
+    esperado = [ajuste_pesos.caracteristicas_partida(r) for r in registros]
+    assert ajuste_pesos.extraer(ruta, procesos) == esperado
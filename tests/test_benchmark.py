@@ -0,0 +1,64 @@
+"""
+Banco de pruebas: posiciones reproducibles y comparación con la base
+"""
+import copy
+
+import pytest
+
+import benchmark
+
+
+@pytest.fixture
+def resultado(monkeypatch):
+    # Una sola búsqueda por medición: solo interesan nodos y jugadas
+    monkeypatch.setattr(benchmark, "TIEMPO_MINIMO_MEDICION_MS", 1e-9)
+    return benchmark.correr(niveles=["Principiante"])
+
+
+def test_posiciones_reproducibles():
+    primeras = benchmark.generar_posiciones(3)
+    segundas = benchmark.generar_posiciones(3)
+    assert [nombre for nombre, _ in primeras] == [nombre for nombre, _ in segundas]
+    for (_, a), (_, b) in zip(primeras, segundas):
+        assert a.tablero == b.tablero
+        assert (a.pos_blanco, a.pos_negro) == (b.pos_blanco, b.pos_negro)
+        assert not a.verificar_fin_juego()
+
+
+def test_mismos_nodos_y_jugadas(resultado, monkeypatch):
+    monkeypatch.setattr(benchmark, "TIEMPO_MINIMO_MEDICION_MS", 1e-9)
+    otro = benchmark.correr(niveles=["Principiante"])
+    claves = ("posicion", "nivel", "movimiento", "valor", "nodos")
+    for a, b in zip(resultado["resultados"], otro["resultados"]):
+        assert [a[clave] for clave in claves] == [b[clave] for clave in claves]
+    assert resultado["totales"]["nodos"] == otro["totales"]["nodos"]
+
+
+def test_solo_busqueda_a_la_profundidad_del_nivel(resultado):
+    assert resultado["opciones"]["casillas_final_exacto"] is None
+    assert {r["origen"] for r in resultado["resultados"]} == {"busqueda"}
+
+
+def test_comparar(resultado):
+    assert benchmark.comparar(resultado, resultado) == ([], [])
+
+    base = copy.deepcopy(resultado)
+    base["resultados"][0]["tiempo_ms"] = 10.0
+    base["totales"] = benchmark.totalizar(base["resultados"])
+    nuevo = copy.deepcopy(base)
+    primero = nuevo["resultados"][0]
+    primero["movimiento"] = [-1, -1]
+    primero["nodos"] += 1
+    primero["tiempo_ms"] = 20.0
+    nuevo["totales"] = benchmark.totalizar(nuevo["resultados"])
+    nombre = f"{primero['posicion']} {primero['nivel']}"
+    jugada = f"{nombre}: jugada {base['resultados'][0]['movimiento']} -> [-1, -1]"
+
+    regresiones, avisos = benchmark.comparar(base, nuevo, tolerancia=0.10)
+    assert jugada in regresiones
+    assert f"{nombre}: 10.0 ms -> 20.0 ms" in regresiones
+    assert avisos == [f"{nombre}: {primero['nodos'] - 1} -> {primero['nodos']} nodos"]
+
+    # Dentro de la tolerancia solo queda el cambio de jugada
+    regresiones, _ = benchmark.comparar(base, nuevo, tolerancia=1e9)
+    assert regresiones == [jugada]
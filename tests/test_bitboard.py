@@ -0,0 +1,77 @@
+"""
+Bitboards contra el cálculo directo sobre (fila, col)
+"""
+import random
+
+import pytest
+
+from bitboard import (
+    casillas_alcanzables,
+    contar_bits,
+    indice,
+    indices_de_mascara,
+    mascara_de_casillas,
+    mascara_de_puntos,
+    posicion,
+    tablas_caballo,
+)
+from config import MOVIMIENTOS_CABALLO, generar_tablero_aleatorio
+
+DIMENSIONES = [6, 8, 10, 16]
+
+
+def saltos(pos, dimension):
+    fila, col = pos
+    return [
+        (fila + df, col + dc)
+        for df, dc in MOVIMIENTOS_CABALLO
+        if 0 <= fila + df < dimension and 0 <= col + dc < dimension
+    ]
+
+
+@pytest.mark.parametrize("dimension", DIMENSIONES)
+def test_tablas_caballo(dimension):
+    destinos, mascaras = tablas_caballo(dimension)
+    assert len(destinos) == len(mascaras) == dimension * dimension
+    for casilla in range(dimension * dimension):
+        pos = posicion(casilla, dimension)
+        assert indice(pos, dimension) == casilla
+        esperados = [indice(p, dimension) for p in saltos(pos, dimension)]
+        assert list(destinos[casilla]) == esperados
+        assert list(indices_de_mascara(mascaras[casilla])) == sorted(esperados)
+        assert contar_bits(mascaras[casilla]) == len(esperados)
+
+
+@pytest.mark.parametrize("dimension", DIMENSIONES)
+def test_casillas_alcanzables(dimension):
+    generador = random.Random(dimension)
+    _, mascaras = tablas_caballo(dimension)
+    todas = [(fila, col) for fila in range(dimension) for col in range(dimension)]
+    for _ in range(20):
+        libres = set(generador.sample(todas, len(todas) // 2))
+        origen = generador.choice(todas)
+        # Recorrido en anchura sobre (fila, col)
+        vistas = set()
+        frontera = [origen]
+        while frontera:
+            frontera = [
+                p for q in frontera for p in saltos(q, dimension) if p in libres
+            ]
+            frontera = [p for p in dict.fromkeys(frontera) if p not in vistas]
+            vistas.update(frontera)
+        resultado = casillas_alcanzables(
+            indice(origen, dimension), mascara_de_casillas(libres, dimension), mascaras
+        )
+        assert resultado == mascara_de_casillas(vistas, dimension)
+
+
+def test_mascara_de_puntos():
+    for dimension in DIMENSIONES:
+        tablero, _, _ = generar_tablero_aleatorio(0, dimension)
+        con_puntos = [
+            (fila, col)
+            for fila in range(dimension)
+            for col in range(dimension)
+            if tablero[fila][col]
+        ]
+        assert mascara_de_puntos(tablero) == mascara_de_casillas(con_puntos, dimension)
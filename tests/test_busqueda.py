@@ -0,0 +1,124 @@
+"""
+Búsqueda con hacer/deshacer contra minimax completo sobre GameLogic
+"""
+import random
+
+import pytest
+
+from ai_player import AIPlayer
+from bitboard import posicion
+from estado_busqueda import EstadoBusqueda
+from referencia import copiar, mejor_valor, minimax, posiciones, valores_minimax
+
+PROFUNDIDAD = 4
+
+# Búsqueda sin nada más que alfa-beta
+BASE = {
+    "usar_transposicion": False,
+    "ordenar_movimientos": False,
+    "evaluacion_lotes": False,
+    "casillas_final_exacto": None,
+}
+
+# Configuraciones de AIPlayer que deben dar el mismo valor que minimax
+CONFIGURACIONES = {
+    "alfabeta": {},
+    "transposicion": {"usar_transposicion": True},
+    "ordenamiento": {"ordenar_movimientos": True},
+    "transposicion_y_ordenamiento": {
+        "usar_transposicion": True,
+        "ordenar_movimientos": True,
+    },
+    "lotes": {"evaluacion_lotes": True},
+    "pvs": {"usar_pvs": True},
+    # Profundización iterativa hasta PROFUNDIDAD, con ventanas de aspiración
+    "pvs_aspiracion": {
+        "usar_pvs": True,
+        "limite_nodos": float("inf"),
+        "usar_transposicion": True,
+        "ordenar_movimientos": True,
+    },
+    # Con pesos que no son múltiplos de VENTANA_NULA hay que volver a buscar
+    "pvs_otros_pesos": {
+        "usar_pvs": True,
+        "peso_movilidad": 0.37,
+        "castigo_sin_movimientos": 61.3,
+    },
+}
+
+# Argumentos de AIPlayer que cambian la evaluación (también para minimax)
+PESOS = ("peso_movilidad", "castigo_sin_movimientos")
+
+
+@pytest.mark.parametrize("nombre", list(CONFIGURACIONES))
+def test_mismo_valor_que_minimax(nombre):
+    # Un mismo jugador para todas las posiciones: la tabla y la historia
+    # se conservan entre búsquedas, como en una partida
+    configuracion = CONFIGURACIONES[nombre]
+    pesos = {clave: configuracion[clave] for clave in PESOS if clave in configuracion}
+    jugador = AIPlayer(PROFUNDIDAD, **dict(BASE, **configuracion))
+    for partida in posiciones(range(6)):
+        movimiento = jugador.obtener_mejor_movimiento(partida)
+        valores = valores_minimax(partida, PROFUNDIDAD, **pesos)
+        mejor = mejor_valor(partida, valores.values())
+        assert jugador.ultimo_valor == pytest.approx(mejor)
+        assert mejor == minimax(partida, PROFUNDIDAD, **pesos)
+        assert valores[movimiento] == pytest.approx(mejor)
+    jugador.cerrar()
+
+
+@pytest.mark.parametrize("dimension, casillas", [(6, 10), (10, 16), (16, 40)])
+@pytest.mark.parametrize("nombre", ["alfabeta", "transposicion_y_ordenamiento", "pvs"])
+def test_otros_tableros(nombre, dimension, casillas):
+    jugador = AIPlayer(3, **dict(BASE, **CONFIGURACIONES[nombre]))
+    for partida in posiciones(range(3), (0, 8), dimension, casillas):
+        movimiento = jugador.obtener_mejor_movimiento(partida)
+        valores = valores_minimax(partida, 3)
+        mejor = mejor_valor(partida, valores.values())
+        assert jugador.ultimo_valor == pytest.approx(mejor)
+        assert valores[movimiento] == pytest.approx(mejor)
+    jugador.cerrar()
+
+
+def campos(estado):
+    """Todo lo que hacer/deshacer modifica en el estado"""
+    return (
+        estado.bloqueadas,
+        list(estado.posiciones),
+        list(estado.puntos),
+        list(estado.penalizaciones),
+        list(estado.sin_movimientos),
+        estado.lado,
+        estado.clave,
+        estado.ply,
+    )
+
+
+def test_deshacer_restaura_el_estado():
+    """
+    Una partida al azar con hacer_movimiento/pasar sigue a GameLogic, y
+    deshacer todo vuelve exactamente al estado inicial
+    """
+    generador = random.Random(0)
+    for partida in posiciones(range(4)):
+        estado = EstadoBusqueda.desde_game_logic(partida)
+        partida = copiar(partida)
+        inicial = campos(estado)
+        hechos = 0
+        while not estado.juego_terminado():
+            movimientos = estado.movimientos()
+            if movimientos:
+                movimiento = generador.choice(movimientos)
+                estado.hacer_movimiento(movimiento)
+                partida.pasar_turno()
+                assert partida.mover_caballo(posicion(movimiento, estado.dimension))
+            else:
+                estado.pasar()
+            hechos += 1
+            assert estado.clave == estado.calcular_clave()
+            assert estado.diferencia_real() == (
+                partida.puntos_blanco - partida.puntos_negro
+            )
+        for _ in range(hechos):
+            estado.deshacer_movimiento()
+        assert campos(estado) == inicial
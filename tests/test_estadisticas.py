@@ -0,0 +1,72 @@
+"""
+Estadísticas de cada búsqueda de AIPlayer
+"""
+import json
+
+import pytest
+
+from ai_player import AIPlayer
+from estadisticas import EstadisticasBusqueda
+from referencia import jugar, movimientos, posiciones
+
+OPCIONES = {"casillas_final_exacto": None, "usar_transposicion": False}
+
+
+def test_busqueda_fija():
+    jugador = AIPlayer(4, **OPCIONES)
+    for partida in posiciones(range(3)):
+        movimiento = jugador.obtener_mejor_movimiento(partida)
+        estadisticas = jugador.estadisticas
+        assert estadisticas.origen == "busqueda"
+        assert estadisticas.movimiento == movimiento
+        assert estadisticas.valor == jugador.ultimo_valor
+        assert estadisticas.nodos == jugador.nodos > 0
+        assert 0 < estadisticas.hojas <= estadisticas.nodos
+        assert estadisticas.profundidad == 4
+        assert estadisticas.profundidad_maxima >= 4
+        # La variante principal es una secuencia de jugadas válidas
+        variante = estadisticas.variante_principal
+        assert variante[0] == movimiento
+        actual = partida
+        for jugada in variante:
+            actual.pasar_turno()
+            assert jugada in movimientos(actual)
+            actual, _ = jugar(actual, jugada)
+        datos = json.loads(json.dumps(estadisticas.como_dict()))
+        assert datos["nodos"] == estadisticas.nodos
+        assert datos["movimiento"] == list(movimiento)
+        assert estadisticas.resumen().startswith("busqueda: prof 4")
+
+
+def test_iteraciones_de_la_profundizacion():
+    jugador = AIPlayer(5, limite_nodos=float("inf"), **OPCIONES)
+    for partida in posiciones(range(3)):
+        jugador.obtener_mejor_movimiento(partida)
+        estadisticas = jugador.estadisticas
+        assert estadisticas.origen == "profundizacion"
+        iteraciones = estadisticas.iteraciones
+        profundidades = [iteracion["profundidad"] for iteracion in iteraciones]
+        assert profundidades == list(range(1, estadisticas.profundidad + 1))
+        nodos = [iteracion["nodos"] for iteracion in iteraciones]
+        assert nodos == sorted(nodos) and nodos[-1] <= estadisticas.nodos
+        assert estadisticas.factor_ramificacion() > 0
+
+
+def test_contadores_de_la_tabla_por_busqueda():
+    jugador = AIPlayer(4, casillas_final_exacto=None, ruta_tt=None)
+    (partida,) = posiciones([0], jugadas=(0,))
+    jugador.obtener_mejor_movimiento(partida)
+    primera = jugador.estadisticas
+    assert 0 <= primera.cortes_tt <= primera.aciertos_tt <= primera.consultas_tt
+    # La segunda búsqueda cuenta solo lo suyo y aprovecha la tabla
+    jugador.obtener_mejor_movimiento(partida)
+    segunda = jugador.estadisticas
+    assert segunda.consultas_tt <= primera.consultas_tt
+    assert segunda.tasa_aciertos_tt() > primera.tasa_aciertos_tt()
+    assert segunda.nodos < primera.nodos
+    jugador.cerrar()
+
+
+@pytest.mark.parametrize("campo", ["nodos_por_segundo", "tasa_aciertos_tt"])
+def test_sin_datos(campo):
+    assert getattr(EstadisticasBusqueda(), campo)() == 0.0
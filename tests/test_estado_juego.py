@@ -0,0 +1,101 @@
+import pickle
+import random
+
+import pytest
+
+from bitboard import indice
+from config import generar_tablero_aleatorio, valores_casillas
+from estado_busqueda import EstadoBusqueda
+from estado_juego import EstadoJuego
+from game_logic import GameLogic
+
+TABLEROS = [(6, 10), (8, None), (10, 16), (16, 40)]
+
+
+def recorrido(semilla, dimension, casillas):
+    """
+    Partida al azar jugada hasta el final a la vez con GameLogic y con
+    EstadoJuego.hijo()/pasar(): lista de (estado, foto de la GameLogic,
+    clave de EstadoBusqueda) tras cada jugada
+    """
+    valores = None if casillas is None else valores_casillas(casillas)
+    partida = GameLogic(*generar_tablero_aleatorio(semilla, dimension, valores))
+    estado = EstadoJuego.desde_game_logic(partida)
+    generador = random.Random(semilla)
+    pasos = []
+    while True:
+        pasos.append(
+            (
+                estado,
+                EstadoJuego.desde_game_logic(partida),
+                EstadoBusqueda.desde_game_logic(partida).clave,
+            )
+        )
+        if partida.verificar_fin_juego():
+            assert estado.terminado()
+            assert estado.sucesores() == []
+            return pasos
+        if partida.pasar_turno():
+            ((destino, estado),) = estado.sucesores()
+            assert destino is None
+        pos = partida.pos_blanco if partida.turno_blanco else partida.pos_negro
+        opciones = partida.obtener_movimientos_validos(pos)
+        assert sorted(estado.movimientos()) == sorted(
+            indice(mov, partida.dimension) for mov in opciones
+        )
+        movimiento = generador.choice(opciones)
+        partida.mover_caballo(movimiento)
+        estado = estado.hijo(indice(movimiento, partida.dimension))
+
+
+def estados(dimension, casillas, semillas=range(4)):
+    return [
+        paso[0]
+        for semilla in semillas
+        for paso in recorrido(semilla, dimension, casillas)
+    ]
+
+
+@pytest.mark.parametrize("dimension, casillas", TABLEROS)
+def test_hijo_sigue_a_game_logic(dimension, casillas):
+    for semilla in range(4):
+        for estado, foto, clave in recorrido(semilla, dimension, casillas):
+            assert estado == foto
+            assert estado.clave == foto.clave == clave
+            assert hash(estado) == hash(foto)
+
+
+@pytest.mark.parametrize("dimension, casillas", TABLEROS)
+def test_conversiones_ida_y_vuelta(dimension, casillas):
+    for estado in estados(dimension, casillas):
+        assert EstadoJuego.desde_game_logic(estado.a_game_logic()) == estado
+        busqueda = estado.a_busqueda()
+        assert busqueda.clave == estado.clave
+        assert EstadoJuego.desde_busqueda(busqueda) == estado
+
+
+def test_pickle_ida_y_vuelta():
+    for estado in estados(8, None):
+        copia = pickle.loads(pickle.dumps(estado))
+        assert copia == estado
+        assert copia.clave == estado.clave
+        assert copia.movimientos() == estado.movimientos()
+
+
+def test_claves_de_dict_y_set():
+    todos = estados(6, 10)
+    fotos = {estado: numero for numero, estado in enumerate(todos)}
+    for estado in todos:
+        copia = EstadoJuego.desde_game_logic(estado.a_game_logic())
+        assert copia in fotos
+    assert len(set(todos)) == len(fotos)
+
+
+def test_inmutable():
+    estado = EstadoJuego.desde_game_logic(GameLogic(*generar_tablero_aleatorio(0)))
+    with pytest.raises(AttributeError):
+        estado.blanco = 0
+    with pytest.raises(AttributeError):
+        estado.nuevo = 0
+    with pytest.raises(AttributeError):
+        del estado.clave
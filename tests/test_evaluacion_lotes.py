@@ -0,0 +1,55 @@
+"""
+Evaluación por lotes contra la evaluación de hoja de minimax
+"""
+import random
+
+import pytest
+
+from estado_busqueda import EstadoBusqueda
+from evaluacion_lotes import evaluar_hijos, medir_evaluacion
+from referencia import posiciones
+
+PESO = 0.5
+
+
+def hojas(estado):
+    """Valor de hoja de cada hijo de `estado`, haciendo cada movimiento"""
+    resultado = []
+    for movimiento in estado.movimientos():
+        estado.hacer_movimiento(movimiento)
+        resultado.append(estado.diferencia() + estado.diferencia_movilidad() * PESO)
+        estado.deshacer_movimiento()
+    return resultado
+
+
+# (dimension, casillas): los de más de 8 casillas de lado usan bitboards de
+# más de 64 bits
+TABLEROS = [(8, None), (6, 10), (10, 16), (16, 40)]
+
+
+def estados(semillas, dimension=None, casillas=None):
+    """EstadoBusqueda de prueba, con el blanco y con el negro en turno"""
+    generador = random.Random(0)
+    resultado = []
+    for partida in posiciones(semillas, (0, 4, 10), dimension, casillas):
+        estado = EstadoBusqueda.desde_game_logic(partida)
+        resultado.append(estado)
+        movimientos = estado.movimientos()
+        if movimientos:
+            hijo = EstadoBusqueda.desde_game_logic(partida)
+            hijo.hacer_movimiento(generador.choice(movimientos))
+            resultado.append(hijo)
+    return resultado
+
+
+@pytest.mark.parametrize("dimension, casillas", TABLEROS)
+def test_evaluar_hijos_como_minimax(dimension, casillas):
+    for estado in estados(range(6), dimension, casillas):
+        esperados = hojas(estado)
+        assert list(evaluar_hijos(estado, estado.movimientos(), PESO)) == esperados
+
+
+def test_medir_evaluacion():
+    medicion = medir_evaluacion(estados(range(2)), repeticiones=1)
+    assert medicion["hojas"] > 0
+    assert medicion["por_nodo"] > 0 and medicion["evaluar_hijos"] > 0
@@ -0,0 +1,105 @@
+"""
+Solucionador exacto de finales contra fuerza bruta sobre GameLogic
+"""
+import random
+
+import pytest
+
+from ai_player import AIPlayer
+from bitboard import contar_bits, posicion
+from config import generar_tablero_aleatorio
+from estado_busqueda import EstadoBusqueda
+from finales import SolucionadorFinales, casillas_libres_alcanzables, separados
+from game_logic import GameLogic
+from referencia import fuerza_bruta, mejor_valor, valores_finales
+
+
+def final_aleatorio(
+    semilla, maximo_casillas, rival_bloqueado=False, caballos_separados=False
+):
+    """
+    Juega al azar desde el tablero de `semilla` hasta un final con a lo
+    sumo `maximo_casillas` casillas libres alcanzables en el que el bando en
+    turno puede mover (y, si se pide, el rival ya no, o los caballos ya no
+    comparten casillas alcanzables). None si no llega.
+    """
+    generador = random.Random(semilla)
+    partida = GameLogic(*generar_tablero_aleatorio(semilla))
+    while not partida.verificar_fin_juego():
+        partida.pasar_turno()
+        pos = partida.pos_blanco if partida.turno_blanco else partida.pos_negro
+        movimientos = partida.obtener_movimientos_validos(pos)
+        estado = EstadoBusqueda.desde_game_logic(partida)
+        if partida.turno_blanco:
+            rival = partida.negro_sin_movimientos
+        else:
+            rival = partida.blanco_sin_movimientos
+        if (
+            movimientos
+            and contar_bits(casillas_libres_alcanzables(estado)) <= maximo_casillas
+            and rival == rival_bloqueado
+            and (not caballos_separados or separados(estado))
+        ):
+            return partida
+        partida.mover_caballo(generador.choice(movimientos))
+    return None
+
+
+def finales(maximo_casillas, rival_bloqueado=False, cantidad=6, **condiciones):
+    """Los primeros `cantidad` finales de final_aleatorio desde la semilla 0"""
+    encontrados = []
+    semilla = 0
+    while len(encontrados) < cantidad and semilla < 500:
+        partida = final_aleatorio(
+            semilla, maximo_casillas, rival_bloqueado, **condiciones
+        )
+        if partida is not None:
+            encontrados.append(partida)
+        semilla += 1
+    assert len(encontrados) == cantidad
+    return encontrados
+
+
+@pytest.mark.parametrize(
+    "maximo_casillas, rival_bloqueado", [(9, False), (12, False), (9, True)]
+)
+def test_valor_y_jugada_como_fuerza_bruta(maximo_casillas, rival_bloqueado):
+    for partida in finales(maximo_casillas, rival_bloqueado):
+        estado = EstadoBusqueda.desde_game_logic(partida)
+        valor, movimiento = SolucionadorFinales().resolver(estado)
+        valores = valores_finales(partida)
+        mejor = mejor_valor(partida, valores.values())
+        assert valor == mejor
+        assert movimiento is not None
+        assert valores[posicion(movimiento, partida.dimension)] == mejor
+
+
+@pytest.mark.parametrize("maximo_casillas", [12, 16])
+def test_caballos_separados_como_fuerza_bruta(maximo_casillas):
+    for partida in finales(maximo_casillas, caballos_separados=True):
+        estado = EstadoBusqueda.desde_game_logic(partida)
+        assert estado.movilidad(0) and estado.movilidad(1)
+        valor, movimiento = SolucionadorFinales().resolver(estado)
+        valores = valores_finales(partida)
+        mejor = mejor_valor(partida, valores.values())
+        assert valor == mejor
+        assert valores[posicion(movimiento, partida.dimension)] == mejor
+
+
+def test_ai_player_juega_la_mejor_jugada_del_final():
+    for partida in finales(9, rival_bloqueado=True):
+        jugador = AIPlayer(4, usar_transposicion=False)
+        movimiento = jugador.obtener_mejor_movimiento(partida)
+        valores = valores_finales(partida)
+        mejor = mejor_valor(partida, valores.values())
+        assert jugador.estadisticas.origen == "finales"
+        assert valores[movimiento] == mejor
+
+
+def test_memoria_entre_llamadas():
+    solucionador = SolucionadorFinales()
+    for partida in finales(9):
+        estado = EstadoBusqueda.desde_game_logic(partida)
+        assert solucionador.resolver(estado)[0] == fuerza_bruta(partida)
+        # La segunda vez sale de la memoria con el mismo valor
+        assert solucionador.resolver(estado)[0] == fuerza_bruta(partida)
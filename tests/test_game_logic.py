@@ -0,0 +1,29 @@
+"""
+Conteo incremental de vecinos libres de GameLogic contra recalcularlo
+"""
+import random
+
+import pytest
+
+from bitboard import contar_bits
+from referencia import movimientos, posiciones
+
+
+@pytest.mark.parametrize("dimension, casillas", [(6, 10), (8, None), (16, 40)])
+def test_movilidad_incremental(dimension, casillas):
+    for semilla, partida in enumerate(posiciones(range(4), (0,), dimension, casillas)):
+        generador = random.Random(semilla)
+        while not partida.verificar_fin_juego():
+            libres = [
+                contar_bits(mascara & ~partida.mascara_bloqueadas)
+                for mascara in partida.mascaras_caballo
+            ]
+            assert partida.vecinos_libres == libres
+            for fila in range(partida.dimension):
+                for col in range(partida.dimension):
+                    pos = (fila, col)
+                    assert partida.contar_movimientos_validos(pos) == len(
+                        partida.obtener_movimientos_validos(pos)
+                    )
+            partida.pasar_turno()
+            partida.mover_caballo(generador.choice(movimientos(partida)))
@@ -0,0 +1,70 @@
+"""
+Dibujo incremental del tablero (necesita una pantalla para Tk)
+"""
+import random
+
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from gui import SmartHorsesGUI  # noqa: E402
+from referencia import movimientos  # noqa: E402
+
+
+@pytest.fixture
+def gui():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("sin pantalla para Tk")
+    interfaz = SmartHorsesGUI(root)
+    yield interfaz
+    interfaz.cerrar()
+
+
+def comprobar_dibujo(gui):
+    """El canvas muestra la partida como si se dibujara desde cero"""
+    partida = gui.game_logic
+    canvas = gui.canvas
+    resaltados = set(gui.movimientos_resaltados)
+    for (fila, col), rect in gui.casillas_canvas.items():
+        bloqueada = (fila, col) in partida.casillas_bloqueadas
+        color = gui.color_casilla(fila, col, bloqueada, (fila, col) in resaltados)
+        assert canvas.itemcget(rect, "fill") == color
+        estado = "normal" if bloqueada else "hidden"
+        for linea in gui.cruces_canvas[(fila, col)]:
+            assert canvas.itemcget(linea, "state") == estado
+        texto = gui.textos_canvas.get((fila, col))
+        if texto is not None and bloqueada:
+            assert canvas.itemcget(texto, "state") == "hidden"
+    celda = gui.tamano_celda
+    for etiqueta, (fila, col) in (
+        ("caballo_blanco", partida.pos_blanco),
+        ("caballo_negro", partida.pos_negro),
+    ):
+        x, y = canvas.coords(etiqueta)
+        assert x == col * celda + celda // 2
+        assert y == fila * celda + celda // 2 + celda // 14
+
+
+@pytest.mark.parametrize("dimension, casillas", [(8, 10), (12, 20)])
+def test_redibujo_incremental(gui, dimension, casillas):
+    gui.nivel_var.set("Principiante")
+    gui.dimension_var.set(dimension)
+    gui.casillas_var.set(casillas)
+    gui.iniciar_juego()
+    items = len(gui.canvas.find_all())
+    generador = random.Random(dimension)
+    partida = gui.game_logic
+    while not partida.verificar_fin_juego():
+        partida.pasar_turno()
+        opciones = movimientos(partida)
+        gui.movimientos_resaltados = generador.sample(opciones, len(opciones) // 2)
+        gui.redibujar_tablero()
+        comprobar_dibujo(gui)
+        partida.mover_caballo(generador.choice(opciones))
+        gui.movimientos_resaltados = []
+        gui.redibujar_tablero()
+        comprobar_dibujo(gui)
+        # Se actualizan los mismos elementos, no se crean nuevos
+        assert len(gui.canvas.find_all()) == items
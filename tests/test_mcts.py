@@ -0,0 +1,67 @@
+"""
+Motor MCTS: jugadas válidas, árbol consistente y reutilización entre jugadas
+"""
+from mcts import JugadorMCTS
+from referencia import jugar, movimientos, posiciones
+
+PLAYOUTS = 300
+
+
+def nodos(raiz):
+    pendientes = [raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        yield nodo
+        pendientes.extend(nodo.hijos)
+
+
+def test_arbol_consistente():
+    for partida in posiciones(range(4)):
+        jugador = JugadorMCTS(playouts=PLAYOUTS, semilla=0)
+        movimiento = jugador.obtener_mejor_movimiento(partida)
+        assert movimiento in movimientos(partida)
+        assert jugador.simulaciones == PLAYOUTS
+        assert jugador.estadisticas.simulaciones_reutilizadas == 0
+        assert jugador.estadisticas.movimiento == movimiento
+        # La raíz queda en el subárbol elegido, el más visitado
+        elegido = jugador.raiz
+        assert elegido.visitas * len(movimientos(partida)) >= PLAYOUTS
+        for nodo in nodos(elegido):
+            assert 0 <= nodo.victorias <= nodo.visitas
+            if nodo.hijos:
+                # Cada visita, salvo la que lo creó, bajó a un hijo
+                assert sum(hijo.visitas for hijo in nodo.hijos) == nodo.visitas - 1
+
+
+def test_misma_semilla_misma_jugada():
+    for partida in posiciones(range(4)):
+        jugadas = {
+            JugadorMCTS(playouts=PLAYOUTS, semilla=7).obtener_mejor_movimiento(partida)
+            for _ in range(2)
+        }
+        assert len(jugadas) == 1
+
+
+def test_reutiliza_el_subarbol():
+    for partida in posiciones(range(4), jugadas=(0,)):
+        jugador = JugadorMCTS(playouts=PLAYOUTS, semilla=0)
+        partida, _ = jugar(partida, jugador.obtener_mejor_movimiento(partida))
+        partida.pasar_turno()
+        opciones = movimientos(partida)
+        if not opciones:
+            continue
+        partida, _ = jugar(partida, opciones[0])
+        partida.pasar_turno()
+        if not movimientos(partida):
+            continue
+        jugador.obtener_mejor_movimiento(partida)
+        assert jugador.estadisticas.simulaciones_reutilizadas > 0
+
+
+def test_sin_movimientos():
+    for partida in posiciones(range(4)):
+        bloqueada = partida
+        while movimientos(bloqueada):
+            bloqueada, _ = jugar(bloqueada, movimientos(bloqueada)[0])
+            bloqueada.pasar_turno()
+        assert JugadorMCTS(playouts=10).obtener_mejor_movimiento(bloqueada) is None
@@ -0,0 +1,77 @@
+"""
+Interfaz asyncio del motor
+"""
+import asyncio
+
+import pytest
+
+from ai_player import AIPlayer
+from motor_async import MotorAsincrono
+from referencia import posiciones
+
+OPCIONES = {"profundidad": 4, "casillas_final_exacto": None}
+
+
+@pytest.mark.parametrize("paralelismo", [{"hilos": 2}, {"procesos": 2}], ids=str)
+def test_analizar_como_el_jugador(paralelismo):
+    async def analizar_todas(partidas):
+        async with MotorAsincrono(OPCIONES, **paralelismo) as motor:
+            return await asyncio.gather(
+                *(motor.analizar(partida) for partida in partidas)
+            )
+
+    partidas = posiciones(range(3))
+    resultados = asyncio.run(analizar_todas(partidas))
+    for partida, estadisticas in zip(partidas, resultados):
+        jugador = AIPlayer(**OPCIONES)
+        assert estadisticas.movimiento == jugador.obtener_mejor_movimiento(partida)
+        assert estadisticas.valor == jugador.ultimo_valor
+
+
+@pytest.mark.parametrize("paralelismo", [{}, {"procesos": 1}], ids=str)
+def test_progreso_y_resultado(paralelismo):
+    async def analizar(partida):
+        opciones = {"casillas_final_exacto": None}
+        async with MotorAsincrono(opciones, **paralelismo) as motor:
+            analisis = motor.iniciar(partida, tiempo_ms=300)
+            infos = [info async for info in analisis]
+            return infos, await analisis
+
+    infos, estadisticas = asyncio.run(analizar(posiciones([0])[0]))
+    assert infos
+    profundidades = [info["profundidad"] for info in infos]
+    assert profundidades == sorted(profundidades)
+    assert estadisticas.movimiento == infos[-1]["movimiento"]
+
+
+@pytest.mark.parametrize("paralelismo", [{}, {"procesos": 1}], ids=str)
+def test_cancelar_al_consumidor_detiene_la_busqueda(paralelismo):
+    async def analizar(partida):
+        async with MotorAsincrono({"profundidad": None}, **paralelismo) as motor:
+            analisis = motor.iniciar(partida, tiempo_ms=60_000)
+            primera = asyncio.Event()
+
+            async def consumir():
+                async for _ in analisis:
+                    primera.set()
+
+            consumidor = asyncio.create_task(consumir())
+            await asyncio.wait_for(primera.wait(), 30)
+            consumidor.cancel()
+            await asyncio.gather(consumidor, return_exceptions=True)
+            # Al terminar de cancelarse el consumidor la búsqueda ya paró
+            return analisis.token.cancelado(), analisis.terminado()
+
+    cancelado, terminado = asyncio.run(
+        asyncio.wait_for(analizar(posiciones([0])[0]), 30)
+    )
+    assert cancelado and terminado
+
+
+def test_con_procesos_no_se_pasa_jugador():
+    async def iniciar(partida):
+        async with MotorAsincrono(OPCIONES, procesos=1) as motor:
+            motor.iniciar(partida, jugador=AIPlayer(**OPCIONES))
+
+    with pytest.raises(ValueError):
+        asyncio.run(iniciar(posiciones([0])[0]))
@@ -0,0 +1,91 @@
+"""
+Búsqueda paralela en la raíz contra la búsqueda secuencial
+"""
+import pytest
+
+from ai_player import PROFUNDIDAD_MINIMA_PARALELA, AIPlayer
+from control_busqueda import MASCARA_VERIFICACION, BusquedaInterrumpida, LimiteBusqueda
+from estado_busqueda import EstadoBusqueda
+from paralelo import BusquedaParalela
+from referencia import posiciones
+
+PROFUNDIDAD = 4
+
+
+@pytest.mark.parametrize("usar_pvs", [False, True])
+def test_misma_jugada_y_valor_que_secuencial(usar_pvs):
+    opciones = {"casillas_final_exacto": None, "usar_pvs": usar_pvs}
+    secuencial = AIPlayer(PROFUNDIDAD, **opciones)
+    paralelo = AIPlayer(PROFUNDIDAD, procesos=2, **opciones)
+    try:
+        for partida in posiciones(range(4)):
+            movimiento = secuencial.obtener_mejor_movimiento(partida)
+            assert paralelo.obtener_mejor_movimiento(partida) == movimiento
+            assert paralelo.ultimo_valor == secuencial.ultimo_valor
+    finally:
+        paralelo.cerrar()
+
+
+def test_interrumpir_el_primer_movimiento_no_deja_tareas_corriendo():
+    # Con un solo proceso, una tarea que siguiera corriendo dejaría esperando
+    # a la búsqueda siguiente (que se interrumpiría) o le cambiaría la cota
+    partida = posiciones([0])[0]
+    estado = EstadoBusqueda.desde_game_logic(partida)
+    movimientos = estado.movimientos()
+    paralela = BusquedaParalela(1, {"casillas_final_exacto": None})
+    try:
+        with pytest.raises(BusquedaInterrumpida):
+            paralela.buscar(estado, movimientos, 14, LimiteBusqueda(tiempo_ms=50))
+        valor, movimiento = paralela.buscar(
+            estado, movimientos, PROFUNDIDAD, LimiteBusqueda(tiempo_ms=20000)
+        )
+    finally:
+        paralela.cerrar()
+
+    secuencial = AIPlayer(PROFUNDIDAD, casillas_final_exacto=None)
+    secuencial.preparar_busqueda(estado)
+    assert secuencial.minimax(estado, PROFUNDIDAD, float("-inf"), float("inf")) == (
+        valor,
+        movimiento,
+    )
+
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_presupuesto_de_nodos_durante_las_tareas(procesos):
+    # Sin repartir el presupuesto, el primer movimiento a esta profundidad
+    # correría mucho más allá de `limite_nodos` antes de terminar
+    partida = posiciones([0])[0]
+    estado = EstadoBusqueda.desde_game_logic(partida)
+    paralela = BusquedaParalela(procesos, {"casillas_final_exacto": None})
+    limite_nodos = 5000
+    previos = 1000
+    try:
+        with pytest.raises(BusquedaInterrumpida):
+            paralela.buscar(
+                estado,
+                estado.movimientos(),
+                14,
+                LimiteBusqueda(tiempo_ms=20000, nodos=limite_nodos),
+                previos,
+            )
+    finally:
+        paralela.cerrar()
+    # Cada proceso revisa el presupuesto cada MASCARA_VERIFICACION + 1 nodos
+    assert paralela.nodos >= limite_nodos - previos
+    assert paralela.nodos < limite_nodos - previos + procesos * (
+        MASCARA_VERIFICACION + 1
+    )
+
+
+def test_jugador_paralelo_con_limite_de_nodos():
+    limite_nodos = 20000
+    jugador = AIPlayer(
+        None, limite_nodos=limite_nodos, procesos=2, casillas_final_exacto=None
+    )
+    try:
+        for partida in posiciones(range(2)):
+            assert jugador.obtener_mejor_movimiento(partida) is not None
+            assert jugador.profundidad_alcanzada >= PROFUNDIDAD_MINIMA_PARALELA
+            assert jugador.nodos < limite_nodos + 3 * (MASCARA_VERIFICACION + 1)
+    finally:
+        jugador.cerrar()
@@ -0,0 +1,43 @@
+"""
+Ponderación: las respuestas del rival pensadas en su turno se reutilizan
+"""
+import pytest
+
+from ai_player import AIPlayer
+from control_busqueda import TokenCancelacion
+from referencia import jugar, minimax, movimientos, posiciones, valores_minimax
+
+PROFUNDIDAD = 3
+OPCIONES = {"usar_transposicion": False, "casillas_final_exacto": None}
+
+
+def test_respuestas_ponderadas_como_minimax():
+    # En cada posición el humano está en turno y la IA pondera
+    for partida in posiciones(range(3)):
+        jugador = AIPlayer(PROFUNDIDAD, **OPCIONES)
+        jugador.ponderar(partida, TokenCancelacion())
+        for respuesta in movimientos(partida):
+            hija, _ = jugar(partida, respuesta)
+            hija.pasar_turno()
+            if not movimientos(hija):
+                continue
+            movimiento = jugador.obtener_mejor_movimiento(hija)
+            assert jugador.estadisticas.origen == "ponder"
+            valores = valores_minimax(hija, PROFUNDIDAD)
+            assert jugador.ultimo_valor == pytest.approx(minimax(hija, PROFUNDIDAD))
+            assert valores[movimiento] == pytest.approx(jugador.ultimo_valor)
+
+
+
+def test_posicion_no_ponderada():
+    partidas = posiciones(range(3))
+    jugador = AIPlayer(PROFUNDIDAD, **OPCIONES)
+    jugador.ponderar(partidas[0], TokenCancelacion())
+    # Las respuestas de otra partida no se pensaron: se busca como siempre
+    partida = partidas[-1]
+    hija, _ = jugar(partida, movimientos(partida)[0])
+    hija.pasar_turno()
+    movimiento = jugador.obtener_mejor_movimiento(hija)
+    assert jugador.estadisticas.origen == "busqueda"
+    assert jugador.ultimo_valor == pytest.approx(minimax(hija, PROFUNDIDAD))
+    assert movimiento in movimientos(hija)
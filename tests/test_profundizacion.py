@@ -0,0 +1,78 @@
+"""
+Profundización iterativa con presupuesto de tiempo o de nodos
+"""
+import time
+
+import pytest
+
+import ai_player
+from ai_player import AIPlayer
+from control_busqueda import MASCARA_VERIFICACION, BusquedaInterrumpida
+from referencia import minimax, movimientos, posiciones
+
+OPCIONES = {"usar_transposicion": False, "casillas_final_exacto": None}
+
+
+@pytest.mark.parametrize("limite_nodos", [300, 1500])
+def test_presupuesto_de_nodos(limite_nodos):
+    for partida in posiciones(range(3)):
+        jugador = AIPlayer(None, limite_nodos=limite_nodos, **OPCIONES)
+        movimiento = jugador.obtener_mejor_movimiento(partida)
+        assert movimiento in movimientos(partida)
+        assert jugador.estadisticas.origen == "profundizacion"
+        # El presupuesto se revisa cada MASCARA_VERIFICACION + 1 nodos y la
+        # profundidad 1 siempre termina
+        assert jugador.nodos < limite_nodos + 2 * (MASCARA_VERIFICACION + 1)
+        profundidad = jugador.profundidad_alcanzada
+        assert profundidad >= 1
+        assert jugador.ultimo_valor == pytest.approx(minimax(partida, profundidad))
+
+
+def test_mas_nodos_mas_profundidad():
+    for partida in posiciones(range(3)):
+        alcanzadas = []
+        for limite_nodos in (300, 30000):
+            jugador = AIPlayer(None, limite_nodos=limite_nodos, **OPCIONES)
+            jugador.obtener_mejor_movimiento(partida)
+            alcanzadas.append(jugador.profundidad_alcanzada)
+        assert alcanzadas[0] <= alcanzadas[1]
+
+
+def test_presupuesto_de_tiempo():
+    jugador = AIPlayer(None, **OPCIONES)
+    for partida in posiciones(range(3)):
+        inicio = time.perf_counter()
+        movimiento = jugador.obtener_mejor_movimiento(partida, tiempo_ms=50)
+        assert (time.perf_counter() - inicio) * 1000 < 1000
+        assert movimiento in movimientos(partida)
+        assert jugador.profundidad_alcanzada >= 1
+
+
+def test_tiempo_de_partida():
+    jugador = AIPlayer(None, tiempo_partida_ms=400, **OPCIONES)
+    for partida in posiciones(range(3)):
+        antes = jugador.tiempo_restante_ms
+        assert jugador.obtener_mejor_movimiento(partida) in movimientos(partida)
+        assert jugador.tiempo_restante_ms < antes
+
+
+
+def test_final_sin_resolver_no_duplica_el_tiempo(monkeypatch):
+    def resolver_sin_terminar(estado, limite):
+        # Como un final demasiado grande: gasta todo el tiempo de la jugada
+        while not limite.agotado(0):
+            time.sleep(0.001)
+        raise BusquedaInterrumpida()
+
+    monkeypatch.setattr(ai_player, "es_final", lambda estado, casillas: True)
+    jugador = AIPlayer(None, usar_transposicion=False)
+    monkeypatch.setattr(jugador.solucionador, "resolver", resolver_sin_terminar)
+    tiempo_ms = 200
+    for partida in posiciones(range(2)):
+        inicio = time.perf_counter()
+        movimiento = jugador.obtener_mejor_movimiento(partida, tiempo_ms=tiempo_ms)
+        transcurrido_ms = (time.perf_counter() - inicio) * 1000
+        assert movimiento in movimientos(partida)
+        assert jugador.estadisticas.origen == "profundizacion"
+        # Tras el solucionador solo queda la profundidad 1, que siempre termina
+        assert transcurrido_ms < tiempo_ms * 1.5
@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+from config import generar_tablero_aleatorio, valores_casillas
+from registro_partidas import (
+    CON_CASILLAS,
+    FormatoInvalido,
+    RegistroPartida,
+    escribir_partidas,
+    estados,
+    leer_partidas,
+    reproducir,
+)
+
+TABLEROS = [(6, 10), (8, None), (8, 10), (10, 16), (16, 40)]
+
+
+def partida_al_azar(registro, semilla, jugadas=12):
+    """Agrega a `registro` hasta `jugadas` movimientos al azar"""
+    generador = random.Random(semilla)
+    for partida in reproducir(registro):
+        if len(registro.movimientos) == jugadas:
+            break
+        partida.pasar_turno()
+        pos = partida.pos_blanco if partida.turno_blanco else partida.pos_negro
+        opciones = partida.obtener_movimientos_validos(pos)
+        if not opciones:
+            break
+        registro.agregar(
+            generador.choice(opciones),
+            evaluacion=generador.uniform(-20, 20),
+            tiempo_ms=generador.uniform(0, 500),
+        )
+    return registro
+
+
+def iguales(leido, original):
+    assert leido.tablero == original.tablero
+    assert tuple(leido.pos_blanco) == tuple(original.pos_blanco)
+    assert tuple(leido.pos_negro) == tuple(original.pos_negro)
+    assert leido.movimientos == original.movimientos
+    assert leido.semilla == original.semilla
+    assert leido.casillas == original.casillas
+    for campo in ("evaluaciones", "tiempos_ms"):
+        esperado = getattr(original, campo)
+        assert getattr(leido, campo) == pytest.approx(esperado, rel=1e-6)
+
+
+@pytest.mark.parametrize("dimension, casillas", TABLEROS)
+def test_ida_y_vuelta_con_semilla(tmp_path, dimension, casillas):
+    registros = [
+        partida_al_azar(
+            RegistroPartida.desde_semilla(semilla, dimension, casillas), semilla
+        )
+        for semilla in (0, 7, 2**64 - 1)
+    ]
+    ruta = tmp_path / "partidas.shr"
+    escribir_partidas(ruta, registros)
+    leidos = list(leer_partidas(ruta))
+    assert len(leidos) == len(registros)
+    for leido, original in zip(leidos, registros):
+        iguales(leido, original)
+        assert leido.dimension == dimension
+
+
+@pytest.mark.parametrize("dimension, casillas", TABLEROS)
+def test_ida_y_vuelta_tablero_explicito(tmp_path, dimension, casillas):
+    valores = None if casillas is None else valores_casillas(casillas)
+    registros = [
+        partida_al_azar(
+            RegistroPartida(*generar_tablero_aleatorio(semilla, dimension, valores)),
+            semilla,
+        )
+        for semilla in range(3)
+    ]
+    ruta = tmp_path / "partidas.shr"
+    escribir_partidas(ruta, registros)
+    for leido, original in zip(leer_partidas(ruta), registros):
+        iguales(leido, original)
+
+
+def test_semilla_clasica_sin_bandera_de_casillas():
+    registro = RegistroPartida.desde_semilla(3)
+    assert registro.casillas is None
+    assert registro.tablero == generar_tablero_aleatorio(3)[0]
+    assert not registro.codificar()[0] & CON_CASILLAS
+
+
+def test_semilla_invalida():
+    for semilla in (-1, 2**64):
+        registro = RegistroPartida(*generar_tablero_aleatorio(0), semilla=semilla)
+        with pytest.raises(ValueError):
+            registro.codificar()
+
+
+def test_semilla_que_no_genera_el_tablero():
+    # Los valores de valores_casillas(10) van en otro orden que los clásicos
+    tablero = generar_tablero_aleatorio(1, None, valores_casillas(10))
+    registro = RegistroPartida(*tablero, semilla=1)
+    with pytest.raises(ValueError):
+        registro.codificar()
+
+
+def test_archivo_truncado(tmp_path):
+    registro = partida_al_azar(RegistroPartida.desde_semilla(5, 10, 16), 5)
+    ruta = tmp_path / "partidas.shr"
+    escribir_partidas(ruta, [registro])
+    ruta.write_bytes(ruta.read_bytes()[:-3])
+    with pytest.raises(FormatoInvalido):
+        list(leer_partidas(ruta))
+
+
+@pytest.mark.parametrize("dimension, casillas", TABLEROS)
+def test_estados_coinciden_con_reproducir(dimension, casillas):
+    registro = partida_al_azar(
+        RegistroPartida.desde_semilla(11, dimension, casillas), 11, jugadas=40
+    )
+    partidas = [
+        (p.pos_blanco, p.pos_negro, p.puntos_blanco, p.puntos_negro)
+        for p in reproducir(registro)
+    ]
+    vistos = list(estados(registro))
+    assert len(vistos) == len(partidas)
+    for estado, (pos_blanco, pos_negro, blanco, negro) in zip(vistos, partidas):
+        assert estado.blanco == pos_blanco[0] * dimension + pos_blanco[1]
+        assert estado.negro == pos_negro[0] * dimension + pos_negro[1]
+        assert (estado.puntos_blanco, estado.puntos_negro) == (blanco, negro)
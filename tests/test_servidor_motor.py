@@ -0,0 +1,188 @@
+"""
+Protocolo del servidor del motor: lectura de posiciones y sesiones TCP
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+import servidor_motor
+from config import generar_tablero_aleatorio, valores_casillas
+from servidor_motor import (
+    ClienteMotor,
+    ErrorProtocolo,
+    ServidorMotor,
+    leer_casilla,
+    leer_posicion,
+    nombre_casilla,
+)
+
+
+def movimientos(partida):
+    pos = partida.pos_blanco if partida.turno_blanco else partida.pos_negro
+    return partida.obtener_movimientos_validos(pos)
+
+
+def test_nombres_de_casillas():
+    for dimension in (6, 8, 16):
+        for fila in range(dimension):
+            for col in range(dimension):
+                nombre = nombre_casilla((fila, col))
+                assert leer_casilla(nombre, dimension) == (fila, col)
+    assert nombre_casilla((1, 2)) == "c2"
+    for texto in ("", "c", "c0", "i1", "a9", "1a", "cx"):
+        with pytest.raises(ErrorProtocolo):
+            leer_casilla(texto, 8)
+
+
+@pytest.mark.parametrize(
+    "orden, dimension, casillas",
+    [
+        ("seed 3", None, None),
+        ("seed 3 dimension 6", 6, None),
+        ("seed 3 casillas 10", None, 10),
+        ("seed 3 dimension 10 casillas 16", 10, 16),
+        ("seed 3 casillas 40 dimension 16", 16, 40),
+    ],
+)
+def test_posicion_con_semilla(orden, dimension, casillas):
+    valores = None if casillas is None else valores_casillas(casillas)
+    tablero, pos_blanco, pos_negro = generar_tablero_aleatorio(3, dimension, valores)
+    partida = leer_posicion(orden.split())
+    assert partida.tablero == tablero
+    assert (partida.pos_blanco, partida.pos_negro) == (pos_blanco, pos_negro)
+
+
+def test_posicion_con_jugadas():
+    partida = leer_posicion("seed 5 dimension 10".split())
+    jugadas = []
+    for _ in range(6):
+        partida.pasar_turno()
+        movimiento = movimientos(partida)[0]
+        partida.mover_caballo(movimiento)
+        jugadas.append(nombre_casilla(movimiento))
+    orden = "seed 5 dimension 10 moves " + " ".join(jugadas)
+    leida = leer_posicion(orden.split())
+    assert leida.tablero == partida.tablero
+    assert leida.pos_blanco == partida.pos_blanco
+    assert leida.pos_negro == partida.pos_negro
+    assert leida.turno_blanco == partida.turno_blanco
+
+
+def test_posicion_con_tablero():
+    vacias = ",".join("." * 6)
+    filas = ["W,.,.,.,.,3"] + [vacias] * 4 + [".,.,.,-4,.,B"]
+    partida = leer_posicion(["board", "/".join(filas)])
+    assert partida.dimension == 6
+    assert partida.pos_blanco == (0, 0) and partida.pos_negro == (5, 5)
+    assert partida.tablero[0][5] == 3 and partida.tablero[5][3] == -4
+
+
+@pytest.mark.parametrize(
+    "orden",
+    [
+        "",
+        "seed",
+        "seed x",
+        "seed 3 dimension",
+        "seed 3 dimension 10 casillas",
+        "seed 3 3 dimension",
+        "seed 3 profundidad 4",
+        "seed 3 dimension 8 dimension 10",
+        "seed 3 dimension 99",
+        "seed 3 casillas 100 dimension 6",
+        "seed 3 moves z9",
+        "board W,B",
+        "fen 3",
+    ],
+)
+def test_posiciones_invalidas(orden):
+    with pytest.raises(ErrorProtocolo):
+        leer_posicion(orden.split())
+
+
+@pytest.fixture
+def servidor():
+    """ServidorMotor de un proceso escuchando en un puerto libre"""
+    motor = ServidorMotor(procesos=1)
+    loop = asyncio.new_event_loop()
+    tcp = loop.run_until_complete(motor.servir_tcp(0))
+    hilo = threading.Thread(target=loop.run_forever, daemon=True)
+    hilo.start()
+    yield tcp.sockets[0].getsockname()[1]
+    loop.call_soon_threadsafe(loop.stop)
+    hilo.join()
+    tcp.close()
+    loop.run_until_complete(tcp.wait_closed())
+    loop.close()
+    motor.cerrar()
+
+
+def test_sesion(servidor):
+    cliente = ClienteMotor(servidor, timeout=30)
+    try:
+        cliente.enviar("uci")
+        assert cliente.esperar("uciok")[1] == "uciok"
+        cliente.enviar("setoption name sin_opcion value 1")
+        assert cliente.esperar("error")[1].startswith("error opción desconocida")
+        cliente.enviar("position seed 3 dimension")
+        assert cliente.esperar("error")[1] == "error falta el valor de dimension"
+
+        cliente.enviar("position seed 3 dimension 10")
+        cliente.enviar("go depth 3")
+        infos, linea = cliente.esperar("bestmove")
+        assert all(info.startswith("info depth") for info in infos)
+        partida = leer_posicion("seed 3 dimension 10".split())
+        jugada = linea.split()[1]
+        assert leer_casilla(jugada, 10) in movimientos(partida)
+
+        cliente.enviar(f"position seed 3 dimension 10 moves {jugada}")
+        cliente.enviar("go infinite")
+        cliente.esperar("info")
+        cliente.enviar("stop")
+        _, linea = cliente.esperar("bestmove")
+        partida = leer_posicion(f"seed 3 dimension 10 moves {jugada}".split())
+        assert leer_casilla(linea.split()[1], 10) in movimientos(partida)
+        cliente.enviar("isready")
+        assert cliente.esperar("readyok")[1] == "readyok"
+    finally:
+        cliente.cerrar()
+
+
+def test_stop_en_cola_no_frena_otras_sesiones(servidor, monkeypatch):
+    demora = 1.0
+    jugada_inmediata = servidor_motor.jugada_inmediata
+
+    def jugada_lenta(partida):
+        time.sleep(demora)
+        return jugada_inmediata(partida)
+
+    monkeypatch.setattr(servidor_motor, "jugada_inmediata", jugada_lenta)
+    ocupado, en_cola = ClienteMotor(servidor), ClienteMotor(servidor)
+    try:
+        # La primera búsqueda ocupa el único proceso; la segunda queda en
+        # cola y su stop se responde con jugada_inmediata
+        ocupado.enviar("position seed 1")
+        ocupado.enviar("go infinite")
+        ocupado.esperar("info")
+        en_cola.enviar("position seed 2")
+        en_cola.enviar("go infinite")
+        en_cola.enviar("isready")
+        en_cola.esperar("readyok")
+        en_cola.enviar("stop")
+        time.sleep(demora / 10)
+
+        inicio = time.perf_counter()
+        ocupado.enviar("isready")
+        ocupado.esperar("readyok")
+        assert time.perf_counter() - inicio < demora / 2
+
+        _, linea = en_cola.esperar("bestmove")
+        partida = leer_posicion("seed 2".split())
+        assert leer_casilla(linea.split()[1], 8) in movimientos(partida)
+        ocupado.enviar("stop")
+        ocupado.esperar("bestmove")
+    finally:
+        ocupado.cerrar()
+        en_cola.cerrar()
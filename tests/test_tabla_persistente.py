@@ -0,0 +1,158 @@
+"""
+Tabla de transposición en disco: formato, reemplazo y acceso concurrente
+"""
+import multiprocessing
+
+import pytest
+
+from ai_player import AIPlayer
+from referencia import mejor_valor, posiciones, valores_minimax
+from tabla_persistente import GENERACIONES_VIGENTES, MASCARA_8, TablaPersistente
+from transposicion import COTA_INFERIOR, EXACTO
+
+MEMORIA_MB = 0.0625
+
+
+def test_guardar_y_consultar_entre_aperturas(tmp_path):
+    ruta = tmp_path / "tabla.tt"
+    tabla = TablaPersistente(ruta, MEMORIA_MB)
+    tabla.nueva_busqueda()
+    tabla.guardar(12345, 6, -7.25, COTA_INFERIOR, 37)
+    tabla.guardar(99, 2, 0.5, EXACTO)
+    assert tabla.consultar(12345) == (6, -7.25, COTA_INFERIOR, 37)
+    assert tabla.consultar(12346) is None
+    tabla.cerrar()
+
+    otra = TablaPersistente(ruta)
+    assert otra.tamano == tabla.tamano
+    assert otra.consultar(12345) == (6, -7.25, COTA_INFERIOR, 37)
+    assert otra.consultar(99) == (2, 0.5, EXACTO, None)
+    otra.cerrar()
+
+
+def test_la_generacion_se_comparte(tmp_path):
+    ruta = tmp_path / "tabla.tt"
+    primera = TablaPersistente(ruta, MEMORIA_MB)
+    segunda = TablaPersistente(ruta)
+    primera.nueva_busqueda()
+    segunda.nueva_busqueda()
+    assert segunda.generacion == primera.generacion + 1
+    primera.cerrar()
+    segunda.cerrar()
+
+    tercera = TablaPersistente(ruta)
+    tercera.nueva_busqueda()
+    assert tercera.generacion == 3
+    tercera.cerrar()
+
+
+def test_reemplazo_por_profundidad_y_edad(tmp_path):
+    tabla = TablaPersistente(tmp_path / "tabla.tt", MEMORIA_MB)
+    otra_clave = 7 + tabla.tamano
+    tabla.nueva_busqueda()
+    tabla.guardar(7, 8, 1.0, EXACTO)
+    # Más superficial y reciente: no reemplaza
+    tabla.guardar(otra_clave, 3, 2.0, EXACTO)
+    assert tabla.consultar(7) is not None
+    # Pasadas GENERACIONES_VIGENTES búsquedas la entrada es reemplazable
+    for _ in range(GENERACIONES_VIGENTES):
+        tabla.nueva_busqueda()
+    tabla.guardar(otra_clave, 3, 2.0, EXACTO)
+    assert tabla.consultar(7) is None
+    assert tabla.consultar(otra_clave) == (3, 2.0, EXACTO, None)
+    tabla.cerrar()
+
+
+def test_reemplazo_al_dar_la_vuelta_la_generacion(tmp_path):
+    ruta = tmp_path / "tabla.tt"
+    tabla = TablaPersistente(ruta, MEMORIA_MB)
+    otra_clave = 7 + tabla.tamano
+    for _ in range(MASCARA_8 - 1):
+        tabla.nueva_busqueda()
+    tabla.guardar(7, 8, 1.0, EXACTO)
+    # Pocas búsquedas después, ya del otro lado de la vuelta: sigue vigente
+    for _ in range(GENERACIONES_VIGENTES - 1):
+        tabla.nueva_busqueda()
+    assert tabla.generacion < GENERACIONES_VIGENTES
+    tabla.guardar(otra_clave, 3, 2.0, EXACTO)
+    assert tabla.consultar(7) is not None
+    # Media vuelta después es vieja, aunque la edad en 8 bits pase de 128
+    for _ in range(MASCARA_8 // 2 - GENERACIONES_VIGENTES + 3):
+        tabla.nueva_busqueda()
+    tabla.guardar(otra_clave, 3, 2.0, EXACTO)
+    assert tabla.consultar(7) is None
+    assert tabla.consultar(otra_clave) == (3, 2.0, EXACTO, None)
+    tabla.cerrar()
+
+
+def test_entrada_de_una_generacion_posterior(tmp_path):
+    ruta = tmp_path / "tabla.tt"
+    atrasada = TablaPersistente(ruta, MEMORIA_MB)
+    adelantada = TablaPersistente(ruta)
+    otra_clave = 7 + atrasada.tamano
+    atrasada.nueva_busqueda()
+    for _ in range(GENERACIONES_VIGENTES - 1):
+        adelantada.nueva_busqueda()
+    adelantada.guardar(7, 8, 1.0, EXACTO)
+    atrasada.guardar(otra_clave, 3, 2.0, EXACTO)
+    assert atrasada.consultar(7) is not None
+    atrasada.cerrar()
+    adelantada.cerrar()
+
+
+@pytest.mark.parametrize(
+    "contenido", [b"", b"SHTT", b"no es una tabla" * 10, None], ids=str
+)
+def test_archivo_invalido(tmp_path, contenido):
+    ruta = tmp_path / "tabla.tt"
+    if contenido is None:
+        # Tabla válida pero truncada
+        TablaPersistente(ruta, MEMORIA_MB).cerrar()
+        contenido = ruta.read_bytes()[:-16]
+    ruta.write_bytes(contenido)
+    with pytest.raises(ValueError):
+        TablaPersistente(ruta)
+
+
+def _abrir_y_escribir(ruta, clave, inicio):
+    inicio.wait()
+    tabla = TablaPersistente(ruta, MEMORIA_MB)
+    tabla.nueva_busqueda()
+    tabla.guardar(clave, 4, float(clave), EXACTO)
+    tabla.cerrar()
+
+
+def test_creacion_simultanea(tmp_path):
+    ruta = str(tmp_path / "tabla.tt")
+    contexto = multiprocessing.get_context()
+    inicio = contexto.Event()
+    procesos = [
+        contexto.Process(target=_abrir_y_escribir, args=(ruta, clave, inicio))
+        for clave in range(1, 9)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    inicio.set()
+    for proceso in procesos:
+        proceso.join(30)
+        assert proceso.exitcode == 0
+
+    tabla = TablaPersistente(ruta)
+    for clave in range(1, 9):
+        assert tabla.consultar(clave) == (4, float(clave), EXACTO, None)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["tabla.tt"]
+    tabla.cerrar()
+
+
+def test_busqueda_con_tabla_persistente(tmp_path):
+    ruta = tmp_path / "tabla.tt"
+    for partida in posiciones(range(3)):
+        valores = valores_minimax(partida, 4)
+        mejor = mejor_valor(partida, valores.values())
+        # La segunda búsqueda aprovecha lo que dejó la primera en el archivo
+        for _ in range(2):
+            jugador = AIPlayer(4, casillas_final_exacto=None, ruta_tt=ruta)
+            movimiento = jugador.obtener_mejor_movimiento(partida)
+            assert jugador.ultimo_valor == mejor
+            assert valores[movimiento] == mejor
+            jugador.cerrar()
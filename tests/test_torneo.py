@@ -0,0 +1,71 @@
+"""
+Torneo de autojuego: resultados, checkpoint y registro de partidas
+"""
+import json
+
+import pytest
+
+from registro_partidas import leer_partidas, resultado_final
+from torneo import ejecutar_torneo, leer_configuracion, resumir
+
+RAPIDA = {"profundidad": 1, "usar_transposicion": False, "casillas_final_exacto": None}
+LENTA = dict(RAPIDA, profundidad=2)
+
+
+def test_leer_configuracion():
+    texto = "motor='mcts', playouts=50,semilla=3,"
+    assert leer_configuracion(texto) == {"motor": "mcts", "playouts": 50, "semilla": 3}
+
+
+def test_torneo_con_checkpoint_y_registro(tmp_path):
+    checkpoint = tmp_path / "torneo.jsonl"
+    ruta_partidas = tmp_path / "partidas.shr"
+    argumentos = {
+        "procesos": 2,
+        "checkpoint": checkpoint,
+        "ruta_partidas": ruta_partidas,
+    }
+    registros = ejecutar_torneo(RAPIDA, LENTA, 4, **argumentos)
+    assert [registro["id"] for registro in registros] == [0, 1, 2, 3]
+    # Cada semilla se juega dos veces, con A de cada color
+    assert [(r["semilla"], r["a_blanco"]) for r in registros] == [
+        (0, True),
+        (0, False),
+        (1, True),
+        (1, False),
+    ]
+
+    # Al retomar solo se juegan las partidas que faltan
+    registros = ejecutar_torneo(RAPIDA, LENTA, 6, **argumentos)
+    assert len(registros) == 6
+    assert len(checkpoint.read_text().splitlines()) == 6
+    guardados = [json.loads(linea) for linea in checkpoint.read_text().splitlines()]
+    assert sorted(registro["id"] for registro in guardados) == list(range(6))
+
+    # El registro binario reproduce el marcador de cada partida
+    por_marcador = sorted(
+        (r["semilla"], r["puntos_blanco"], r["puntos_negro"]) for r in registros
+    )
+    reproducidas = []
+    for registro in leer_partidas(ruta_partidas):
+        partida = resultado_final(registro)
+        assert len(registro.evaluaciones) == len(registro.movimientos)
+        reproducidas.append(
+            (registro.semilla, partida.puntos_blanco, partida.puntos_negro)
+        )
+    assert sorted(reproducidas) == por_marcador
+
+    resumen = resumir(registros)
+    assert resumen["partidas"] == 6
+    assert resumen["victorias"] + resumen["empates"] + resumen["derrotas"] == 6
+    assert resumen["puntuacion"] == pytest.approx(
+        sum(r["puntuacion_a"] for r in registros) / 6
+    )
+    assert resumen["elo_min"] <= resumen["elo"] <= resumen["elo_max"]
+
+
+def test_checkpoint_de_otra_configuracion(tmp_path):
+    checkpoint = tmp_path / "torneo.jsonl"
+    ejecutar_torneo(RAPIDA, RAPIDA, 2, procesos=1, checkpoint=checkpoint)
+    with pytest.raises(ValueError):
+        ejecutar_torneo(RAPIDA, LENTA, 2, procesos=1, checkpoint=checkpoint)
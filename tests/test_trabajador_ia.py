@@ -0,0 +1,47 @@
+"""
+Búsqueda en un hilo de fondo con cancelación
+"""
+import time
+
+from ai_player import AIPlayer
+from referencia import movimientos, posiciones
+from trabajador_ia import TrabajadorIA
+
+OPCIONES = {"usar_transposicion": False, "casillas_final_exacto": None}
+
+
+def test_mismo_resultado_que_en_el_hilo_principal():
+    for partida in posiciones(range(3)):
+        trabajador = TrabajadorIA(AIPlayer(4, **OPCIONES))
+        tablero = [fila[:] for fila in partida.tablero]
+        trabajador.iniciar(partida)
+        trabajador.esperar(30)
+        assert trabajador.terminado() and trabajador.error is None
+        esperado = AIPlayer(4, **OPCIONES).obtener_mejor_movimiento(partida)
+        assert trabajador.movimiento == esperado
+        assert trabajador.estadisticas.movimiento == trabajador.movimiento
+        # La búsqueda trabajó sobre una copia
+        assert partida.tablero == tablero
+
+
+def test_cancelar_una_busqueda_larga():
+    (partida,) = posiciones([0], jugadas=(0,))
+    trabajador = TrabajadorIA(AIPlayer(None, **OPCIONES))
+    trabajador.iniciar(partida, tiempo_ms=60_000)
+    while trabajador.progreso is None:
+        time.sleep(0.01)
+    inicio = time.perf_counter()
+    trabajador.cancelar()
+    trabajador.esperar(10)
+    assert trabajador.terminado() and trabajador.cancelado()
+    assert time.perf_counter() - inicio < 5
+    assert trabajador.error is None
+    assert trabajador.movimiento in movimientos(partida) + [None]
+
+
+def test_error_en_el_hilo():
+    (partida,) = posiciones([0], jugadas=(0,))
+    trabajador = TrabajadorIA(None)
+    trabajador.iniciar(partida)
+    trabajador.esperar(10)
+    assert isinstance(trabajador.error, AttributeError)
@@ -0,0 +1,328 @@
+"""
+Torneo sin interfaz gráfica entre dos configuraciones de la IA
+
+Uso:
+    python torneo.py --partidas 100 --a profundidad=4 --b profundidad=3
+    python torneo.py --partidas 200 --a tiempo_partida_ms=8000 \\
+        --b tiempo_partida_ms=8000,ordenar_movimientos=False \\
+        --checkpoint torneo.jsonl
+    python torneo.py --a motor="mcts",tiempo_partida_ms=8000 \\
+        --b tiempo_partida_ms=8000
+
+Cada semilla genera un tablero que se juega dos veces, intercambiando los
+colores. Las partidas corren en paralelo en varios procesos y, con
+--checkpoint, cada resultado se agrega a un archivo JSONL; al volver a
+ejecutar el mismo comando se retoman solo las partidas que faltan. Con
+--partidas-registradas cada partida se guarda además, jugada a jugada, en
+el formato de registro_partidas.
+
+La clave `motor` elige el jugador ("minimax", por defecto, para AIPlayer o
+"mcts" para mcts.JugadorMCTS); el resto son sus argumentos.
+"""
+import argparse
+import ast
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ai_player import AIPlayer
+from config import generar_tablero_aleatorio
+from estadisticas import configurar_registro
+from game_logic import GameLogic
+from mcts import JugadorMCTS
+from registro_partidas import EscritorPartidas, RegistroPartida
+
+MOTORES = {"minimax": AIPlayer, "mcts": JugadorMCTS}
+
+# Cuantil de la normal para el intervalo de confianza del 95 %
+Z_95 = 1.96
+
+
+def leer_configuracion(texto):
+    """Convierte "profundidad=4,ordenar_movimientos=False" en kwargs de AIPlayer"""
+    configuracion = {}
+    for par in texto.split(","):
+        if not par.strip():
+            continue
+        nombre, valor = par.split("=", 1)
+        configuracion[nombre.strip()] = ast.literal_eval(valor.strip())
+    return configuracion
+
+
+def crear_jugador(configuracion):
+    """Crea el jugador de `configuracion` según su clave `motor`"""
+    opciones = dict(configuracion)
+    motor = opciones.pop("motor", "minimax")
+    return MOTORES[motor](**opciones)
+
+
+def jugar_partida(config_blanco, config_negro, semilla):
+    """
+    Juega una partida completa entre dos configuraciones de AIPlayer sobre
+    el tablero de `semilla`. Retorna puntos, jugadas, y por color el tiempo
+    de reflexión (ms), los nodos y la cantidad de jugadas. `movimientos`
+    lista cada jugada como (fila, col, evaluación, tiempo en ms).
+    """
+    tablero, pos_blanco, pos_negro = generar_tablero_aleatorio(semilla)
+    partida = GameLogic(tablero, pos_blanco, pos_negro)
+    jugadores = {True: crear_jugador(config_blanco), False: crear_jugador(config_negro)}
+    estadisticas = {
+        color: {"tiempo_ms": 0.0, "nodos": 0, "jugadas": 0}
+        for color in ("blanco", "negro")
+    }
+    movimientos = []
+
+    try:
+        while not partida.verificar_fin_juego():
+            if partida.pasar_turno():
+                continue
+            turno_blanco = partida.turno_blanco
+            jugador = jugadores[turno_blanco]
+            inicio = time.perf_counter()
+            movimiento = jugador.obtener_mejor_movimiento(partida)
+            transcurrido = (time.perf_counter() - inicio) * 1000
+            if movimiento is None or not partida.mover_caballo(movimiento):
+                raise RuntimeError(f"Jugada inválida {movimiento} (semilla {semilla})")
+
+            color = estadisticas["blanco" if turno_blanco else "negro"]
+            color["tiempo_ms"] += transcurrido
+            color["nodos"] += jugador.nodos
+            color["jugadas"] += 1
+            movimientos.append((*movimiento, jugador.ultimo_valor, transcurrido))
+    finally:
+        for jugador in jugadores.values():
+            jugador.cerrar()
+
+    return {
+        "puntos_blanco": partida.puntos_blanco,
+        "puntos_negro": partida.puntos_negro,
+        "blanco": estadisticas["blanco"],
+        "negro": estadisticas["negro"],
+        "movimientos": movimientos,
+    }
+
+
+def _jugar_tarea(tarea):
+    """Juega la partida `id` del torneo y la resume desde el punto de vista de A"""
+    id_partida, semilla, a_blanco, config_a, config_b = tarea
+    if a_blanco:
+        resultado = jugar_partida(config_a, config_b, semilla)
+    else:
+        resultado = jugar_partida(config_b, config_a, semilla)
+
+    diferencia = resultado["puntos_blanco"] - resultado["puntos_negro"]
+    if not a_blanco:
+        diferencia = -diferencia
+    return {
+        "id": id_partida,
+        "semilla": semilla,
+        "a_blanco": a_blanco,
+        "config_a": config_a,
+        "config_b": config_b,
+        "puntos_blanco": resultado["puntos_blanco"],
+        "puntos_negro": resultado["puntos_negro"],
+        "puntuacion_a": 1.0 if diferencia > 0 else 0.0 if diferencia < 0 else 0.5,
+        "a": resultado["blanco" if a_blanco else "negro"],
+        "b": resultado["negro" if a_blanco else "blanco"],
+        "movimientos": resultado["movimientos"],
+    }
+
+
+def cargar_checkpoint(ruta, config_a, config_b):
+    """Lee las partidas ya jugadas de `ruta` (id -> registro)"""
+    registros = {}
+    if ruta is None or not os.path.exists(ruta):
+        return registros
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                # Una línea a medio escribir si el proceso se interrumpió
+                continue
+            if registro["config_a"] != config_a or registro["config_b"] != config_b:
+                raise ValueError(f"{ruta} es de un torneo con otra configuración")
+            registros[registro["id"]] = registro
+    return registros
+
+
+def registro_de_partida(semilla, movimientos):
+    """RegistroPartida de una partida del torneo (jugadas de jugar_partida)"""
+    registro = RegistroPartida.desde_semilla(semilla, evaluaciones=[], tiempos_ms=[])
+    for fila, col, evaluacion, tiempo_ms in movimientos:
+        registro.agregar((fila, col), evaluacion, tiempo_ms)
+    return registro
+
+
+def ejecutar_torneo(
+    config_a,
+    config_b,
+    partidas,
+    semilla=0,
+    procesos=None,
+    checkpoint=None,
+    ruta_registro=None,
+    ruta_partidas=None,
+):
+    """
+    Juega `partidas` partidas entre las configuraciones A y B (kwargs de
+    AIPlayer). La partida i usa la semilla semilla + i // 2 y A lleva el
+    blanco en las pares. Con `ruta_registro` las estadísticas de cada
+    búsqueda se escriben en ese archivo y con `ruta_partidas` las partidas
+    se agregan a ese registro binario (registro_partidas). Retorna la lista
+    de registros ordenada por id.
+    """
+    registros = cargar_checkpoint(checkpoint, config_a, config_b)
+    tareas = [
+        (i, semilla + i // 2, i % 2 == 0, config_a, config_b)
+        for i in range(partidas)
+        if i not in registros
+    ]
+
+    if tareas:
+        archivo = None
+        escritor = None
+        if checkpoint is not None:
+            archivo = open(checkpoint, "a", encoding="utf-8")
+        if ruta_partidas is not None:
+            escritor = EscritorPartidas(ruta_partidas)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=procesos,
+                initializer=configurar_registro,
+                initargs=(ruta_registro,),
+            ) as pool:
+                futuros = [pool.submit(_jugar_tarea, tarea) for tarea in tareas]
+                for completadas, futuro in enumerate(as_completed(futuros), 1):
+                    registro = futuro.result()
+                    # Las jugadas van al registro binario, no al checkpoint
+                    movimientos = registro.pop("movimientos")
+                    if escritor is not None:
+                        escritor.escribir(
+                            registro_de_partida(registro["semilla"], movimientos)
+                        )
+                    registros[registro["id"]] = registro
+                    if archivo is not None:
+                        archivo.write(json.dumps(registro) + "\n")
+                        archivo.flush()
+                    print(
+                        f"\r{completadas}/{len(tareas)} partidas", end="", flush=True
+                    )
+            print()
+        finally:
+            if archivo is not None:
+                archivo.close()
+            if escritor is not None:
+                escritor.cerrar()
+
+    return [registros[i] for i in sorted(registros) if i < partidas]
+
+
+def diferencia_elo(puntuacion):
+    """Diferencia de Elo que corresponde a una puntuación esperada en (0, 1)"""
+    return -400 * math.log10(1 / puntuacion - 1)
+
+
+def resumir(registros):
+    """
+    Victorias, empates y derrotas de A, diferencia de Elo con su intervalo
+    del 95 %, y tiempo medio por jugada y nodos por segundo de cada bando.
+    """
+    n = len(registros)
+    puntuaciones = [registro["puntuacion_a"] for registro in registros]
+    resumen = {
+        "partidas": n,
+        "victorias": puntuaciones.count(1.0),
+        "empates": puntuaciones.count(0.5),
+        "derrotas": puntuaciones.count(0.0),
+    }
+
+    if n:
+        media = sum(puntuaciones) / n
+        varianza = sum((p - media) ** 2 for p in puntuaciones) / n
+        error = Z_95 * math.sqrt(varianza / n)
+        # Limitar la puntuación para que el Elo sea finito con 0 % o 100 %
+        margen = 0.5 / n
+
+        def acotar(p):
+            return min(1 - margen, max(margen, p))
+
+        resumen["puntuacion"] = media
+        resumen["elo"] = diferencia_elo(acotar(media))
+        resumen["elo_min"] = diferencia_elo(acotar(media - error))
+        resumen["elo_max"] = diferencia_elo(acotar(media + error))
+
+    for lado in ("a", "b"):
+        tiempo_ms = sum(registro[lado]["tiempo_ms"] for registro in registros)
+        nodos = sum(registro[lado]["nodos"] for registro in registros)
+        jugadas = sum(registro[lado]["jugadas"] for registro in registros)
+        resumen[lado] = {
+            "tiempo_medio_ms": tiempo_ms / jugadas if jugadas else 0.0,
+            "nodos_por_segundo": nodos / (tiempo_ms / 1000) if tiempo_ms else 0.0,
+        }
+    return resumen
+
+
+def formatear_resumen(resumen):
+    """Texto del resumen para la consola"""
+    lineas = [
+        f"Partidas: {resumen['partidas']}",
+        "A: {victorias} victorias, {empates} empates, {derrotas} derrotas".format(
+            **resumen
+        ),
+    ]
+    if "elo" in resumen:
+        lineas.append(
+            "Elo A - B: {elo:+.1f} (95 %: {elo_min:+.1f} .. {elo_max:+.1f})".format(
+                **resumen
+            )
+        )
+    for lado in ("a", "b"):
+        datos = resumen[lado]
+        lineas.append(
+            f"{lado.upper()}: {datos['tiempo_medio_ms']:.1f} ms por jugada, "
+            f"{datos['nodos_por_segundo']:.0f} nodos/s"
+        )
+    return "\n".join(lineas)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Torneo entre dos configuraciones de la IA de Smart Horses"
+    )
+    for lado in ("--a", "--b"):
+        parser.add_argument(lado, default="profundidad=4", help="motor y kwargs")
+    parser.add_argument("--partidas", type=int, default=100)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument(
+        "--procesos", type=int, default=None, help="por defecto, uno por núcleo"
+    )
+    parser.add_argument("--checkpoint", default=None, help="archivo JSONL")
+    parser.add_argument(
+        "--partidas-registradas", default=None, help="registro binario de partidas"
+    )
+    parser.add_argument(
+        "--log", default=None, help="archivo para las estadísticas de cada búsqueda"
+    )
+    argumentos = parser.parse_args()
+
+    registros = ejecutar_torneo(
+        leer_configuracion(argumentos.a),
+        leer_configuracion(argumentos.b),
+        argumentos.partidas,
+        argumentos.semilla,
+        argumentos.procesos,
+        argumentos.checkpoint,
+        argumentos.log,
+        argumentos.partidas_registradas,
+    )
+    print(formatear_resumen(resumir(registros)))
+
+
+if __name__ == "__main__":
+    main()
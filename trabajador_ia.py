@@ -0,0 +1,80 @@
+"""
+Búsqueda y ponderación de la IA en un hilo aparte para no bloquear la interfaz
+"""
+import copy
+import threading
+
+from control_busqueda import TokenCancelacion
+
+
+class TrabajadorIA:
+    """
+    Ejecuta AIPlayer.obtener_mejor_movimiento en un hilo de fondo.
+    La interfaz consulta `terminado()`, `progreso` y `movimiento` desde el
+    hilo principal (por ejemplo con root.after) y puede cancelar en cualquier
+    momento. La búsqueda trabaja sobre una copia de la partida.
+    """
+
+    def __init__(self, ai_player):
+        self.ai_player = ai_player
+        self.token = TokenCancelacion()
+        self.progreso = None
+        self.movimiento = None
+        # EstadisticasBusqueda de la búsqueda, al terminar
+        self.estadisticas = None
+        self.error = None
+        self._hilo = None
+
+    def iniciar(self, game_logic, tiempo_ms=None):
+        """Lanza la búsqueda del mejor movimiento para la posición actual"""
+        partida = copy.deepcopy(game_logic)
+        self._hilo = threading.Thread(
+            target=self._buscar, args=(partida, tiempo_ms), daemon=True
+        )
+        self._hilo.start()
+
+    def iniciar_ponder(self, game_logic):
+        """Lanza la ponderación durante el turno del rival (hasta cancelar)"""
+        partida = copy.deepcopy(game_logic)
+        self._hilo = threading.Thread(
+            target=self._ponderar, args=(partida,), daemon=True
+        )
+        self._hilo.start()
+
+    def _ponderar(self, partida):
+        try:
+            self.ai_player.ponderar(partida, self.token)
+        except Exception as error:
+            self.error = error
+
+    def _buscar(self, partida, tiempo_ms):
+        try:
+            self.movimiento = self.ai_player.obtener_mejor_movimiento(
+                partida,
+                tiempo_ms=tiempo_ms,
+                token=self.token,
+                progreso=self._actualizar_progreso,
+            )
+            self.estadisticas = self.ai_player.estadisticas
+        except Exception as error:  # Se reporta en el hilo principal
+            self.error = error
+
+    def _actualizar_progreso(self, info):
+        # Reemplazar la referencia es atómico: la interfaz lee el último valor
+        self.progreso = info
+
+    def terminado(self):
+        """Indica si la búsqueda ya terminó (o nunca empezó)"""
+        return self._hilo is None or not self._hilo.is_alive()
+
+    def cancelar(self):
+        """Detiene la búsqueda; su resultado debe descartarse"""
+        self.token.cancelar()
+
+    def cancelado(self):
+        return self.token.cancelado()
+
+    def esperar(self, timeout=None):
+        """Bloquea hasta que el hilo termine"""
+        if self._hilo is not None:
+            self._hilo.join(timeout)
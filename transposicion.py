@@ -0,0 +1,123 @@
+"""
+Tabla de transposición acotada para la búsqueda Alpha-Beta
+"""
+from config import MEMORIA_TRANSPOSICION_MB
+
+# Tipo de valor almacenado
+EXACTO = 0
+COTA_INFERIOR = 1  # El valor real es >= al almacenado (poda beta)
+COTA_SUPERIOR = 2  # El valor real es <= al almacenado (falló bajo)
+
+# Costo aproximado de una entrada en CPython: seis referencias de lista más
+# los objetos int/float de la clave y el valor
+BYTES_POR_ENTRADA = 112
+
+
+class TablaTransposicion:
+    """
+    Tabla hash de tamaño fijo indexada por clave Zobrist.
+    Cada entrada guarda la clave completa, la profundidad buscada, el valor,
+    el tipo de cota, el mejor movimiento y la generación (búsqueda) en que
+    se escribió.
+
+    Reemplazo por profundidad: una entrada solo se sobrescribe con otra de
+    igual o mayor profundidad, salvo que sea de la misma posición o de una
+    búsqueda anterior.
+    """
+
+    def __init__(self, memoria_mb=MEMORIA_TRANSPOSICION_MB):
+        entradas = max(1, int(memoria_mb * 1024 * 1024) // BYTES_POR_ENTRADA)
+        # Potencia de dos para indexar con una máscara
+        self.tamano = 1 << (entradas.bit_length() - 1)
+        self.memoria_mb = memoria_mb
+        self._mascara = self.tamano - 1
+        self.generacion = 0
+        self.limpiar()
+
+    def limpiar(self):
+        """Vacía la tabla y reinicia las estadísticas"""
+        tamano = self.tamano
+        self.claves = [None] * tamano
+        self.profundidades = [-1] * tamano
+        self.valores = [0] * tamano
+        self.tipos = [EXACTO] * tamano
+        self.movimientos = [None] * tamano
+        self.generaciones = [0] * tamano
+        self.ocupadas = 0
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        """Pone en cero los contadores de consultas, aciertos y escrituras"""
+        self.consultas = 0
+        self.aciertos = 0
+        self.cortes = 0
+        self.escrituras = 0
+        self.reemplazos = 0
+        self.rechazos = 0
+
+    def nueva_busqueda(self):
+        """Inicia una búsqueda: las entradas anteriores pasan a ser reemplazables"""
+        self.generacion += 1
+
+    def consultar(self, clave):
+        """
+        Busca la posición y retorna (profundidad, valor, tipo, movimiento),
+        o None si no está en la tabla.
+        """
+        self.consultas += 1
+        i = clave & self._mascara
+        if self.claves[i] != clave:
+            return None
+        self.aciertos += 1
+        return (
+            self.profundidades[i],
+            self.valores[i],
+            self.tipos[i],
+            self.movimientos[i],
+        )
+
+    def guardar(self, clave, profundidad, valor, tipo, movimiento=None):
+        """Guarda el resultado de buscar una posición, respetando el reemplazo"""
+        i = clave & self._mascara
+        clave_actual = self.claves[i]
+
+        if clave_actual is None:
+            self.ocupadas += 1
+        elif clave_actual != clave:
+            if (
+                self.generaciones[i] == self.generacion
+                and self.profundidades[i] > profundidad
+            ):
+                self.rechazos += 1
+                return
+            self.reemplazos += 1
+        elif movimiento is None:
+            # Misma posición: conservar el mejor movimiento conocido
+            movimiento = self.movimientos[i]
+
+        self.escrituras += 1
+        self.claves[i] = clave
+        self.profundidades[i] = profundidad
+        self.valores[i] = valor
+        self.tipos[i] = tipo
+        self.movimientos[i] = movimiento
+        self.generaciones[i] = self.generacion
+
+    def tasa_aciertos(self):
+        """Fracción de consultas que encontraron la posición"""
+        return self.aciertos / self.consultas if self.consultas else 0.0
+
+    def estadisticas(self):
+        """Resumen de uso de la tabla"""
+        return {
+            "tamano": self.tamano,
+            "memoria_mb": self.memoria_mb,
+            "ocupadas": self.ocupadas,
+            "consultas": self.consultas,
+            "aciertos": self.aciertos,
+            "tasa_aciertos": self.tasa_aciertos(),
+            "cortes": self.cortes,
+            "escrituras": self.escrituras,
+            "reemplazos": self.reemplazos,
+            "rechazos": self.rechazos,
+        }
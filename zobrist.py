@@ -0,0 +1,57 @@
+"""
+Claves Zobrist para identificar posiciones durante la búsqueda
+Las claves se derivan con splitmix64, así que son las mismas en cualquier
+proceso y en cualquier ejecución.
+"""
+from functools import lru_cache
+
+MASCARA_64 = (1 << 64) - 1
+
+# Tipos de clave
+_BLOQUEADA = 1
+_CABALLO = 2
+_PUNTO = 3
+_TURNO = 4
+
+
+def _splitmix64(x):
+    """Mezcla un entero en 64 bits pseudoaleatorios"""
+    x = (x + 0x9E3779B97F4A7C15) & MASCARA_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASCARA_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASCARA_64
+    return x ^ (x >> 31)
+
+
+def _clave(tipo, dimension, dato):
+    return _splitmix64(tipo << 56 | dimension << 48 | dato)
+
+
+@lru_cache(maxsize=None)
+def tablas_zobrist(dimension):
+    """
+    Retorna (bloqueadas, caballos, turno):
+    - bloqueadas[casilla]: clave de una casilla bloqueada
+    - caballos[lado][casilla]: clave del caballo de `lado` en la casilla
+    - turno: clave que se aplica cuando mueve el negro
+    """
+    casillas = range(dimension * dimension)
+    bloqueadas = tuple(_clave(_BLOQUEADA, dimension, c) for c in casillas)
+    caballos = tuple(
+        tuple(_clave(_CABALLO, dimension, lado << 16 | c) for c in casillas)
+        for lado in (0, 1)
+    )
+    turno = _clave(_TURNO, dimension, 0)
+    return bloqueadas, caballos, turno
+
+
+def clave_punto(casilla, valor, dimension):
+    """Clave de una casilla que todavía conserva `valor` puntos"""
+    return _clave(_PUNTO, dimension, (valor & 0xFFFF) << 16 | casilla)
+
+
+def claves_puntos(valores, dimension):
+    """Clave de punto por casilla (0 en las casillas sin puntos)"""
+    return tuple(
+        clave_punto(casilla, valor, dimension) if valor else 0
+        for casilla, valor in enumerate(valores)
+    )